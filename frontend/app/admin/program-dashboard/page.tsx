@@ -1,6 +1,6 @@
 import { createClient } from '@/lib/supabase/server';
 import ProgramDashboardClient from './ProgramDashboardClient';
-import { calculateCohortEngagement, StudentEngagementInput } from '@/lib/utils/engagementScore';
+import { calculateCohortEngagement, engagementFromStored, StudentEngagementInput, StoredEngagementRow } from '@/lib/utils/engagementScore';
 
 export const metadata = {
     title: 'Program Dashboard - Admin Panel',
@@ -29,18 +29,16 @@ export default async function ProgramDashboardPage() {
         .from('v_student_dashboard')
         .select('student_id, cbp_count, conflexion_count, bow_score, total_projects_assessed');
 
-    // 4. Fetch Self-Assessment counts DIRECTLY from assessments table
-    //    (matches the individual student dashboard methodology exactly)
-    const { data: selfAssessmentsRaw } = await supabase
-        .from('assessments')
-        .select('student_id')
-        .eq('assessment_type', 'self')
-        .not('normalized_score', 'is', null);
-    
+    // 4. Fetch Self-Assessment counts from the per-student rollup (all students,
+    //    same count of scored self rows the individual student dashboard uses)
+    const { data: selfCounts } = await supabase
+        .from('student_metric_rollup')
+        .select('student_id, self_assessments_count');
+
     const selfCountMap: Record<string, number> = {};
-    if (selfAssessmentsRaw) {
-        selfAssessmentsRaw.forEach(row => {
-            selfCountMap[row.student_id] = (selfCountMap[row.student_id] || 0) + 1;
+    if (selfCounts) {
+        selfCounts.forEach(row => {
+            selfCountMap[row.student_id] = Number(row.self_assessments_count) || 0;
         });
     }
 
@@ -71,7 +69,13 @@ export default async function ProgramDashboardPage() {
         });
     }
 
-    // 7. Build raw per-student data
+    // 7. Fetch precomputed engagement scores and the newest import they must postdate
+    const [{ data: storedEngagement }, { data: latestLog }] = await Promise.all([
+        supabase.from('engagement_scores').select('student_id, cbp_count, conflexion_count, bow_score, self_assessments_count, raw_score, relative_score, zone, computed_at'),
+        supabase.from('assessment_logs').select('created_at').order('created_at', { ascending: false }).limit(1),
+    ]);
+
+    // 8. Build raw per-student data
     const studentBaseData = students.map(student => {
         const metrics = (dashboardMetrics?.find(m => m.student_id === student.id) || {}) as any;
         return {
@@ -90,7 +94,7 @@ export default async function ProgramDashboardPage() {
         };
     });
 
-    // 8. Calculate engagement zones PER COHORT using the shared canonical utility
+    // 9. Calculate engagement zones PER COHORT using the shared canonical utility
     //    IMPORTANT: Only include students who appear in v_student_dashboard (have tracking data).
     //    This matches the Student Dashboard which uses allTermTracking from v_student_dashboard.
     //    Including students with no data (all-zeros) skews the mean and changes everyone's Z-score.
@@ -111,13 +115,18 @@ export default async function ProgramDashboardPage() {
                 selfAssessmentsCount: s.selfAssessmentsCount,
             }));
 
-        const results = calculateCohortEngagement(inputs);
+        // Precomputed rows when they cover this cohort and are current, else compute live
+        const results = engagementFromStored(
+            storedEngagement as StoredEngagementRow[] | null,
+            inputs,
+            latestLog?.[0]?.created_at
+        ) ?? calculateCohortEngagement(inputs);
         results.forEach((result, studentId) => {
             engagementMap.set(studentId, result);
         });
     }
 
-    // 9. Compile final data with pre-computed engagement scores for the client
+    // 10. Compile final data with pre-computed engagement scores for the client
     const compiledData = studentBaseData.map(student => {
         const eng = engagementMap.get(student.id);
         return {
@@ -11,6 +11,21 @@ export async function POST(request: Request) {
 
         const supabase = await createClient();
 
+        // Keys of the domain-score summary this log's assessments contribute to,
+        // and the students whose dashboard rollup includes its metrics
+        const { data: touched } = await supabase
+            .from('assessments')
+            .select('student_id, project_id')
+            .eq('assessment_log_id', logId);
+        const { data: touchedMetrics } = await supabase
+            .from('metric_tracking')
+            .select('student_id')
+            .eq('assessment_log_id', logId);
+        const { data: touchedPeer } = await supabase
+            .from('peer_feedback')
+            .select('recipient_id, project_id')
+            .eq('assessment_log_id', logId);
+
         // Deleting the log record will cascade and delete associated assessments, 
         // peer feedback, and term tracking records due to ON DELETE CASCADE configs.
         const { error } = await supabase
@@ -23,6 +38,33 @@ export async function POST(request: Request) {
             return NextResponse.json({ error: error.message }, { status: 500 });
         }
 
+        if (touched && touched.length > 0) {
+            const { error: summaryError } = await supabase.rpc('refresh_domain_scores', {
+                p_student_ids: [...new Set(touched.map(t => t.student_id))],
+                p_project_ids: [...new Set(touched.map(t => t.project_id))],
+            });
+            if (summaryError) console.error('Error refreshing domain scores:', summaryError);
+
+            const { error: gapError } = await supabase.rpc('refresh_self_awareness', {
+                p_student_ids: [...new Set(touched.map(t => t.student_id))],
+            });
+            if (gapError) console.error('Error refreshing self-awareness gaps:', gapError);
+        }
+
+        const rollupStudents = [...new Set([...(touched || []), ...(touchedMetrics || [])].map(t => t.student_id))];
+        if (rollupStudents.length > 0) {
+            const { error: rollupError } = await supabase.rpc('refresh_student_rollup', { p_student_ids: rollupStudents });
+            if (rollupError) console.error('Error refreshing student rollup:', rollupError);
+        }
+
+        if (touchedPeer && touchedPeer.length > 0) {
+            const { error: peerSummaryError } = await supabase.rpc('refresh_peer_feedback_summary', {
+                p_student_ids: [...new Set(touchedPeer.map(t => t.recipient_id))],
+                p_project_ids: [...new Set(touchedPeer.map(t => t.project_id))],
+            });
+            if (peerSummaryError) console.error('Error refreshing peer feedback summary:', peerSummaryError);
+        }
+
         return NextResponse.json({ success: true, message: 'Import successfully deleted and data reverted.' });
     } catch (err: any) {
         console.error('Delete import error:', err);
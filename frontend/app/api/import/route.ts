@@ -106,6 +106,24 @@ export async function POST(req: Request) {
                 const { error: insErr } = await supabase.from('assessments').insert(inserts);
                 if (insErr) throw new Error("Failed bulk assessments insert: " + insErr.message);
                 recordsInserted = inserts.length;
+
+                // Refresh the summaries behind the dashboards for the keys just written
+                const studentIds = [...new Set(inserts.map(i => i.student_id))];
+                const { error: summaryError } = await supabase.rpc('refresh_domain_scores', {
+                    p_student_ids: studentIds,
+                    p_project_ids: [projectId],
+                });
+                if (summaryError) console.error('Error refreshing domain scores:', summaryError);
+
+                const { error: rollupError } = await supabase.rpc('refresh_student_rollup', {
+                    p_student_ids: studentIds,
+                });
+                if (rollupError) console.error('Error refreshing student rollup:', rollupError);
+
+                const { error: gapError } = await supabase.rpc('refresh_self_awareness', {
+                    p_student_ids: studentIds,
+                });
+                if (gapError) console.error('Error refreshing self-awareness gaps:', gapError);
             }
         }
         else if (importType === 'peer') {
@@ -241,6 +241,23 @@ export async function POST(request: NextRequest) {
 
             if (upsertError) throw upsertError;
 
+            // 4. Refresh the domain-score summary for the keys this log touched
+            const { error: summaryError } = await supabase.rpc('refresh_domain_scores', {
+                p_student_ids: [...new Set(inserts.map(i => i.student_id))],
+                p_project_ids: [...new Set(inserts.map(i => i.project_id))],
+            });
+            if (summaryError) console.error('Error refreshing domain scores:', summaryError);
+
+            const { error: rollupError } = await supabase.rpc('refresh_student_rollup', {
+                p_student_ids: [...new Set(inserts.map(i => i.student_id))],
+            });
+            if (rollupError) console.error('Error refreshing student rollup:', rollupError);
+
+            const { error: gapError } = await supabase.rpc('refresh_self_awareness', {
+                p_student_ids: [...new Set(inserts.map(i => i.student_id))],
+            });
+            if (gapError) console.error('Error refreshing self-awareness gaps:', gapError);
+
             return NextResponse.json({
                 success: true,
                 message: `Successfully mapped and imported ${inserts.length} ${type} assessments! Linked to Log ID: ${logData.id.slice(0, 8)}...`,
@@ -382,6 +399,13 @@ export async function POST(request: NextRequest) {
 
             if (peerErr) throw peerErr;
 
+            // Refresh the peer-feedback summary for the (recipient, project) keys just written
+            const { error: summaryError } = await supabase.rpc('refresh_peer_feedback_summary', {
+                p_student_ids: [...new Set(finalPeerInserts.map(p => p.recipient_id))],
+                p_project_ids: [...new Set(finalPeerInserts.map(p => p.project_id))],
+            });
+            if (summaryError) console.error('Error refreshing peer feedback summary:', summaryError);
+
             return NextResponse.json({
                 success: true,
                 message: `Imported ${peerInserts.length} peer feedback entries.`,
@@ -491,6 +515,12 @@ export async function POST(request: NextRequest) {
 
             if (termErr) throw termErr;
 
+            // Refresh the dashboard rollup of the students whose metrics changed
+            const { error: rollupError } = await supabase.rpc('refresh_student_rollup', {
+                p_student_ids: [...new Set(finalInserts.map(i => i.student_id))],
+            });
+            if (rollupError) console.error('Error refreshing student rollup:', rollupError);
+
             return NextResponse.json({
                 success: true,
                 message: `Imported ${finalInserts.length} metric records. Linked to Log ID: ${log.id.slice(0, 8)}...`,
@@ -266,8 +266,9 @@ export default function StudentDashboardClient({
                                     contentStyle={{ backgroundColor: '#fff', borderColor: '#cbd5e1', borderRadius: '8px', boxShadow: '0 4px 6px -1px rgb(0 0 0 / 0.1)' }}
                                     formatter={((value: any, name: string | undefined, props: any) => {
                                         if (name === 'range') {
-                                            const delta = props.payload.delta;
-                                            return [`${delta}%`, "Variance"];
+                                            const { delta, meanAbsGap } = props.payload;
+                                            const calibration = meanAbsGap != null ? `, ±${meanAbsGap} per parameter` : '';
+                                            return [`${delta}%${calibration}`, "Variance"];
                                         }
                                         const cleanName = name || '';
                                         return [value, cleanName.charAt(0).toUpperCase() + cleanName.slice(1)];
@@ -1,7 +1,8 @@
 import { createClient } from '@/lib/supabase/server';
 import { getPlaygroundData } from '@/lib/supabase/queries/assessments';
 import StudentDashboardClient from './StudentDashboardClient';
-import { calculateCohortEngagement, StudentEngagementInput, getBadgeColor, getZone } from '@/lib/utils/engagementScore';
+import { calculateCohortEngagement, engagementFromStored, StudentEngagementInput, getBadgeColor, getZone } from '@/lib/utils/engagementScore';
+import { calculateGapData, gapFromCalibration } from '@/lib/utils/selfAwareness';
 
 export const metadata = {
     title: 'Student Dashboard',
@@ -55,37 +56,9 @@ export default async function StudentDashboardPage({ params }: { params: Promise
         studentData = data.student;
 
         // 1. BUILD GAP DATA (Domain Averages)
-        const domainMap = new Map();
-        data.domains.forEach(d => domainMap.set(d.id, { name: d.name, mentorSum: 0, mentorCount: 0, selfSum: 0, selfCount: 0 }));
-
-        data.assessments.forEach(a => {
-            if (a.normalized_score === null) return;
-            const param = data.parameters.find(p => p.id === a.parameter_id);
-            if (!param) return;
-            const domainEntry = domainMap.get(param.domain_id);
-            if (!domainEntry) return;
-
-            if (a.assessment_type === 'mentor') {
-                domainEntry.mentorSum += a.normalized_score;
-                domainEntry.mentorCount++;
-            } else {
-                domainEntry.selfSum += a.normalized_score;
-                domainEntry.selfCount++;
-            }
-        });
-
-        gapData = Array.from(domainMap.values()).map(d => {
-            const mentor = d.mentorCount > 0 ? Number((d.mentorSum / d.mentorCount).toFixed(1)) : 0;
-            const self = d.selfCount > 0 ? Number((d.selfSum / d.selfCount).toFixed(1)) : 0;
-            const deltaPercent = mentor > 0 ? ((self - mentor) / mentor) * 100 : 0;
-            return {
-                name: d.name,
-                mentor,
-                self,
-                range: mentor <= self ? [mentor, self] : [self, mentor],
-                delta: Number(deltaPercent.toFixed(1))
-            };
-        });
+        // Precomputed calibration rows (self_awareness_calibration), else pair the assessments live
+        gapData = gapFromCalibration(data.domains, data.selfAwarenessCalibration)
+            ?? calculateGapData(data.domains, data.parameters, data.assessments);
 
         // 2. BUILD HEATMAP DATA (Parameters x Projects)
         const projectNames: string[] = data.projects.map(p => p.name);
@@ -164,12 +137,11 @@ export default async function StudentDashboardPage({ params }: { params: Promise
         };
 
         // ENGMENET SCORE DISTRIBUTION DATA
+        // Scored self-assessments per cohort student, from the dashboard rollup
         const selfAssessMap: Record<string, number> = {};
-        if ((data as any).allSelfAssessments) {
-            (data as any).allSelfAssessments.forEach((s: any) => {
-                selfAssessMap[s.student_id] = (selfAssessMap[s.student_id] || 0) + 1;
-            });
-        }
+        (data.allTermTracking || []).forEach((t: any) => {
+            selfAssessMap[t.student_id] = Number(t.self_assessments_count) || 0;
+        });
 
         const maxCBP = Math.max(...(data.allTermTracking?.map((t: any) => t.cbp_count || 0) || []), 1);
         const maxConf = Math.max(...(data.allTermTracking?.map((t: any) => t.conflexion_count || 0) || []), 1);
@@ -193,7 +165,12 @@ export default async function StudentDashboardPage({ params }: { params: Promise
                 selfAssessmentsCount: selfAssessMap[t.student_id] || 0,
             }));
 
-            const engagementResults = calculateCohortEngagement(engagementInputs);
+            // Precomputed rows (engagement_scores) when current, else compute live
+            const engagementResults = engagementFromStored(
+                (data as any).cohortEngagement,
+                engagementInputs,
+                (data as any).latestImportAt
+            ) ?? calculateCohortEngagement(engagementInputs);
 
             const scaledScores = (data.allTermTracking || []).map((t: any) => {
                 const eng = engagementResults.get(t.student_id);
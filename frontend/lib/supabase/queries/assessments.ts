@@ -162,6 +162,24 @@ export async function updateAssessment(
         .single();
 
     if (error) throw error;
+
+    // Keep the summaries behind the dashboards in step with the edited score
+    const { error: summaryError } = await supabase.rpc('refresh_domain_scores', {
+        p_student_ids: [data.student_id],
+        p_project_ids: [data.project_id],
+    });
+    if (summaryError) console.error('Error refreshing domain scores:', summaryError);
+
+    const { error: rollupError } = await supabase.rpc('refresh_student_rollup', {
+        p_student_ids: [data.student_id],
+    });
+    if (rollupError) console.error('Error refreshing student rollup:', rollupError);
+
+    const { error: gapError } = await supabase.rpc('refresh_self_awareness', {
+        p_student_ids: [data.student_id],
+    });
+    if (gapError) console.error('Error refreshing self-awareness gaps:', gapError);
+
     return data as Assessment;
 }
 
@@ -216,7 +234,7 @@ export async function getPlaygroundData(supabase: SupabaseClient, studentId?: st
     const cohortStudentIds = cohortStudents?.map(s => s.id) || [];
 
     // 3. Fetch all required reference data using the pre-fetched cohort IDs
-    const [projectsResult, domainsResult, paramsResult, assessmentsResult, peerFeedbackResult, dashboardResult, allDomainScoresResult, allPeerSummaryResult, allTermTrackingResult, allSelfAssessmentsResult] = await Promise.all([
+    const [projectsResult, domainsResult, paramsResult, assessmentsResult, peerFeedbackResult, dashboardResult, allDomainScoresResult, allPeerSummaryResult, allTermTrackingResult, cohortEngagementResult, latestLogResult, calibrationResult] = await Promise.all([
         supabase.from('projects').select('*').order('sequence'),
         supabase.from('readiness_domains').select('*').order('display_order'),
         supabase.from('readiness_parameters').select('*').order('param_number'),
@@ -225,8 +243,10 @@ export async function getPlaygroundData(supabase: SupabaseClient, studentId?: st
         supabase.from('v_student_dashboard').select('*').eq('student_id', student.id).single(),
         supabase.from('v_domain_scores').select('*').eq('assessment_type', 'mentor').in('student_id', cohortStudentIds),
         supabase.from('v_peer_feedback_summary').select('*').in('student_id', cohortStudentIds),
-        supabase.from('v_student_dashboard').select('student_id, cbp_count, conflexion_count, bow_score').in('student_id', cohortStudentIds),
-        supabase.from('assessments').select('student_id').eq('assessment_type', 'self').not('normalized_score', 'is', null).in('student_id', cohortStudentIds)
+        supabase.from('v_student_dashboard').select('student_id, cbp_count, conflexion_count, bow_score, self_assessments_count').in('student_id', cohortStudentIds),
+        supabase.from('engagement_scores').select('student_id, cbp_count, conflexion_count, bow_score, self_assessments_count, raw_score, relative_score, zone, computed_at').in('student_id', cohortStudentIds),
+        supabase.from('assessment_logs').select('created_at').order('created_at', { ascending: false }).limit(1),
+        supabase.from('self_awareness_calibration').select('domain_id, mentor_avg, self_avg, mean_abs_gap, paired_count').eq('student_id', student.id)
     ]);
 
     if (projectsResult.error) throw projectsResult.error;
@@ -246,7 +266,9 @@ export async function getPlaygroundData(supabase: SupabaseClient, studentId?: st
         cohortDomainScores: allDomainScoresResult.data as any[] || [],
         cohortPeerSummary: allPeerSummaryResult.data as any[] || [],
         allTermTracking: allTermTrackingResult.data as any[] || [],
-        allSelfAssessments: allSelfAssessmentsResult.data as any[] || []
+        cohortEngagement: cohortEngagementResult.data as any[] || [],
+        latestImportAt: (latestLogResult.data?.[0]?.created_at ?? null) as string | null,
+        selfAwarenessCalibration: calibrationResult.data as any[] || []
     };
 }
 
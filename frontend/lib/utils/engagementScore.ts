@@ -102,3 +102,60 @@ export function calculateCohortEngagement(
 
     return results;
 }
+
+/**
+ * A row of the `engagement_scores` table, written per cohort by
+ * scripts/utilities/engagement_scores.py with the same formula as above,
+ * together with the inputs it was computed from.
+ */
+export interface StoredEngagementRow {
+    student_id: string;
+    cbp_count: number | string;
+    conflexion_count: number | string;
+    bow_score: number | string;
+    self_assessments_count: number;
+    raw_score: number;
+    relative_score: number | string;
+    zone: StudentEngagementResult['zone'];
+    computed_at: string;
+}
+
+/**
+ * Engagement results from precomputed rows, or null when they cannot be
+ * trusted: a student of the pool has no row, a row was computed from inputs
+ * other than the current ones (e.g. after a score-grid or metric edit), or
+ * data was imported after the rows were computed. Callers then fall back to
+ * calculateCohortEngagement().
+ */
+export function engagementFromStored(
+    rows: StoredEngagementRow[] | null | undefined,
+    inputs: StudentEngagementInput[],
+    latestImportAt: string | null | undefined
+): Map<string, StudentEngagementResult> | null {
+    if (!rows || inputs.length === 0) return null;
+
+    const byStudent = new Map(rows.map(r => [r.student_id, r]));
+    const importedAt = latestImportAt ? new Date(latestImportAt).getTime() : 0;
+    const results = new Map<string, StudentEngagementResult>();
+
+    for (const input of inputs) {
+        const studentId = input.studentId;
+        const row = byStudent.get(studentId);
+        if (!row || new Date(row.computed_at).getTime() < importedAt) return null;
+        // Scores are relative to the cohort, so one changed input invalidates them all
+        if (Number(row.cbp_count) !== input.cbpCount
+            || Number(row.conflexion_count) !== input.conflexionCount
+            || Number(row.bow_score) !== input.bowScore
+            || Number(row.self_assessments_count) !== input.selfAssessmentsCount) return null;
+        results.set(studentId, {
+            studentId,
+            rawScore: row.raw_score,
+            relativeScore: Number(row.relative_score),
+            zone: row.zone,
+            zoneColor: getZoneColor(row.zone),
+            zoneDotColor: getZoneColor(row.zone),
+        });
+    }
+
+    return results;
+}
@@ -0,0 +1,109 @@
+/**
+ * Self-Awareness Gap Bar data (mentor vs self per readiness domain).
+ * Used by the Student Dashboard and the Playground, read from the precomputed
+ * self_awareness_calibration rows (migration 010) with a live fallback.
+ */
+
+export interface GapDatum {
+    name: string;
+    mentor: number;
+    self: number;
+    range: [number, number];
+    delta: number;               // (self - mentor) / mentor, in %
+    meanAbsGap: number | null;   // mean |self - mentor| over paired parameters
+    pairedCount: number;
+}
+
+export interface StoredCalibrationRow {
+    domain_id: string;
+    mentor_avg: number | string | null;
+    self_avg: number | string | null;
+    mean_abs_gap: number | string | null;
+    paired_count: number;
+}
+
+interface DomainRef { id: string; name: string; }
+interface ParameterRef { id: string; domain_id: string; }
+interface AssessmentRef {
+    project_id: string;
+    parameter_id: string;
+    assessment_type: string;
+    normalized_score: number | null;
+}
+
+// Stored and live averages both arrive unrounded; this is the only rounding
+function toGapDatum(name: string, mentorAvg: number | null, selfAvg: number | null, meanAbsGap: number | null, pairedCount: number): GapDatum {
+    const mentor = mentorAvg !== null ? Number(mentorAvg.toFixed(1)) : 0;
+    const self = selfAvg !== null ? Number(selfAvg.toFixed(1)) : 0;
+    const deltaPercent = mentor > 0 ? ((self - mentor) / mentor) * 100 : 0;
+    return {
+        name,
+        mentor,
+        self,
+        range: mentor <= self ? [mentor, self] : [self, mentor],
+        delta: Number(deltaPercent.toFixed(1)),
+        meanAbsGap: meanAbsGap !== null ? Number(meanAbsGap.toFixed(2)) : null,
+        pairedCount
+    };
+}
+
+const num = (v: number | string | null) => (v === null || v === undefined ? null : Number(v));
+
+/**
+ * Gap data from a student's precomputed calibration rows, or null when the
+ * student has none yet. Callers then fall back to calculateGapData().
+ */
+export function gapFromCalibration(domains: DomainRef[], rows: StoredCalibrationRow[] | null | undefined): GapDatum[] | null {
+    if (!rows || rows.length === 0) return null;
+
+    const byDomain = new Map(rows.map(r => [r.domain_id, r]));
+    return domains.map(d => {
+        const row = byDomain.get(d.id);
+        if (!row) return toGapDatum(d.name, null, null, null, 0);
+        return toGapDatum(d.name, num(row.mentor_avg), num(row.self_avg), num(row.mean_abs_gap), row.paired_count);
+    });
+}
+
+/**
+ * Gap data computed from the student's assessment rows, pairing mentor and
+ * self scores per (project, parameter) the way refresh_self_awareness() does.
+ */
+export function calculateGapData(domains: DomainRef[], parameters: ParameterRef[], assessments: AssessmentRef[]): GapDatum[] {
+    const domainOf = new Map(parameters.map(p => [p.id, p.domain_id]));
+    const pairs = new Map<string, { domainId: string; mentor: number | null; self: number | null }>();
+
+    assessments.forEach(a => {
+        if (a.normalized_score === null) return;
+        if (a.assessment_type !== 'mentor' && a.assessment_type !== 'self') return;
+        const domainId = domainOf.get(a.parameter_id);
+        if (!domainId) return;
+
+        const key = `${a.project_id}:${a.parameter_id}`;
+        const pair = pairs.get(key) ?? { domainId, mentor: null, self: null };
+        if (a.assessment_type === 'mentor') pair.mentor = a.normalized_score;
+        else pair.self = a.normalized_score;
+        pairs.set(key, pair);
+    });
+
+    const totals = new Map<string, { mentorSum: number; mentorCount: number; selfSum: number; selfCount: number; absGapSum: number; pairedCount: number }>();
+    domains.forEach(d => totals.set(d.id, { mentorSum: 0, mentorCount: 0, selfSum: 0, selfCount: 0, absGapSum: 0, pairedCount: 0 }));
+
+    pairs.forEach(p => {
+        const t = totals.get(p.domainId);
+        if (!t) return;
+        if (p.mentor !== null) { t.mentorSum += p.mentor; t.mentorCount++; }
+        if (p.self !== null) { t.selfSum += p.self; t.selfCount++; }
+        if (p.mentor !== null && p.self !== null) { t.absGapSum += Math.abs(p.self - p.mentor); t.pairedCount++; }
+    });
+
+    return domains.map(d => {
+        const t = totals.get(d.id)!;
+        return toGapDatum(
+            d.name,
+            t.mentorCount > 0 ? t.mentorSum / t.mentorCount : null,
+            t.selfCount > 0 ? t.selfSum / t.selfCount : null,
+            t.pairedCount > 0 ? t.absGapSum / t.pairedCount : null,
+            t.pairedCount
+        );
+    });
+}
@@ -0,0 +1,33 @@
+-- Migration 005: Import Watermarks
+-- Description: Lets the response importers resume from where the previous run
+-- stopped. Each import run records, per source file, the newest form Timestamp
+-- and the number of data rows it has read; the next incremental run only
+-- processes responses after that point. Self-assessment rows also keep the
+-- sum and count of the answers behind raw_score, so an incremental run can
+-- merge new answers into the stored average.
+
+-- 1. One watermark per source file, upserted by each run
+CREATE TABLE IF NOT EXISTS import_watermarks (
+    data_type         TEXT NOT NULL,
+    file_name         TEXT NOT NULL,
+    project_id        UUID REFERENCES projects(id) ON DELETE SET NULL,
+    last_response_at  TIMESTAMP,                 -- newest response Timestamp read
+    rows_processed    INT NOT NULL,              -- data rows of the file read
+    raw_scale_min     NUMERIC,                   -- scale the file's scores were stored on
+    raw_scale_max     NUMERIC,
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (data_type, file_name)
+);
+
+COMMENT ON TABLE import_watermarks IS 'How far each response file has been imported; maintained by import_self.py (import_watermarks.py).';
+
+-- 2. Answer sum and count behind each averaged raw_score (NULL for rows
+--    written before this migration or by the import wizard)
+ALTER TABLE assessments ADD COLUMN IF NOT EXISTS raw_score_sum NUMERIC;
+ALTER TABLE assessments ADD COLUMN IF NOT EXISTS raw_score_count INT;
+
+COMMENT ON COLUMN assessments.raw_score_sum IS 'Sum of the answers averaged into raw_score (self-assessment imports).';
+COMMENT ON COLUMN assessments.raw_score_count IS 'Number of answers averaged into raw_score (self-assessment imports).';
+
+-- 3. Only the importers (service connection) read or write it
+ALTER TABLE import_watermarks ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,29 @@
+-- Migration 006: Engagement Scores
+-- Description: Stores each active student's engagement score, computed per
+-- cohort by scripts/utilities/engagement_scores.py after every metric or
+-- assessment import. The Program and Student Dashboards read these rows
+-- instead of recomputing the whole cohort on every request.
+
+-- 1. One row per active student (inputs kept alongside for auditing)
+CREATE TABLE IF NOT EXISTS engagement_scores (
+    student_id              UUID PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    cohort                  TEXT NOT NULL,
+    cbp_count               NUMERIC NOT NULL DEFAULT 0,
+    conflexion_count        NUMERIC NOT NULL DEFAULT 0,
+    bow_score               NUMERIC NOT NULL DEFAULT 0,
+    self_assessments_count  INT NOT NULL DEFAULT 0,
+    raw_score               INT NOT NULL,               -- 0-100 against the cohort's top performers
+    relative_score          NUMERIC(4,1) NOT NULL,      -- 2-98, z-score scaled around 62.5
+    zone                    TEXT NOT NULL CHECK (zone IN ('Syncing', 'Connecting', 'Engaging', 'Leading')),
+    computed_at             TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE engagement_scores IS 'Precomputed cohort engagement scores (scripts/utilities/engagement_scores.py); same formula as frontend/lib/utils/engagementScore.ts.';
+
+-- 2. Dashboards read a whole cohort at once
+CREATE INDEX IF NOT EXISTS idx_engagement_scores_cohort ON engagement_scores(cohort);
+
+-- 3. Readable by the dashboards like the other reporting tables
+ALTER TABLE engagement_scores ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow anon select engagement_scores" ON engagement_scores;
+CREATE POLICY "Allow anon select engagement_scores" ON engagement_scores FOR SELECT TO anon, authenticated USING (true);
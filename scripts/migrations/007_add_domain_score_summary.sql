@@ -0,0 +1,106 @@
+-- Migration 007: Domain Score Summary
+-- Description: v_domain_scores aggregated all of assessments (joined to
+-- students, projects, parameters and domains) on every dashboard read. The
+-- per-domain sums and counts now live in domain_score_summary, keyed by
+-- (student, project, assessment_type, domain). Imports refresh only the keys
+-- they touched through refresh_domain_scores(); v_domain_scores keeps its
+-- columns and reads the summary.
+
+-- 1. Summary table: one row per scored (student, project, type, domain)
+CREATE TABLE IF NOT EXISTS domain_score_summary (
+    student_id       UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    project_id       UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    assessment_type  TEXT NOT NULL,
+    domain_id        UUID NOT NULL REFERENCES readiness_domains(id) ON DELETE CASCADE,
+    score_sum        NUMERIC NOT NULL,
+    score_count      INT NOT NULL CHECK (score_count > 0),
+    updated_at       TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (student_id, project_id, assessment_type, domain_id)
+);
+
+COMMENT ON TABLE domain_score_summary IS 'SUM/COUNT of assessments.normalized_score per (student, project, type, domain); maintained by refresh_domain_scores().';
+
+-- Cohort radar reads: all mentor rows of a set of students
+CREATE INDEX IF NOT EXISTS idx_domain_score_summary_type_student
+    ON domain_score_summary(assessment_type, student_id);
+
+-- 2. Recompute the summary rows of some students and/or projects.
+--    NULL means "all", so refresh_domain_scores() with no arguments is a full rebuild.
+--    The refresh functions are callable with the anon key, as the import
+--    wizard needs; a full rebuild is left to the importers' own connection and
+--    the service role, so API callers can only refresh the keys they name.
+CREATE OR REPLACE FUNCTION assert_keyed_refresh(p_student_ids UUID[], p_summary TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    IF p_student_ids IS NULL
+       AND NULLIF(current_setting('request.jwt.claims', true), '')::jsonb ->> 'role' IN ('anon', 'authenticated') THEN
+        RAISE EXCEPTION 'a full rebuild of % is restricted to the service role', p_summary
+            USING ERRCODE = 'insufficient_privilege';
+    END IF;
+END $$;
+
+--    Each key covers at most four parameters, so recomputing a touched key
+--    from its assessments is as cheap as adjusting its totals, and repeating
+--    a refresh is harmless.
+CREATE OR REPLACE FUNCTION refresh_domain_scores(
+    p_student_ids UUID[] DEFAULT NULL,
+    p_project_ids UUID[] DEFAULT NULL
+) RETURNS INT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    refreshed INT;
+BEGIN
+    PERFORM assert_keyed_refresh(p_student_ids, 'domain_score_summary');
+
+    DELETE FROM domain_score_summary d
+    WHERE (p_student_ids IS NULL OR d.student_id = ANY(p_student_ids))
+      AND (p_project_ids IS NULL OR d.project_id = ANY(p_project_ids));
+
+    INSERT INTO domain_score_summary (student_id, project_id, assessment_type, domain_id, score_sum, score_count)
+    SELECT a.student_id, a.project_id, a.assessment_type, rp.domain_id,
+           SUM(a.normalized_score), COUNT(a.normalized_score)
+    FROM assessments a
+    JOIN readiness_parameters rp ON rp.id = a.parameter_id
+    WHERE a.normalized_score IS NOT NULL
+      AND (p_student_ids IS NULL OR a.student_id = ANY(p_student_ids))
+      AND (p_project_ids IS NULL OR a.project_id = ANY(p_project_ids))
+    GROUP BY a.student_id, a.project_id, a.assessment_type, rp.domain_id;
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END $$;
+
+-- 3. Same columns as before, now a join of small tables on the summary's key
+DROP VIEW IF EXISTS v_domain_scores;
+CREATE VIEW v_domain_scores AS
+SELECT
+    d.student_id,
+    s.canonical_name                          AS student_name,
+    d.project_id,
+    p.name                                    AS project_name,
+    p.sequence,
+    p.sequence_label,
+    d.assessment_type,
+    rd.name                                   AS domain_name,
+    rd.short_name                             AS domain_short,
+    rd.display_order,
+    ROUND(d.score_sum / d.score_count, 2)     AS domain_score,
+    d.score_count::BIGINT                     AS params_scored
+FROM domain_score_summary d
+JOIN students s           ON s.id = d.student_id
+JOIN projects p           ON p.id = d.project_id
+JOIN readiness_domains rd ON rd.id = d.domain_id;
+
+-- 4. Readable like the other reporting tables; written only by the function
+ALTER TABLE domain_score_summary ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow anon select domain_score_summary" ON domain_score_summary;
+CREATE POLICY "Allow anon select domain_score_summary" ON domain_score_summary FOR SELECT TO anon, authenticated USING (true);
+
+-- 5. Initial build
+SELECT refresh_domain_scores();
@@ -0,0 +1,96 @@
+-- Migration 008: Student Metric Rollup
+-- Description: v_student_dashboard (fix_view_v2.py) ran four correlated
+-- subqueries per student against the metric_tracking aggregate, term_tracking
+-- and assessments. The per-student totals now live in student_metric_rollup,
+-- refreshed by the metric and assessment import paths through
+-- refresh_student_rollup(), and the view reads one row per student.
+
+-- 1. One row per student (active or not, so re-activating needs no refresh)
+CREATE TABLE IF NOT EXISTS student_metric_rollup (
+    student_id               UUID PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    cbp_count                NUMERIC NOT NULL DEFAULT 0,   -- metric_tracking CBP + term_tracking 'Year 1'
+    conflexion_count         NUMERIC NOT NULL DEFAULT 0,
+    bow_score                NUMERIC NOT NULL DEFAULT 0,
+    total_projects_assessed  INT NOT NULL DEFAULT 0,       -- projects with a scored mentor assessment
+    self_assessments_count   INT NOT NULL DEFAULT 0,       -- scored self-assessment rows
+    updated_at               TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE student_metric_rollup IS 'Per-student dashboard metrics behind v_student_dashboard; maintained by refresh_student_rollup().';
+
+-- 2. Recompute the rollup of some students (NULL = every student).
+--    Each source is aggregated once with GROUP BY and joined, instead of
+--    one subquery per student and metric.
+CREATE OR REPLACE FUNCTION refresh_student_rollup(p_student_ids UUID[] DEFAULT NULL)
+RETURNS INT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    refreshed INT;
+BEGIN
+    PERFORM assert_keyed_refresh(p_student_ids, 'student_metric_rollup');
+
+    DELETE FROM student_metric_rollup r
+    WHERE p_student_ids IS NULL OR r.student_id = ANY(p_student_ids);
+
+    INSERT INTO student_metric_rollup (student_id, cbp_count, conflexion_count, bow_score,
+                                       total_projects_assessed, self_assessments_count)
+    SELECT
+        s.id,
+        COALESCE(mt.cbp, 0) + COALESCE(tt.cbp_count, 0),
+        COALESCE(mt.conflexion, 0) + COALESCE(tt.conflexion_count, 0),
+        COALESCE(mt.bow, 0) + COALESCE(tt.bow_score, 0),
+        COALESCE(a.projects_assessed, 0),
+        COALESCE(a.self_assessments, 0)
+    FROM students s
+    LEFT JOIN (
+        SELECT mt.student_id,
+               SUM(mt.value) FILTER (WHERE m.name = 'CBP')        AS cbp,
+               SUM(mt.value) FILTER (WHERE m.name = 'Conflexion') AS conflexion,
+               SUM(mt.value) FILTER (WHERE m.name = 'BoW')        AS bow
+        FROM metric_tracking mt
+        JOIN metrics m ON m.id = mt.metric_id
+        WHERE p_student_ids IS NULL OR mt.student_id = ANY(p_student_ids)
+        GROUP BY mt.student_id
+    ) mt ON mt.student_id = s.id
+    LEFT JOIN term_tracking tt ON tt.student_id = s.id AND tt.term = 'Year 1'
+    LEFT JOIN (
+        SELECT student_id,
+               COUNT(DISTINCT project_id) FILTER (WHERE assessment_type = 'mentor') AS projects_assessed,
+               COUNT(*) FILTER (WHERE assessment_type = 'self')                   AS self_assessments
+        FROM assessments
+        WHERE normalized_score IS NOT NULL
+          AND (p_student_ids IS NULL OR student_id = ANY(p_student_ids))
+        GROUP BY student_id
+    ) a ON a.student_id = s.id
+    WHERE p_student_ids IS NULL OR s.id = ANY(p_student_ids);
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END $$;
+
+-- 3. Same columns as fix_view_v2.py's view, plus the self-assessment count
+DROP VIEW IF EXISTS v_student_dashboard CASCADE;
+CREATE VIEW v_student_dashboard AS
+SELECT
+    s.id                                          AS student_id,
+    s.student_number,
+    s.canonical_name,
+    COALESCE(r.cbp_count, 0)                      AS cbp_count,
+    COALESCE(r.conflexion_count, 0)               AS conflexion_count,
+    COALESCE(r.bow_score, 0)                      AS bow_score,
+    COALESCE(r.total_projects_assessed, 0)::BIGINT AS total_projects_assessed,
+    COALESCE(r.self_assessments_count, 0)::BIGINT  AS self_assessments_count
+FROM students s
+LEFT JOIN student_metric_rollup r ON r.student_id = s.id
+WHERE s.is_active = TRUE;
+
+-- 4. Readable like the other reporting tables; written only by the function
+ALTER TABLE student_metric_rollup ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow anon select student_metric_rollup" ON student_metric_rollup;
+CREATE POLICY "Allow anon select student_metric_rollup" ON student_metric_rollup FOR SELECT TO anon, authenticated USING (true);
+
+-- 5. Initial build
+SELECT refresh_student_rollup();
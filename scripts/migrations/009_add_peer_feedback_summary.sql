@@ -0,0 +1,107 @@
+-- Migration 009: Peer Feedback Summary
+-- Description: v_peer_feedback_summary recomputed five AVG()s and the overall
+-- mean over all of peer_feedback on every read. Per-(recipient, project) sums
+-- and counts now live in peer_feedback_summary; peer-feedback imports refresh
+-- the keys they wrote in the same batch through refresh_peer_feedback_summary(),
+-- and the view derives the averages from the stored totals.
+
+-- 1. One row per (recipient, project) with feedback. Each dimension keeps its
+--    own count because ratings may be blank; the overall mean covers only
+--    rows where all five are present, as AVG() of their mean did.
+CREATE TABLE IF NOT EXISTS peer_feedback_summary (
+    student_id                  UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    project_id                  UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    feedback_count              INT NOT NULL,
+    quality_of_work_sum         BIGINT NOT NULL DEFAULT 0,
+    quality_of_work_count       INT NOT NULL DEFAULT 0,
+    initiative_ownership_sum    BIGINT NOT NULL DEFAULT 0,
+    initiative_ownership_count  INT NOT NULL DEFAULT 0,
+    communication_sum           BIGINT NOT NULL DEFAULT 0,
+    communication_count         INT NOT NULL DEFAULT 0,
+    collaboration_sum           BIGINT NOT NULL DEFAULT 0,
+    collaboration_count         INT NOT NULL DEFAULT 0,
+    growth_mindset_sum          BIGINT NOT NULL DEFAULT 0,
+    growth_mindset_count        INT NOT NULL DEFAULT 0,
+    overall_total               BIGINT NOT NULL DEFAULT 0,   -- sum of the five ratings over complete rows
+    overall_count               INT NOT NULL DEFAULT 0,      -- complete rows
+    updated_at                  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (student_id, project_id)
+);
+
+COMMENT ON TABLE peer_feedback_summary IS 'Per-(recipient, project) peer_feedback totals behind v_peer_feedback_summary; maintained by refresh_peer_feedback_summary().';
+
+-- Project-wide reads (peer deviation charts, project reports)
+CREATE INDEX IF NOT EXISTS idx_peer_feedback_summary_project ON peer_feedback_summary(project_id);
+
+-- 2. Recompute the summary rows of some recipients and/or projects (NULL = all)
+CREATE OR REPLACE FUNCTION refresh_peer_feedback_summary(
+    p_student_ids UUID[] DEFAULT NULL,
+    p_project_ids UUID[] DEFAULT NULL
+) RETURNS INT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    refreshed INT;
+BEGIN
+    PERFORM assert_keyed_refresh(p_student_ids, 'peer_feedback_summary');
+
+    DELETE FROM peer_feedback_summary s
+    WHERE (p_student_ids IS NULL OR s.student_id = ANY(p_student_ids))
+      AND (p_project_ids IS NULL OR s.project_id = ANY(p_project_ids));
+
+    INSERT INTO peer_feedback_summary (
+        student_id, project_id, feedback_count,
+        quality_of_work_sum, quality_of_work_count,
+        initiative_ownership_sum, initiative_ownership_count,
+        communication_sum, communication_count,
+        collaboration_sum, collaboration_count,
+        growth_mindset_sum, growth_mindset_count,
+        overall_total, overall_count)
+    SELECT
+        pf.recipient_id, pf.project_id, COUNT(*),
+        COALESCE(SUM(pf.quality_of_work), 0),      COUNT(pf.quality_of_work),
+        COALESCE(SUM(pf.initiative_ownership), 0), COUNT(pf.initiative_ownership),
+        COALESCE(SUM(pf.communication), 0),        COUNT(pf.communication),
+        COALESCE(SUM(pf.collaboration), 0),        COUNT(pf.collaboration),
+        COALESCE(SUM(pf.growth_mindset), 0),       COUNT(pf.growth_mindset),
+        COALESCE(SUM(pf.quality_of_work + pf.initiative_ownership + pf.communication
+                     + pf.collaboration + pf.growth_mindset), 0),
+        COUNT(pf.quality_of_work + pf.initiative_ownership + pf.communication
+              + pf.collaboration + pf.growth_mindset)
+    FROM peer_feedback pf
+    WHERE (p_student_ids IS NULL OR pf.recipient_id = ANY(p_student_ids))
+      AND (p_project_ids IS NULL OR pf.project_id = ANY(p_project_ids))
+    GROUP BY pf.recipient_id, pf.project_id;
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+    RETURN refreshed;
+END $$;
+
+-- 3. Same columns and rounding as before, from the stored totals
+CREATE OR REPLACE VIEW v_peer_feedback_summary AS
+SELECT
+    ps.student_id,
+    s.canonical_name                AS student_name,
+    ps.project_id,
+    p.name                          AS project_name,
+    p.sequence,
+    ps.feedback_count::BIGINT       AS feedback_count,
+    ROUND(ps.quality_of_work_sum::NUMERIC      / NULLIF(ps.quality_of_work_count, 0), 2)      AS avg_quality_of_work,
+    ROUND(ps.initiative_ownership_sum::NUMERIC / NULLIF(ps.initiative_ownership_count, 0), 2) AS avg_initiative_ownership,
+    ROUND(ps.communication_sum::NUMERIC        / NULLIF(ps.communication_count, 0), 2)        AS avg_communication,
+    ROUND(ps.collaboration_sum::NUMERIC        / NULLIF(ps.collaboration_count, 0), 2)        AS avg_collaboration,
+    ROUND(ps.growth_mindset_sum::NUMERIC       / NULLIF(ps.growth_mindset_count, 0), 2)       AS avg_growth_mindset,
+    ROUND(ps.overall_total::NUMERIC / 5 / NULLIF(ps.overall_count, 0), 2)                     AS avg_overall
+FROM peer_feedback_summary ps
+JOIN students s ON s.id = ps.student_id
+JOIN projects p ON p.id = ps.project_id;
+
+-- 4. Readable like the other reporting tables; written only by the function
+ALTER TABLE peer_feedback_summary ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow anon select peer_feedback_summary" ON peer_feedback_summary;
+CREATE POLICY "Allow anon select peer_feedback_summary" ON peer_feedback_summary FOR SELECT TO anon, authenticated USING (true);
+
+-- 5. Initial build
+SELECT refresh_peer_feedback_summary();
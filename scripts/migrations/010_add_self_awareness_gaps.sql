@@ -0,0 +1,97 @@
+-- Migration 010: Self-Awareness Gap Matrix
+-- Description: The Self-Awareness Gap Bar paired mentor and self scores by
+-- pulling both sets of a student's assessments and joining them per request.
+-- self_awareness_gaps holds the pairing per (student, project, parameter),
+-- built with one pivot over assessments, and self_awareness_calibration the
+-- per-domain averages and calibration stats derived from it. Imports refresh
+-- only the students they touched through refresh_self_awareness().
+
+-- 1. Gap matrix: one row per (student, project, parameter) with a mentor or self score
+CREATE TABLE IF NOT EXISTS self_awareness_gaps (
+    student_id    UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    project_id    UUID NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    parameter_id  UUID NOT NULL REFERENCES readiness_parameters(id) ON DELETE CASCADE,
+    mentor_score  NUMERIC,               -- normalized_score as stored, unrounded
+    self_score    NUMERIC,
+    gap           NUMERIC,               -- self - mentor, NULL unless both are scored
+    PRIMARY KEY (student_id, project_id, parameter_id)
+);
+
+-- 2. Calibration per (student, domain): unpaired averages as on the gap bar,
+--    and the signed / absolute gap over the paired scores. Stored unrounded:
+--    the client rounds once for display, exactly as it does live averages.
+CREATE TABLE IF NOT EXISTS self_awareness_calibration (
+    student_id    UUID NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    domain_id     UUID NOT NULL REFERENCES readiness_domains(id) ON DELETE CASCADE,
+    mentor_avg    NUMERIC,
+    self_avg      NUMERIC,
+    mean_gap      NUMERIC,               -- > 0 overconfident, < 0 underconfident
+    mean_abs_gap  NUMERIC,
+    paired_count  INT NOT NULL DEFAULT 0,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (student_id, domain_id)
+);
+
+COMMENT ON TABLE self_awareness_gaps IS 'Mentor vs self normalized score per (student, project, parameter); maintained by refresh_self_awareness().';
+COMMENT ON TABLE self_awareness_calibration IS 'Per-domain mentor/self averages and mean (absolute) gap; maintained by refresh_self_awareness().';
+
+-- 3. Rebuild both tables for some students (NULL = every student)
+CREATE OR REPLACE FUNCTION refresh_self_awareness(p_student_ids UUID[] DEFAULT NULL)
+RETURNS INT
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    refreshed INT;
+BEGIN
+    PERFORM assert_keyed_refresh(p_student_ids, 'self_awareness_gaps');
+
+    DELETE FROM self_awareness_gaps g
+    WHERE p_student_ids IS NULL OR g.student_id = ANY(p_student_ids);
+    DELETE FROM self_awareness_calibration c
+    WHERE p_student_ids IS NULL OR c.student_id = ANY(p_student_ids);
+
+    -- One pass over the students' assessments, mentor and self side by side
+    INSERT INTO self_awareness_gaps (student_id, project_id, parameter_id, mentor_score, self_score, gap)
+    SELECT student_id, project_id, parameter_id, mentor_score, self_score, self_score - mentor_score
+    FROM (
+        SELECT a.student_id, a.project_id, a.parameter_id,
+               MAX(a.normalized_score) FILTER (WHERE a.assessment_type = 'mentor') AS mentor_score,
+               MAX(a.normalized_score) FILTER (WHERE a.assessment_type = 'self')   AS self_score
+        FROM assessments a
+        WHERE a.normalized_score IS NOT NULL
+          AND a.assessment_type IN ('mentor', 'self')
+          AND (p_student_ids IS NULL OR a.student_id = ANY(p_student_ids))
+        GROUP BY a.student_id, a.project_id, a.parameter_id
+    ) pivot;
+
+    GET DIAGNOSTICS refreshed = ROW_COUNT;
+
+    INSERT INTO self_awareness_calibration (student_id, domain_id, mentor_avg, self_avg,
+                                            mean_gap, mean_abs_gap, paired_count)
+    SELECT g.student_id, rp.domain_id,
+           AVG(g.mentor_score),
+           AVG(g.self_score),
+           AVG(g.gap),
+           AVG(ABS(g.gap)),
+           COUNT(g.gap)
+    FROM self_awareness_gaps g
+    JOIN readiness_parameters rp ON rp.id = g.parameter_id
+    WHERE p_student_ids IS NULL OR g.student_id = ANY(p_student_ids)
+    GROUP BY g.student_id, rp.domain_id;
+
+    RETURN refreshed;
+END $$;
+
+-- 4. Readable like the other reporting tables; written only by the function
+ALTER TABLE self_awareness_gaps ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow anon select self_awareness_gaps" ON self_awareness_gaps;
+CREATE POLICY "Allow anon select self_awareness_gaps" ON self_awareness_gaps FOR SELECT TO anon, authenticated USING (true);
+
+ALTER TABLE self_awareness_calibration ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Allow anon select self_awareness_calibration" ON self_awareness_calibration;
+CREATE POLICY "Allow anon select self_awareness_calibration" ON self_awareness_calibration FOR SELECT TO anon, authenticated USING (true);
+
+-- 5. Initial build
+SELECT refresh_self_awareness();
@@ -1,31 +1,18 @@
-import json
-import subprocess
-
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return {"raw": result.stdout}
+from db_client import run_sql, SQLError
 
 print("=== Adding anon SELECT policy for assessment_logs ===")
-r = run_sql("""
-    CREATE POLICY "Allow anon read assessment_logs"
-    ON assessment_logs
-    FOR SELECT
-    TO anon
-    USING (true)
-""")
-print(r)
+try:
+    r = run_sql("""
+        CREATE POLICY "Allow anon read assessment_logs"
+        ON assessment_logs
+        FOR SELECT
+        TO anon
+        USING (true)
+    """)
+    print(r)
+except SQLError as e:
+    # Most commonly: the policy already exists
+    print(f"Policy not created: {e}")
 
 print("\n=== Current policies on assessment_logs ===")
 policies = run_sql("""
@@ -1,11 +1,4 @@
-import json, subprocess
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = "https://api.supabase.com/v1/projects/wqcdtdofwytfrcbhfycc/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL, "-H", f"Authorization: Bearer {PAT}", "-H", "Content-Type: application/json", "-d", payload]
-    return json.loads(subprocess.run(cmd, capture_output=True, text=True).stdout)
+from db_client import run_sql
 
 logs = run_sql("SELECT id, project_id, data_type FROM assessment_logs")
 
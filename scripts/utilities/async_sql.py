@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Concurrent read queries on top of the shared `db_client` pool.
+
+Audit and diagnostic scripts fire several independent SELECTs; run one after
+another, their wall time is the sum of every round trip. Submitting them as a
+group through `run_queries()` makes it close to the slowest single query:
+
+    from async_sql import run_queries
+
+    results = run_queries({
+        "logs":   "SELECT ... FROM assessment_logs",
+        "scores": "SELECT ... FROM assessments GROUP BY assessment_type",
+    })
+    for row in results["scores"]:
+        ...
+
+The HTTP client is synchronous, so each query runs in a worker thread via
+`asyncio.to_thread`; a semaphore caps how many are in flight, and the pool's
+blocking limit in `db_client` caps open connections on top of that. Only use
+this for reads - writes that depend on each other must stay sequential.
+"""
+
+import asyncio
+
+import db_client
+from db_client import SQLError
+
+DEFAULT_CONCURRENCY = db_client.POOL_SIZE
+
+
+async def run_sql_async(query, client=None):
+    client = client or db_client.get_client()
+    return await asyncio.to_thread(client.run_sql, query)
+
+
+async def gather_sql(queries, limit=DEFAULT_CONCURRENCY, client=None, return_errors=False):
+    """Run `queries` (a list of SQL strings) concurrently, at most `limit` at a time.
+
+    Results come back in input order. By default the first `SQLError` is raised
+    once every query has finished; with `return_errors=True` failed queries are
+    returned as their `SQLError` in place of rows.
+    """
+    client = client or db_client.get_client()
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def one(query):
+        async with semaphore:
+            return await run_sql_async(query, client)
+
+    results = await asyncio.gather(*(one(q) for q in queries), return_exceptions=True)
+    for r in results:
+        if isinstance(r, BaseException) and not isinstance(r, SQLError):
+            raise r
+    if not return_errors:
+        for r in results:
+            if isinstance(r, SQLError):
+                raise r
+    return results
+
+
+def run_queries(queries, limit=DEFAULT_CONCURRENCY, return_errors=False):
+    """Blocking entry point for scripts: run a dict or list of independent reads.
+
+    A dict returns a dict with the same keys; a list returns a list in order.
+    """
+    if isinstance(queries, dict):
+        keys = list(queries)
+        results = asyncio.run(gather_sql([queries[k] for k in keys], limit, return_errors=return_errors))
+        return dict(zip(keys, results))
+    return asyncio.run(gather_sql(list(queries), limit, return_errors=return_errors))
@@ -1,21 +1,6 @@
 import json
-import subprocess
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return {"raw": result.stdout}
+from db_client import run_sql
 
 # Create a sample mapping config to inject into the existing null logs so the UI isn't empty
 sample_mapping = json.dumps({
@@ -32,7 +17,4 @@ r = run_sql(f"""
     WHERE mapping_config IS NULL
     RETURNING id
 """)
-if isinstance(r, list):
-    print(f"Updated {len(r)} logs with sample mapping config.")
-else:
-    print(r)
+print(f"Updated {len(r)} logs with sample mapping config.")
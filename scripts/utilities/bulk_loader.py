@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+COPY-based bulk loader for `assessments`, `peer_feedback`, `metric_tracking`
+and `engagement_scores`.
+
+The importers used to write 50-row `INSERT ... VALUES` strings or post 100-row
+JSON batches to PostgREST. `bulk_load()` instead opens the direct connection
+from `psycopg2_seed.py`, streams every row through `COPY ... FROM STDIN` into a
+temporary staging table, and merges the stage into the target with a single
+`INSERT ... ON CONFLICT DO UPDATE` - all in one transaction:
+
+    from bulk_loader import bulk_load
+
+    bulk_load("assessments", records)
+    bulk_load("assessments", records, delete_where="assessment_type = 'mentor'")
+
+Rows are pulled from the iterable lazily while COPY reads, so a generator of
+records is never materialised. Within one load, the last row for a given
+conflict key wins (same rule as the importers' in-Python dedup).
+"""
+
+import io
+import math
+import time
+
+# table -> (loadable columns, conflict key)
+TARGETS = {
+    "assessments": (
+        ("student_id", "project_id", "parameter_id", "assessment_type", "assessment_log_id",
+         "assessment_framework_id", "self_assessment_question_id", "raw_score", "raw_scale_min",
+         "raw_scale_max", "normalized_score", "source_file", "raw_score_sum", "raw_score_count"),
+        ("student_id", "project_id", "parameter_id", "assessment_type"),
+    ),
+    "peer_feedback": (
+        ("recipient_id", "giver_id", "project_id", "assessment_log_id", "quality_of_work",
+         "initiative_ownership", "communication", "collaboration", "growth_mindset", "submitted_at"),
+        ("recipient_id", "giver_id", "project_id"),
+    ),
+    "metric_tracking": (
+        ("student_id", "metric_id", "assessment_log_id", "value"),
+        ("student_id", "metric_id", "assessment_log_id"),
+    ),
+    "engagement_scores": (
+        ("student_id", "cohort", "cbp_count", "conflexion_count", "bow_score", "self_assessments_count",
+         "raw_score", "relative_score", "zone"),
+        ("student_id",),
+    ),
+}
+
+STAGE_TABLE = "_bulk_stage"
+
+
+def _copy_value(v):
+    """Encode one value for COPY's text format."""
+    if v is None or (isinstance(v, float) and math.isnan(v)):
+        return "\\N"
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    return (str(v).replace("\\", "\\\\").replace("\t", "\\t")
+                  .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+class _CopyStream(io.RawIOBase):
+    """File-like object that renders rows to COPY text on demand."""
+
+    def __init__(self, rows, columns):
+        self._rows = iter(rows)
+        self._columns = columns
+        self._buf = b""
+        self.count = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buf) < size:
+            try:
+                row = next(self._rows)
+            except StopIteration:
+                break
+            line = "\t".join(_copy_value(row.get(c)) for c in self._columns) + "\n"
+            self._buf += line.encode("utf-8")
+            self.count += 1
+        if size < 0:
+            size = len(self._buf)
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+
+def _resolve_columns(table, first_row, columns):
+    allowed, conflict = TARGETS[table]
+    if columns is None:
+        columns = [c for c in allowed if c in first_row]
+    unknown = set(columns) - set(allowed)
+    if unknown:
+        raise ValueError(f"{table}: cannot bulk-load columns {sorted(unknown)}")
+    missing = set(conflict) - set(columns)
+    if missing:
+        raise ValueError(f"{table}: rows must include conflict key columns {sorted(missing)}")
+    return list(columns), conflict
+
+
+def merge_sql(table, columns, conflict):
+    """Upsert the staged rows into `table`; the last staged row per key wins."""
+    col_list, conflict_list = ", ".join(columns), ", ".join(conflict)
+    updates = [c for c in columns if c not in conflict]
+    on_conflict = (f"DO UPDATE SET {', '.join(f'{c} = EXCLUDED.{c}' for c in updates)}"
+                   if updates else "DO NOTHING")
+    return (f"INSERT INTO {table} ({col_list})\n"
+            f"SELECT DISTINCT ON ({conflict_list}) {col_list}\n"
+            f"FROM {STAGE_TABLE}\n"
+            f"ORDER BY {conflict_list}, _seq DESC\n"
+            f"ON CONFLICT ({conflict_list}) {on_conflict}")
+
+
+def bulk_load(table, rows, columns=None, delete_where=None, conn=None, verbose=True, after_sql=None):
+    """COPY `rows` (an iterable of dicts) into `table` and upsert them.
+
+    `columns` defaults to the target's loadable columns present in the first
+    row. `delete_where`, if given, runs `DELETE FROM table WHERE ...` in the
+    same transaction first (for importers that replace a whole slice), and
+    `after_sql` (a statement or list of them) runs in it after the merge -
+    e.g. refreshing a summary of the rows just loaded.
+    Returns the number of rows staged.
+    """
+    if table not in TARGETS:
+        raise ValueError(f"bulk_load supports {sorted(TARGETS)}, not {table!r}")
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None and delete_where is None:
+        return 0
+
+    own_conn = conn is None
+    if own_conn:
+        from psycopg2_seed import connect
+        conn = connect()
+
+    after = [after_sql] if isinstance(after_sql, str) else list(after_sql or [])
+
+    start = time.perf_counter()
+    try:
+        with conn.cursor() as cur:
+            if delete_where:
+                cur.execute(f"DELETE FROM {table} WHERE {delete_where}")
+            if first is None:
+                for stmt in after:
+                    cur.execute(stmt)
+                conn.commit()
+                return 0
+
+            columns, conflict = _resolve_columns(table, first, columns)
+            col_list = ", ".join(columns)
+
+            cur.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+            cur.execute(f"CREATE TEMP TABLE {STAGE_TABLE} ON COMMIT DROP AS "
+                        f"SELECT {col_list} FROM {table} WITH NO DATA")
+            cur.execute(f"ALTER TABLE {STAGE_TABLE} ADD COLUMN _seq BIGSERIAL")
+
+            def chained():
+                yield first
+                yield from rows
+
+            stream = _CopyStream(chained(), columns)
+            cur.copy_expert(f"COPY {STAGE_TABLE} ({col_list}) FROM STDIN", stream, size=64 * 1024)
+
+            cur.execute(merge_sql(table, columns, conflict))
+            merged = cur.rowcount
+            for stmt in after:
+                cur.execute(stmt)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+    if verbose:
+        elapsed = time.perf_counter() - start
+        print(f"[bulk_loader] {table}: staged {stream.count} rows, merged {merged} "
+              f"in {elapsed:.2f}s ({stream.count / elapsed if elapsed else 0:.0f} rows/s)")
+    return stream.count
@@ -1,17 +1,7 @@
 import json
-import subprocess
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
+from db_client import run_sql
 
 sql = "SELECT id, name FROM metrics;"
 
-payload = json.dumps({"query": sql})
-cmd = ["curl", "-s", "-X", "POST", URL,
-       "-H", f"Authorization: Bearer {PAT}",
-       "-H", "Content-Type: application/json",
-       "-d", payload]
-
-result = subprocess.run(cmd, capture_output=True, text=True)
-print(result.stdout)
+print(json.dumps(run_sql(sql)))
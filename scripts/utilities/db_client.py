@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Shared SQL client for the Supabase Management API query endpoint.
+
+Every utility used to carry its own copy of `run_sql()` that spawned a `curl`
+process - and paid a fresh TLS handshake - for every single query. This module
+keeps one pooled keep-alive HTTP session per process instead, raises
+`SQLError` for every kind of failure (no more `[]` / `{"raw": ...}`
+fallbacks), and times each call.
+
+Scripts are run from the repo root (`python scripts/utilities/<name>.py`), so
+the sibling import just works:
+
+    from db_client import run_sql, SQLError
+
+    rows = run_sql("SELECT id, name FROM projects")
+    print(rows.elapsed_ms)
+
+Set `SQL_TIMINGS=1` to print a latency summary when the script exits.
+"""
+
+import atexit
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+PROJECT_ID = os.environ.get("SUPABASE_PROJECT_ID", "wqcdtdofwytfrcbhfycc")
+PAT        = os.environ.get("SUPABASE_PAT", "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba")
+URL        = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
+
+POOL_SIZE       = 8      # max concurrent keep-alive connections per process
+REQUEST_TIMEOUT = 120    # seconds; long migrations run through this endpoint too
+
+# Cloudflare in front of api.supabase.com rejects the stock python-requests
+# User-Agent, which is why the old scripts shelled out to curl. Identifying as
+# our own client gets through without a subprocess.
+USER_AGENT = "assessment-system-utilities/1.0"
+
+
+class SQLError(Exception):
+    """A failed query: transport error, HTTP error or an API error payload."""
+
+    def __init__(self, query, message, status=None, elapsed_ms=None):
+        super().__init__(message)
+        self.query = query
+        self.message = message
+        self.status = status
+        self.elapsed_ms = elapsed_ms
+
+    def __str__(self):
+        prefix = f"HTTP {self.status}: " if self.status else ""
+        return f"{prefix}{self.message}"
+
+
+class SQLResult(list):
+    """The rows returned by a query (a plain list of dicts) plus its latency."""
+
+    def __init__(self, rows, elapsed_ms):
+        super().__init__(rows)
+        self.elapsed_ms = elapsed_ms
+
+
+def pooled_session(pool_size=POOL_SIZE):
+    """A `requests.Session` with a bounded keep-alive pool.
+
+    `pool_block=True` makes callers wait for a free connection instead of
+    opening extra ones, so the pool size is a hard cap. Only connection
+    failures are retried - a query that reached the server is never re-sent.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def _error_message(data, text):
+    if isinstance(data, dict):
+        for key in ("message", "error", "msg"):
+            if data.get(key):
+                return str(data[key])
+    return text.strip()[:400] or "empty response"
+
+
+class SQLClient:
+    def __init__(self, url=URL, token=PAT, pool_size=POOL_SIZE, timeout=REQUEST_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.session = pooled_session(pool_size)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        })
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def _record(self, start):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.timings.append(elapsed_ms)
+        return elapsed_ms
+
+    def run_sql(self, query):
+        """Run one SQL string and return its rows as a `SQLResult`.
+
+        Raises `SQLError` if the request fails, the API answers with a non-2xx
+        status or an error payload, or the body is not JSON.
+        """
+        start = time.perf_counter()
+        try:
+            resp = self.session.post(self.url, json={"query": query}, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise SQLError(query, f"request failed: {e}", elapsed_ms=self._record(start)) from e
+        elapsed_ms = self._record(start)
+
+        body = resp.text
+        try:
+            data = resp.json() if body.strip() else []
+        except ValueError:
+            data = None
+
+        if not resp.ok or (isinstance(data, dict) and (data.get("error") or data.get("message"))):
+            raise SQLError(query, _error_message(data, body), resp.status_code, elapsed_ms)
+        if data is None:
+            raise SQLError(query, f"unparseable response: {body[:200]}", resp.status_code, elapsed_ms)
+        if isinstance(data, dict):
+            data = [data]
+        return SQLResult(data, elapsed_ms)
+
+    def summary(self):
+        with self._lock:
+            timings = sorted(self.timings)
+        if not timings:
+            return {"calls": 0}
+        return {
+            "calls": len(timings),
+            "total_ms": round(sum(timings), 1),
+            "mean_ms": round(sum(timings) / len(timings), 1),
+            "p50_ms": round(timings[len(timings) // 2], 1),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+            "max_ms": round(timings[-1], 1),
+        }
+
+    def print_timings(self):
+        s = self.summary()
+        if not s["calls"]:
+            return
+        print(f"[db_client] {s['calls']} queries, total {s['total_ms']}ms, "
+              f"mean {s['mean_ms']}ms, p50 {s['p50_ms']}ms, p95 {s['p95_ms']}ms, max {s['max_ms']}ms")
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client, created on first use."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = SQLClient()
+            if os.environ.get("SQL_TIMINGS"):
+                atexit.register(_default_client.print_timings)
+        return _default_client
+
+
+def run_sql(query):
+    return get_client().run_sql(query)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Upsert-by-diff writes for tables the seed and import scripts rebuild.
+
+The importers and question seeders used to wipe their slice of a table
+(`DELETE FROM assessments WHERE assessment_type = 'self'`, `DELETE FROM
+self_assessment_questions`) and insert everything again - rewriting every
+row, churning the indexes, and leaving the dashboards empty until the
+inserts landed. The diff writer fetches the rows currently in that slice,
+compares them with the rows the script wants by natural key and a hash of
+the remaining columns, and writes only the difference:
+
+    from diff_writer import compute_delta, delta_sql, fetch_current
+
+    current = fetch_current("assessments", {"assessment_type": "mentor"})
+    delta = compute_delta("assessments", current, records)
+    print(delta.summary())            # 12 inserts, 3 updates, 1 deletes, 2140 unchanged
+    statements = delta_sql("assessments", delta)
+
+Rows keep their `id`, so anything that references them (and anything that
+caches them) survives a re-run. `delta_sql()` renders the delta as SQL,
+`SQLArtifact.write_delta()` (`sql_artifact.py`) streams the same statements
+into the generated seed files, `bulk_apply()` sends it through `bulk_loader`'s
+COPY + merge, and the Supabase SDK takes `delta.inserts`, `delta.updates` and
+`delta.deletes` directly.
+
+Numeric columns are compared as floats rounded to 6 places, so 7.5 from
+Python and `7.50` from Postgres hash the same.
+
+Seeded questions are keyed by project and normalized question text (case and
+punctuation ignored), never by position, so inserting or reordering one
+question leaves the others - and the assessments linked to them - alone. A
+question whose `parameter_id` changes is a different question: it is deleted
+(with its assessments) and inserted again rather than updated in place.
+"""
+
+import hashlib
+import math
+import numbers
+import re
+from collections import namedtuple
+from decimal import Decimal
+
+from db_client import run_sql
+
+PAGE_SIZE = 5000  # rows per keyset page in fetch_table()
+
+# table -> natural key, compared columns, numeric columns among them,
+# (table, column) foreign keys whose rows go when a row of this table is
+# deleted, whether the key is a UNIQUE constraint inserts can upsert on,
+# key columns compared as normalized text, and compared columns whose change
+# replaces the row (delete + insert) instead of updating it
+TableSpec = namedtuple("TableSpec", ["key", "columns", "numeric", "dependents", "unique",
+                                     "text_key", "replace_on"], defaults=((), ()))
+
+TABLES = {
+    "assessments": TableSpec(
+        key=("student_id", "project_id", "parameter_id", "assessment_type"),
+        columns=("self_assessment_question_id", "raw_score", "raw_scale_min", "raw_scale_max",
+                 "normalized_score", "source_file", "raw_score_sum", "raw_score_count"),
+        numeric=("raw_score", "raw_scale_min", "raw_scale_max", "normalized_score",
+                 "raw_score_sum", "raw_score_count"),
+        dependents=(),
+        unique=True,
+    ),
+    "self_assessment_questions": TableSpec(
+        key=("project_id", "question_text"),
+        columns=("parameter_id", "question_text", "question_order", "project_context", "rating_scale_max"),
+        numeric=("question_order", "rating_scale_max"),
+        dependents=(("assessments", "self_assessment_question_id"),),
+        unique=False,  # dropped in legacy/009; questions are now unique per import log
+        text_key=("question_text",),
+        replace_on=("parameter_id",),
+    ),
+}
+
+
+class Delta(namedtuple("Delta", ["inserts", "updates", "deletes", "unchanged"])):
+    """`inserts`: new rows; `updates`: changed rows with their current `id`;
+    `deletes`: ids of current rows no longer wanted."""
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    def summary(self):
+        return (f"{len(self.inserts)} inserts, {len(self.updates)} updates, "
+                f"{len(self.deletes)} deletes, {self.unchanged} unchanged")
+
+
+def _canonical(value, numeric):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "\\N"
+    if numeric:
+        return f"{float(value):.6f}"
+    return str(value)
+
+
+def row_digest(row, spec):
+    """Hash of the compared (non-key) columns of a row."""
+    text = "\x1f".join(_canonical(row.get(c), c in spec.numeric) for c in spec.columns)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _normalized_text(value):
+    """Lower-case alphanumerics only, as question_matcher.normalize_text."""
+    return re.sub(r"[^a-z0-9]", "", str(value).lower())
+
+
+def row_key(row, spec):
+    return tuple(_normalized_text(row[c]) if c in spec.text_key else str(row[c]) for c in spec.key)
+
+
+def fetched_columns(spec):
+    """`id`, key and compared columns, each once."""
+    return tuple(dict.fromkeys(("id",) + spec.key + spec.columns))
+
+
+def _filter_sql(column, value):
+    if value is None:
+        return f"{column} IS NULL"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return f"{column} IN ({', '.join(sql_literal(v) for v in sorted(value, key=str))})"
+    return f"{column} = {sql_literal(value)}"
+
+
+def fetch_table(table, select="*", filters=None, page_size=PAGE_SIZE, key="id"):
+    """Yield the rows of `table` page by page, by keyset pagination on `key`.
+
+    Each query asks for `key > last_key ORDER BY key LIMIT page_size`, so no
+    single response has to carry the whole table, a result limit on the API
+    side cannot silently truncate it, and only one page is held at a time.
+
+    `select` is `"*"` or a sequence of columns (`key` is added if missing).
+    `filters` maps columns to a value (`=`), `None` (`IS NULL`) or a
+    collection (`IN`; an empty one matches nothing), e.g.
+    `{"assessment_type": "self", "student_id": students}`.
+    """
+    if select != "*":
+        select = ", ".join(dict.fromkeys((key,) + tuple(select)))
+    filters = dict(filters or {})
+    if any(isinstance(v, (list, tuple, set, frozenset)) and not v for v in filters.values()):
+        return
+    conditions = [_filter_sql(column, value) for column, value in filters.items()]
+
+    last_key = None
+    while True:
+        page_conditions = conditions + ([f"{key} > {sql_literal(last_key)}"] if last_key is not None else [])
+        where = " AND ".join(page_conditions) or "TRUE"
+        page = run_sql(f"SELECT {select} FROM {table} WHERE {where} ORDER BY {key} LIMIT {int(page_size)}")
+        yield from page
+        if len(page) < page_size:
+            return
+        last_key = page[-1][key]
+
+
+def fetch_current(table, filters=None):
+    """`id`, key and compared columns of the rows in `table` matching `filters`."""
+    return list(fetch_table(table, fetched_columns(TABLES[table]), filters))
+
+
+def compute_delta(table, current, desired, delete_missing=True):
+    """Diff the `desired` rows against the `current` ones by key and row hash.
+
+    Later desired rows win over earlier ones with the same key. With
+    `delete_missing=False` current rows absent from `desired` are left alone
+    (an incremental run only knows about part of the slice). A change in a
+    `replace_on` column deletes the current row and inserts the new one.
+    """
+    spec = TABLES[table]
+    existing, duplicates = {}, []
+    for r in current:
+        key = row_key(r, spec)
+        if key in existing:
+            duplicates.append(r["id"])  # only one current row per key survives
+        else:
+            existing[key] = r
+
+    wanted = {}
+    for row in desired:
+        wanted[row_key(row, spec)] = row
+
+    inserts, updates, replaced, unchanged = [], [], [], 0
+    for key, row in wanted.items():
+        old = existing.get(key)
+        if old is None:
+            inserts.append(row)
+        elif any(_canonical(row.get(c), c in spec.numeric) != _canonical(old.get(c), c in spec.numeric)
+                 for c in spec.replace_on):
+            replaced.append(old["id"])
+            inserts.append(row)
+        elif row_digest(row, spec) != row_digest(old, spec):
+            updates.append({**row, "id": old["id"]})
+        else:
+            unchanged += 1
+
+    deletes = replaced
+    if delete_missing:
+        deletes += duplicates + [r["id"] for k, r in existing.items() if k not in wanted]
+    return Delta(inserts, updates, deletes, unchanged)
+
+
+def sql_literal(value):
+    """Render a Python value as a SQL literal.
+
+    NaN (float, Decimal, pandas NA/NaT) is NULL, infinities are quoted so
+    numeric columns accept them, numpy scalars render like their Python
+    counterparts, and text only needs its quotes doubled
+    (standard_conforming_strings). Postgres text cannot hold NUL characters,
+    so those are rejected rather than silently truncating the value.
+    """
+    if value is None or type(value).__name__ in ("NaTType", "NAType"):
+        return "NULL"
+    if type(value).__name__ in ("bool", "bool_"):  # Python and numpy booleans
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, (numbers.Real, Decimal)):
+        if value != value:
+            return "NULL"
+        if math.isinf(value):
+            return "'Infinity'" if value > 0 else "'-Infinity'"
+        return str(value) if isinstance(value, Decimal) else repr(float(value))
+    text = str(value)
+    if "\x00" in text:
+        raise ValueError(f"cannot store a NUL character in a SQL literal: {text[:40]!r}")
+    return "'" + text.replace("'", "''") + "'"
+
+
+def delta_sql(table, delta, max_statement_bytes=None):
+    """SQL statements applying `delta`: deletes (dependents first), updates, inserts.
+
+    Inserts are packed into multi-row statements by byte budget. To write
+    them to a file without building the list, use `SQLArtifact.write_delta()`.
+    """
+    from sql_artifact import DEFAULT_STATEMENT_BYTES, delta_statements
+
+    return list(delta_statements(table, delta, max_statement_bytes or DEFAULT_STATEMENT_BYTES))
+
+
+def bulk_apply(table, delta):
+    """Apply `delta` through `bulk_loader` (COPY + merge) in one transaction."""
+    from bulk_loader import bulk_load
+
+    ids = ", ".join(sql_literal(d) for d in delta.deletes)
+    return bulk_load(table, delta.inserts + delta.updates,
+                     delete_where=f"id IN ({ids})" if ids else None)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Keep `domain_score_summary` (migration 007) in step with `assessments`.
+
+`v_domain_scores` used to average every assessment on each dashboard read.
+It now reads per-(student, project, type, domain) sums and counts from
+`domain_score_summary`, and `refresh_domain_scores(student_ids, project_ids)`
+recomputes just the keys of those students and projects. The importers call it
+for the keys their writes touched:
+
+    from domain_scores import delta_keys, refresh_sql
+
+    delta = compute_delta("assessments", current, records)
+    statements = delta_sql("assessments", delta) + [refresh_sql(*delta_keys(delta, current))]
+
+`delta_keys()` takes the students and projects from the inserted and updated
+rows, and from the current rows that the delta deletes. The import wizard does
+the same for each assessment log it saves or deletes. If the summary is ever in
+doubt, rebuild it from scratch:
+
+    python scripts/utilities/domain_scores.py --rebuild
+    python scripts/utilities/domain_scores.py --log <assessment_log_id>   # keys of one log
+    python scripts/utilities/domain_scores.py --check                     # compare with a live AVG()
+"""
+
+import sys
+
+from db_client import run_sql
+from diff_writer import sql_literal
+
+
+def _uuid_array(ids):
+    if ids is None:
+        return "NULL"
+    return "ARRAY[" + ", ".join(sql_literal(str(i)) for i in sorted(ids)) + "]::uuid[]"
+
+
+def refresh_sql(student_ids=None, project_ids=None):
+    """`SELECT refresh_domain_scores(...)` for some students/projects (None = all)."""
+    if (student_ids is not None and not student_ids) or (project_ids is not None and not project_ids):
+        return "SELECT 0;"  # nothing touched
+    return f"SELECT refresh_domain_scores({_uuid_array(student_ids)}, {_uuid_array(project_ids)});"
+
+
+def row_keys(rows):
+    """(student ids, project ids) of assessment rows."""
+    rows = list(rows)
+    return {r["student_id"] for r in rows}, {r["project_id"] for r in rows}
+
+
+def delta_keys(delta, current):
+    """Students and projects whose summary rows a diff_writer Delta changes."""
+    deleted = set(delta.deletes)
+    return row_keys(list(delta.inserts) + list(delta.updates) + [r for r in current if r["id"] in deleted])
+
+
+def refresh(student_ids=None, project_ids=None):
+    """Run the refresh; returns the number of summary rows rebuilt."""
+    rows = run_sql(refresh_sql(student_ids, project_ids))
+    return next(iter(rows[0].values()), 0) if rows else 0
+
+
+def refresh_log_sql(log_id):
+    """Refresh the keys of the assessments recorded under one log."""
+    log = sql_literal(str(log_id))
+    return f"""SELECT refresh_domain_scores(
+    (SELECT array_agg(DISTINCT student_id) FROM assessments WHERE assessment_log_id = {log}),
+    (SELECT array_agg(DISTINCT project_id) FROM assessments WHERE assessment_log_id = {log}))
+WHERE EXISTS (SELECT 1 FROM assessments WHERE assessment_log_id = {log});"""
+
+
+CHECK_SQL = """
+    WITH live AS (
+        SELECT a.student_id, a.project_id, a.assessment_type, rp.domain_id,
+               SUM(a.normalized_score) AS score_sum, COUNT(a.normalized_score) AS score_count
+        FROM assessments a
+        JOIN readiness_parameters rp ON rp.id = a.parameter_id
+        WHERE a.normalized_score IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    )
+    SELECT COUNT(*) AS mismatched
+    FROM live l
+    FULL JOIN domain_score_summary d USING (student_id, project_id, assessment_type, domain_id)
+    WHERE l.score_sum IS DISTINCT FROM d.score_sum OR l.score_count IS DISTINCT FROM d.score_count
+"""
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        print(f"Rebuilt domain_score_summary: {refresh()} rows")
+    elif "--log" in sys.argv:
+        log_id = sys.argv[sys.argv.index("--log") + 1]
+        run_sql(refresh_log_sql(log_id))
+        print(f"Refreshed the domain scores of log {log_id}")
+    if "--check" in sys.argv or len(sys.argv) == 1:
+        mismatched = run_sql(CHECK_SQL)[0]["mismatched"]
+        print("domain_score_summary matches assessments" if not mismatched
+              else f"{mismatched} summary keys differ from assessments; run with --rebuild")
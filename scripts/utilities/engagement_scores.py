@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Batch cohort-engagement engine writing the `engagement_scores` table.
+
+`calculateCohortEngagement()` in `frontend/lib/utils/engagementScore.ts` ran
+on every Program and Student Dashboard request, rescanning the whole cohort
+for its maxima and z-scores. This module computes the same numbers for every
+cohort at once and stores them (migration 006), so the dashboards only read
+rows:
+
+    from engagement_scores import compute_engagement, fetch_inputs, refresh_engagement_scores
+
+    scores = compute_engagement(fetch_inputs())   # DataFrame, one row per active student
+    refresh_engagement_scores()                   # fetch, compute and write
+
+Per cohort, exactly as the TypeScript does:
+
+    raw      = round(25 * (cbp/max_cbp + conflexion/max_conf + bow/max_bow + self/max_self))
+    relative = clip((raw - mean) / sd * 25 + 62.5, 2, 98), one decimal
+    zone     = Syncing < 25 <= Connecting < 50 <= Engaging < 75 <= Leading
+
+with every maximum at least 1 (BoW at least 10) and `sd` the sample standard
+deviation (1 when it is 0). The cohort statistics are grouped reductions over
+whole columns (`np.maximum.at`, `np.bincount`), not a loop per cohort.
+
+The importers refresh the table after writing metrics or assessments
+(`import_data.py`, `import_self.py --bulk`, `run_sql_seed.py`). The dashboards
+fall back to computing live until the next refresh when a stored row's inputs
+differ from the current rollup (score-grid and metric edits) or an import is
+newer than `computed_at` (the web wizard):
+
+    python scripts/utilities/engagement_scores.py              # recompute and write
+    python scripts/utilities/engagement_scores.py --dry-run    # print the zone counts only
+    python scripts/utilities/engagement_scores.py --bulk       # write through COPY (bulk_loader)
+    python scripts/utilities/engagement_scores.py --benchmark 10000 [--cohorts 8]
+"""
+
+import re
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_COHORT = "2025"  # students without a cohort, as on the Program Dashboard
+
+INPUT_COLUMNS = ["cbp_count", "conflexion_count", "bow_score", "self_assessments_count"]
+
+# Smallest cohort maximum per input (the TypeScript's Math.max(..., 1) / Math.max(10, ...))
+MIN_MAXIMA = np.array([1.0, 1.0, 10.0, 1.0])
+
+ZONES = np.array(["Syncing", "Connecting", "Engaging", "Leading"])
+ZONE_BOUNDS = [25, 50, 75]
+
+RESULT_COLUMNS = ["student_id", "cohort"] + INPUT_COLUMNS + ["raw_score", "relative_score", "zone"]
+
+# Tables whose changes move engagement scores
+SOURCE_TABLES = ("assessments", "metric_tracking", "term_tracking")
+
+# Active students (the v_student_dashboard pool both dashboards use) with
+# their four inputs, all from the per-student rollup behind the view
+INPUTS_SQL = f"""
+    SELECT d.student_id,
+           COALESCE(s.cohort, '{DEFAULT_COHORT}') AS cohort,
+           COALESCE(d.cbp_count, 0) AS cbp_count,
+           COALESCE(d.conflexion_count, 0) AS conflexion_count,
+           COALESCE(d.bow_score, 0) AS bow_score,
+           COALESCE(d.self_assessments_count, 0) AS self_assessments_count
+    FROM v_student_dashboard d
+    JOIN students s ON s.id = d.student_id
+"""
+
+
+def fetch_inputs():
+    """DataFrame of every active student's cohort and engagement inputs."""
+    from db_client import run_sql
+
+    df = pd.DataFrame(run_sql(INPUTS_SQL), columns=["student_id", "cohort"] + INPUT_COLUMNS)
+    df[INPUT_COLUMNS] = df[INPUT_COLUMNS].apply(pd.to_numeric, errors="coerce").fillna(0)
+    return df
+
+
+def _round_half_up(values, decimals=0):
+    """JavaScript's Math.round / toFixed for the non-negative values used here."""
+    scale = 10.0 ** decimals
+    return np.floor(values * scale + 0.5) / scale
+
+
+def compute_engagement(inputs):
+    """Raw score, relative score and zone for every student, per cohort.
+
+    `inputs` has a `cohort` column and the four INPUT_COLUMNS; the result
+    keeps the input rows in order and adds `raw_score`, `relative_score` and
+    `zone`.
+    """
+    out = inputs.reset_index(drop=True).copy()
+    if out.empty:
+        return out.assign(raw_score=pd.Series(dtype=int), relative_score=pd.Series(dtype=float),
+                          zone=pd.Series(dtype=object))
+
+    codes, cohorts = pd.factorize(out["cohort"])
+    values = out[INPUT_COLUMNS].to_numpy(dtype=float)
+
+    # Cohort maxima of all four inputs at once: (cohorts x 4), floored
+    maxima = np.tile(MIN_MAXIMA, (len(cohorts), 1))
+    np.maximum.at(maxima, codes, values)
+    norm = np.minimum(values, maxima[codes]) / maxima[codes]
+
+    # Same summation order as the TypeScript, so ties round identically
+    raw = _round_half_up((norm[:, 0] + norm[:, 1] + norm[:, 2] + norm[:, 3]) * 25)
+
+    n = np.bincount(codes, minlength=len(cohorts))
+    mean = np.bincount(codes, weights=raw, minlength=len(cohorts)) / n
+    dev = raw - mean[codes]
+    variance = np.bincount(codes, weights=dev ** 2, minlength=len(cohorts)) / np.maximum(n - 1, 1)
+    sd = np.sqrt(variance)
+    sd[sd == 0] = 1
+
+    relative = _round_half_up(np.clip(dev / sd[codes] * 25 + 62.5, 2, 98), 1)
+
+    out["raw_score"] = raw.astype(int)
+    out["relative_score"] = relative
+    out["zone"] = ZONES[np.searchsorted(ZONE_BOUNDS, relative, side="right")]
+    return out
+
+
+def engagement_sql(scores):
+    """Statements replacing `engagement_scores` with `scores`."""
+    from diff_writer import sql_literal
+
+    statements = []
+    ids = ", ".join(sql_literal(s) for s in scores["student_id"])
+    statements.append("DELETE FROM engagement_scores" + (f" WHERE student_id NOT IN ({ids})" if ids else "") + ";")
+    if len(scores):
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in RESULT_COLUMNS[1:])
+        rows = list(_records(scores))
+        for start in range(0, len(rows), 500):
+            values = ",\n".join("(" + ", ".join(sql_literal(r[c]) for c in RESULT_COLUMNS) + ")"
+                                for r in rows[start:start + 500])
+            statements.append(f"INSERT INTO engagement_scores ({', '.join(RESULT_COLUMNS)}) VALUES {values} "
+                              f"ON CONFLICT (student_id) DO UPDATE SET {updates}, computed_at = now();")
+    return statements
+
+
+def _records(scores):
+    for row in scores[RESULT_COLUMNS].itertuples(index=False):
+        yield {c: (v.item() if isinstance(v, np.generic) else v) for c, v in zip(RESULT_COLUMNS, row)}
+
+
+def write_engagement_scores(scores, bulk=False):
+    """Replace the table's contents with `scores`."""
+    if bulk:
+        from bulk_loader import bulk_load
+
+        # Delete and reload in one transaction; computed_at takes its default
+        return bulk_load("engagement_scores", _records(scores), delete_where="TRUE")
+
+    from sql_executor import execute_sql
+
+    report = execute_sql("\n".join(engagement_sql(scores)), verbose=False)
+    if not report.ok:
+        raise RuntimeError(f"engagement_scores: only {report.statements_committed}/{report.statements} statements committed")
+    return len(scores)
+
+
+def refresh_engagement_scores(bulk=False, write=True):
+    """Recompute every cohort and (unless `write=False`) store the result."""
+    start = time.perf_counter()
+    scores = compute_engagement(fetch_inputs())
+    if write:
+        write_engagement_scores(scores, bulk=bulk)
+    zones = scores["zone"].value_counts().reindex(ZONES, fill_value=0)
+    print(f"[engagement_scores] {len(scores)} students in {scores['cohort'].nunique()} cohorts "
+          f"({', '.join(f'{z} {n}' for z, n in zones.items())}) in {time.perf_counter() - start:.2f}s")
+    return scores
+
+
+def touches_engagement(sql):
+    """Whether SQL text writes one of the tables engagement scores are computed from."""
+    tables = "|".join(SOURCE_TABLES)
+    return re.search(rf"\b(INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+({tables})\b", sql, re.IGNORECASE) is not None
+
+
+def _reference_engagement(students):
+    """Line-by-line port of calculateCohortEngagement() for one cohort (benchmark baseline)."""
+    if not students:
+        return {}
+    max_cbp = max([s["cbp_count"] for s in students] + [1])
+    max_conf = max([s["conflexion_count"] for s in students] + [1])
+    max_bow = max([10] + [s["bow_score"] for s in students])
+    max_sa = max([s["self_assessments_count"] for s in students] + [1])
+
+    raw_scores = []
+    for s in students:
+        total = (min(s["cbp_count"], max_cbp) / max_cbp + min(s["conflexion_count"], max_conf) / max_conf
+                 + min(s["bow_score"], max_bow) / max_bow + min(s["self_assessments_count"], max_sa) / max_sa)
+        raw_scores.append((s["student_id"], int(np.floor(total * 25 + 0.5))))
+
+    n = len(raw_scores)
+    mean = sum(r for _, r in raw_scores) / n
+    variance = sum((r - mean) ** 2 for _, r in raw_scores) / max(n - 1, 1)
+    sd = variance ** 0.5 or 1
+
+    results = {}
+    for student_id, raw in raw_scores:
+        relative = max(2, min(98, (raw - mean) / sd * 25 + 62.5))
+        relative = float(Decimal(relative).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))  # toFixed(1)
+        zone = ZONES[sum(relative >= b for b in ZONE_BOUNDS)]
+        results[student_id] = (raw, relative, zone)
+    return results
+
+
+def synthetic_inputs(students, cohorts=4, seed=0):
+    """Random cohorts shaped like the real tracking data."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "student_id": [f"s{i:06d}" for i in range(students)],
+        "cohort": rng.choice([str(2020 + c) for c in range(cohorts)], students),
+        "cbp_count": rng.poisson(6, students).astype(float),
+        "conflexion_count": rng.poisson(3, students).astype(float),
+        "bow_score": np.round(rng.uniform(0, 12, students), 2),
+        "self_assessments_count": rng.integers(0, 120, students).astype(float),
+    })
+
+
+def benchmark(students, cohorts=4):
+    inputs = synthetic_inputs(students, cohorts)
+
+    start = time.perf_counter()
+    expected = {}
+    for _, group in inputs.groupby("cohort", sort=False):
+        expected.update(_reference_engagement(group.to_dict("records")))
+    reference_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = compute_engagement(inputs)
+    numpy_s = time.perf_counter() - start
+
+    got = {r.student_id: (r.raw_score, r.relative_score, r.zone) for r in scores.itertuples()}
+    mismatches = sum(got[k] != v for k, v in expected.items())
+    print(f"{students} students in {cohorts} cohorts")
+    print(f"  per-cohort Python loop : {reference_s * 1000:8.1f} ms")
+    print(f"  grouped NumPy          : {numpy_s * 1000:8.1f} ms  ({reference_s / numpy_s:.1f}x)")
+    print(f"  mismatches             : {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        i = sys.argv.index("--benchmark")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else 10000
+        k = int(sys.argv[sys.argv.index("--cohorts") + 1]) if "--cohorts" in sys.argv else 4
+        sys.exit(1 if benchmark(n, k) else 0)
+
+    refresh_engagement_scores(bulk="--bulk" in sys.argv, write="--dry-run" not in sys.argv)
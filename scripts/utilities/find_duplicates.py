@@ -1,24 +1,8 @@
-import json
-import subprocess
 from dotenv import load_dotenv
 
-load_dotenv("frontend/.env.local")
-
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
+from db_client import run_sql
 
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return []
+load_dotenv("frontend/.env.local")
 
 questions_raw = run_sql("SELECT q.question_text, q.project_context, p.name as param_name, d.name as domain_name FROM self_assessment_questions q JOIN readiness_parameters p ON q.parameter_id = p.id JOIN readiness_domains d ON p.domain_id = d.id")
 
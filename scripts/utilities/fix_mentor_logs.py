@@ -1,17 +1,6 @@
 import json
-import subprocess
 
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = "https://api.supabase.com/v1/projects/wqcdtdofwytfrcbhfycc/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL, "-H", f"Authorization: Bearer {PAT}", "-H", "Content-Type: application/json", "-d", payload]
-    res = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(res.stdout)
-    except:
-        return res.stdout
+from db_client import run_sql
 
 # 1. Get standard program_id and term
 logs = run_sql("SELECT program_id, term FROM assessment_logs LIMIT 1")
@@ -1,60 +1,53 @@
-import json
-import subprocess
+import numpy as np
+import pandas as pd
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
+from db_client import run_sql, SQLError
+from diff_writer import sql_literal
+from scale_inference import ScoreProfile, infer_scale
+from score_normalization import Scale, recompute_sql, refresh_summaries_sql
 
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return {"raw": result.stdout}
-
-# These 3 files appear to have been answered on 1-10 but stored with raw_scale_max=5.
-# When raw_score > 5, the student was clearly answering on a 0-10 or 1-10 scale.
-# Fix: update raw_scale_max = 10 for all rows where raw_scale_max=5 AND source file is one of the bad ones
+# Some exports were answered on 1-10 but stored with raw_scale_max=5 - when
+# raw_score > 5, the student was clearly answering on a 1-10 scale. The
+# importers now infer the scale before writing; this finds any stored file
+# whose scores contradict its raw_scale_max (instead of a hand-kept list)
+# and re-applies the inferred scale.
 
-BAD_FILES = [
-    'Business X-Ray _ Responses (1).xlsx',
-    'Legacy Assessment - Readiness Self-Assessment (Responses) (2).xlsx',
-    'Marketing Project - Readiness Self-Assessment (Responses) (1).xlsx'
-]
+print("=== Score distribution per source file ===")
+rows = run_sql("""
+    SELECT source_file, raw_scale_min, raw_scale_max, raw_score, COUNT(*) AS n
+    FROM assessments
+    WHERE assessment_type = 'self' AND raw_score IS NOT NULL
+    GROUP BY source_file, raw_scale_min, raw_scale_max, raw_score
+""")
+df = pd.DataFrame(rows)
+if len(df):
+    df = df.fillna({"raw_scale_min": 1, "raw_scale_max": 10})
 
-# First, let's check what the full range looks like for these files (including valid rows)
-print("=== Full range of bad files ===")
-for f in BAD_FILES:
-    r = run_sql(f"""
-        SELECT raw_scale_max, COUNT(*), MIN(raw_score), MAX(raw_score)
-        FROM assessments
-        WHERE source_file = '{f}'
-        GROUP BY raw_scale_max
-    """)
-    print(f"{f}: {r}")
+BAD_FILES = {}
+for (f, lo, hi), part in (df.groupby(["source_file", "raw_scale_min", "raw_scale_max"]) if len(df) else []):
+    profile = ScoreProfile()
+    profile.add(np.repeat(part["raw_score"].astype(float).to_numpy(), part["n"].astype(int).to_numpy()))
+    stats = profile.overall()
+    guess = infer_scale(stats, Scale(int(lo), int(hi)))
+    print(f"{f} (stored {int(lo)}-{int(hi)}): {int(stats['count'])} scores, "
+          f"{stats['min']:g}-{stats['max']:g}, median {stats['q50']:g}{' -> ' + guess.reason if guess.reason else ''}")
+    if guess.changed:
+        BAD_FILES[f] = guess.scale
 
 print("\n=== Correcting raw_scale_max for all rows in bad source files ===")
-# All 3 bad files appear to be on a 1-10 scale despite raw_scale_max=5 being stored
-# Fix all rows in these files to use raw_scale_max=10, then recalculate normalized
-for f in BAD_FILES:
-    r = run_sql(f"""
-        UPDATE assessments
-        SET
-            raw_scale_max = 10,
-            raw_scale_min = 1,
-            normalized_score = ROUND(raw_score, 2)
-        WHERE source_file = '{f}'
-          AND assessment_type = 'self'
-    """)
-    if isinstance(r, list):
+# Set each file's inferred scale, then recalculate normalized
+updated = []
+for f, scale in BAD_FILES.items():
+    try:
+        r = run_sql(recompute_sql(f"source_file = {sql_literal(f)} AND assessment_type = 'self'", scale))
+        updated += r
         print(f"Updated rows in '{f}': {len(r)}")
-    else:
-        print(f"Result for '{f}': {r}")
+    except SQLError as e:
+        print(f"Result for '{f}': {e}")
+
+# Domain scores, dashboard rollups and self-awareness gaps of the rows changed
+if updated:
+    run_sql("\n".join(refresh_summaries_sql(updated)))
 
 print("\n=== Verification ===")
 verify = run_sql("""
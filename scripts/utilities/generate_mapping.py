@@ -1,31 +1,14 @@
 import pandas as pd
-import subprocess
-import json
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
+from keyword_rules import ContainmentMatcher
+from reference_cache import load_reference_data
+from workbook_cache import open_workbook
 
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except Exception as e:
-        print(f"Error running SQL: {e}")
-        print(f"STDOUT: {result.stdout}")
-        print(f"STDERR: {result.stderr}")
-        raise
+print("Fetching db parameters...")
+ref = load_reference_data()
+domains = {d['id']: d['name'] for d in ref['readiness_domains']}
 
-print("Fetching db parameters via raw SQL...")
-domains_raw = run_sql("SELECT id, name FROM readiness_domains")
-domains = {d['id']: d['name'] for d in domains_raw}
-
-params_raw = run_sql("SELECT id, domain_id, name, description FROM readiness_parameters")
+params_raw = ref['readiness_parameters']
 
 db_params = []
 for p in params_raw:
@@ -36,8 +19,11 @@ for p in params_raw:
         "desc": p['description']
     })
 
+# All parameter names in one automaton; the first listed name found in a cell wins
+param_matcher = ContainmentMatcher((dp['name'], dp) for dp in db_params)
+
 path = "data/Year 1 Assessment_Matrix (1) (1) (1).xlsx"
-xl = pd.ExcelFile(path)
+xl = open_workbook(path)
 
 mapping = []
 
@@ -56,7 +42,7 @@ for sheet in xl.sheet_names:
         continue
     
     project_name = sheet_to_project[sheet]
-    df = pd.read_excel(xl, sheet_name=sheet)
+    df = xl.parse(sheet)
     
     col_param = df.columns[0]
     col_question = df.columns[1]
@@ -68,11 +54,7 @@ for sheet in xl.sheet_names:
         if not question_cell or not param_cell.strip():
             continue
             
-        best_match = None
-        for dp in db_params:
-            if dp['name'].lower() in param_cell.lower():
-                best_match = dp
-                break
+        best_match = param_matcher.first(param_cell)
                 
         if best_match:
             mapping.append({
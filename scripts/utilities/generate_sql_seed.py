@@ -1,30 +1,17 @@
+import sys
+
 import pandas as pd
-import json
-import subprocess
-
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        data = json.loads(result.stdout)
-        if "error" in data:
-            print(f"SQL Error: {data['error']}")
-        return data
-    except Exception as e:
-        print(f"Error running SQL: {e}")
-        print(f"STDOUT: {result.stdout}")
-        return []
+
+from diff_writer import compute_delta, fetch_current
+from keyword_rules import ContainmentMatcher
+from reference_cache import load_reference_data
+from score_normalization import scale_for
+from sql_artifact import SQLArtifact, artifact_path
+from workbook_cache import open_workbook
 
 print("1. Fetching Readiness Parameters...")
-params_raw = run_sql("SELECT id, name FROM readiness_parameters")
+ref = load_reference_data()
+params_raw = ref['readiness_parameters']
 
 # Lookup map: parameter_name -> parameter_id
 param_map = {}
@@ -32,9 +19,15 @@ for p in params_raw:
     param_map[p['name']] = p['id']
 
 print("1.5 Fetching Projects...")
-projects_raw = run_sql("SELECT id, name FROM projects")
+projects_raw = ref['projects']
 project_map = {p['name']: p['id'] for p in projects_raw}
 
+# All parameter names in one automaton; the first listed name found in a text wins
+param_matcher = ContainmentMatcher(param_map.items())
+# Semantic-map names that equal a parameter name (ignoring case and
+# surrounding spaces) match it before any containment lookup
+exact_params = {name.lower().strip(): p_id for name, p_id in reversed(list(param_map.items()))}
+
 # 1. First, we load the semantic mapping we generated
 print("2. Formatting Semantic Mappings...")
 with open("scripts/semantic_mapping.md", "r") as f:
@@ -51,12 +44,7 @@ for line in lines[4:]:
     project, domain, param_name, question_text = parts
     
     # We only care about exact matches for insertion
-    best_p_id = None
-    for dm_name, dm_id in param_map.items():
-        # Match ignoring case and trailing spaces
-        if dm_name.lower().strip() == param_name.lower().strip() or dm_name.lower() in param_name.lower():
-            best_p_id = dm_id
-            break
+    best_p_id = exact_params.get(param_name.lower().strip()) or param_matcher.first(param_name)
 
     if best_p_id:
         questions_to_insert.append({
@@ -64,7 +52,7 @@ for line in lines[4:]:
             "question_text": question_text,
             "project_context": project,
             "project_id": project_map.get(project),
-            "rating_scale_max": 10 if project in ["SDP", "Accounts"] else 5
+            "rating_scale_max": scale_for("self", project).max
         })
     else:
         print(f"WARNING: Unknown parameter '{param_name}' in semantic map")
@@ -72,7 +60,7 @@ for line in lines[4:]:
 # 2. Next, we load the direct mappings from the Mentor Matrix
 print("3. Extracting Direct Mappings from Matrix...")
 path = "data/Year 1 Assessment_Matrix (1) (1) (1).xlsx"
-xl = pd.ExcelFile(path)
+xl = open_workbook(path)
 
 sheet_to_project = {
     "Kickstart": "Kickstart",
@@ -85,7 +73,7 @@ for sheet in xl.sheet_names:
         continue
     
     project_name = sheet_to_project[sheet]
-    df = pd.read_excel(xl, sheet_name=sheet)
+    df = xl.parse(sheet)
     
     col_param = df.columns[0]
     col_question = df.columns[1]
@@ -98,11 +86,7 @@ for sheet in xl.sheet_names:
             continue
             
         # Find parameter ID
-        best_match_id = None
-        for p_name, p_id in param_map.items():
-            if p_name.lower() in param_cell.lower():
-                best_match_id = p_id
-                break
+        best_match_id = param_matcher.first(param_cell)
                 
         if best_match_id and len(question_cell) > 10: # Ensure it's a real question
             questions_to_insert.append({
@@ -110,38 +94,33 @@ for sheet in xl.sheet_names:
                 "question_text": question_cell.strip(),
                 "project_context": project_name,
                 "project_id": project_map.get(project_name),
-                "rating_scale_max": 10 if project_name in ["SDP", "Accounts"] else 5
+                "rating_scale_max": scale_for("self", project_name).max
             })
 
 print(f"4. Generating SQL to insert {len(questions_to_insert)} questions...")
 
-sql_statements = [
-    "DELETE FROM assessments;",
-    "DELETE FROM self_assessment_questions;"
-]
-
-values = []
 order_counter = {}
 
 for q in questions_to_insert:
-    clean_q = q['question_text'].replace("'", "''")
-    clean_p = q['project_context'].replace("'", "''")
     p_id = q['project_id']
     
     if p_id not in order_counter:
         order_counter[p_id] = 1
     
-    q_order = order_counter[p_id]
+    q['question_order'] = order_counter[p_id]
     order_counter[p_id] += 1
-    
-    values.append(f"('{p_id}', {q_order}, '{q['parameter_id']}', '{clean_q}', '{clean_p}', {q['rating_scale_max']})")
-
-if values:
-    sql_statements.append("INSERT INTO self_assessment_questions (project_id, question_order, parameter_id, question_text, project_context, rating_scale_max) VALUES \n" + ",\n".join(values) + ";")
 
-final_sql = "\n".join(sql_statements)
+# Diff against the seeded questions (those not created by an import log),
+# keyed by project and normalized question text: unchanged questions keep their
+# id, so their self-assessments stay linked, whatever their position. Only
+# assessments that point at a removed or re-parameterised question go with it.
+current = fetch_current("self_assessment_questions", {"assessment_log_id": None})
+delta = compute_delta("self_assessment_questions", current, questions_to_insert)
+print(f"   Delta against the database: {delta.summary()}")
 
-with open("scripts/003_seed_questions.sql", "w") as f:
-    f.write(final_sql)
+# Streamed to disk; --gzip compresses it, --copy writes COPY blocks for psql
+out_path = artifact_path("scripts/003_seed_questions.sql")
+with SQLArtifact(out_path, copy="--copy" in sys.argv) as out:
+    out.write_delta("self_assessment_questions", delta)
 
-print("Created scripts/003_seed_questions.sql! Safe to execute via Supabase dashboard or via API.")
+print(f"Created {out_path} ({out.summary()})! Safe to execute via Supabase dashboard or via API.")
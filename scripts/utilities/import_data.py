@@ -1,7 +1,23 @@
+import numpy as np
 import pandas as pd
 import requests
-import math
-import os
+import sys
+
+from bulk_loader import TARGETS as BULK_TARGETS, bulk_load
+from db_client import pooled_session, run_sql
+from domain_scores import refresh_sql, row_keys
+from engagement_scores import refresh_engagement_scores
+from matrix_extractor import TARGET_TABS, extract_scores, scale_max_for
+from name_resolver import NameResolver
+from parallel_ingest import run_tasks, worker_count
+from peer_feedback_summary import peer_keys, refresh_peer_sql
+from reference_cache import load_reference_data
+from response_reader import iter_response_batches
+from score_aggregation import ScoreAggregator
+from score_normalization import normalize, scale_for
+from self_awareness import refresh_gap_sql
+from student_rollup import refresh_rollup_sql
+from workbook_cache import open_workbook, read_sheet
 
 URL = "https://wqcdtdofwytfrcbhfycc.supabase.co/rest/v1"
 KEY = "your_supabase_anon_key_here"
@@ -12,16 +28,32 @@ HEADERS = {
     "Prefer": "return=minimal"
 }
 
-def fetch_table(table, select="*"):
-    r = requests.get(f"{URL}/{table}?select={select}", headers=HEADERS)
-    r.raise_for_status()
-    return r.json()
+# One keep-alive session for every PostgREST call in this run
+session = pooled_session()
+
+# --bulk: load assessments / peer feedback through COPY on the direct
+# connection instead of 100-row PostgREST batches
+BULK = "--bulk" in sys.argv
+
+# --stream: read form-response exports in bounded-memory batches
+STREAM = "--stream" in sys.argv
 
-def insert_rows(table, rows, on_conflict=None):
+def sheet_batches(path, sheet_name):
+    """A response sheet as DataFrame batches: streamed with --stream, else one cached read."""
+    if STREAM:
+        return iter_response_batches(path, sheet_name)
+    return [read_sheet(path, sheet_name)]
+
+def insert_rows(table, rows, on_conflict=None, after_sql=None):
+    """Upsert `rows`, then run `after_sql` (e.g. a summary refresh) - in the
+    same COPY transaction with --bulk, right after the last batch otherwise."""
     if not rows: return
+    if BULK and table in BULK_TARGETS:
+        bulk_load(table, rows, after_sql=after_sql)
+        return
     headers = HEADERS.copy()
     if on_conflict:
-        headers["Prefer"] = f"return=minimal, resolution=merge-duplicates"
+        headers["Prefer"] = "return=minimal, resolution=merge-duplicates"
         url = f"{URL}/{table}?on_conflict={on_conflict}"
     else:
         url = f"{URL}/{table}"
@@ -30,56 +62,64 @@ def insert_rows(table, rows, on_conflict=None):
     batch_size = 100
     for i in range(0, len(rows), batch_size):
         batch = rows[i:i+batch_size]
-        r = requests.post(url, headers=headers, json=batch)
+        r = session.post(url, headers=headers, json=batch)
         try:
             r.raise_for_status()
         except requests.exceptions.HTTPError as e:
             print(f"Error inserting into {table}: {r.text}")
             raise e
+    if after_sql:
+        run_sql(after_sql)
 
-def clean_name(name):
-    if pd.isna(name): return ""
-    return str(name).strip().lower()
-
-print("Fetching metadata from Supabase...")
-students = fetch_table('students', 'id,canonical_name,aliases')
-projects = fetch_table('projects', 'id,name,internal_name')
-domains = {d['id']: d['short_name'] for d in fetch_table('readiness_domains')}
-params = fetch_table('readiness_parameters', 'id,domain_id,param_number')
-
-# Build parameter lookup: (domain_short_name, param_number) -> id
-param_map = {}
-for p in params:
-    domain_short = domains[p['domain_id']]
-    param_map[(domain_short, p['param_number'])] = p['id']
-
-def get_student_id(name_str):
-    name_clean = clean_name(name_str)
-    if not name_clean: return None
-    for s in students:
-        if clean_name(s['canonical_name']) == name_clean: return s['id']
-        for alias in s['aliases']:
-            if clean_name(alias) == name_clean: return s['id']
-    return None
-
-def get_project_id(name_str):
-    name_clean = clean_name(name_str)
-    if not name_clean: return None
-    for p in projects:
-        if clean_name(p['name']) == name_clean: return p['id']
-        if p['internal_name'] and clean_name(p['internal_name']) == name_clean: return p['id']
-    return None
+def load_lookups():
+    """(NameResolver, (domain_short_name, param_number) -> parameter id)."""
+    print("Fetching metadata from Supabase...")
+    ref = load_reference_data()
+    domains = {d['id']: d['short_name'] for d in ref['readiness_domains']}
 
-def main():
-    print("="*50)
-    print("1. Importing Term Tracking...")
-    df_term = pd.read_excel('../data/Term Report CBP Conflexion BOW.xlsx', sheet_name='Sheet1')
-    term_rows = []
-    for _, row in df_term.iterrows():
+    # Build parameter lookup: (domain_short_name, param_number) -> id
+    param_map = {}
+    for p in ref['readiness_parameters']:
+        domain_short = domains[p['domain_id']]
+        param_map[(domain_short, p['param_number'])] = p['id']
+
+    return NameResolver(ref['students'], ref['projects']), param_map
+
+# Each parse_* function reads one source and returns (rows, log lines). They
+# run in ingest worker processes, so they take their lookups as arguments and
+# leave printing and writing to main().
+
+TERM_FILE = '../data/Term Report CBP Conflexion BOW.xlsx'
+PEER_FILE = '../data/Peer Feedback Form (Responses) (1).xlsx'
+BXR_FILE = '../data/Business X-Ray _ Responses.xlsx'
+ACC_FILE = '../data/Accounting Project \u2013 Readiness Self-Assessment (Responses).xlsx'
+MATRIX_FILE = '../data/Year 1 Assessment_Matrix (1) (1) (1).xlsx'
+
+# BXR Mapping: index in Qs (0 to 19) -> (domain, param_number)
+# 20 questions starts from 4th column.
+BXR_MAP = [
+    ('commercial', 1), ('commercial', 2), ('commercial', 4),
+    ('entrepreneurial', 1), ('entrepreneurial', 2), ('entrepreneurial', 4),
+    ('marketing', 1), ('marketing', 3), ('marketing', 4),
+    ('innovation', 1), ('innovation', 2), ('innovation', 4),
+    ('operational', 1), ('operational', 2), ('operational', 3), ('operational', 4),
+    ('commercial', 3), ('professional', 2), ('professional', 3), ('professional', 4)
+]
+
+ACC_MAP = [
+    ('commercial', 1), ('commercial', 3), ('commercial', 1), ('commercial', 3),
+    ('operational', 3), ('operational', 4), ('professional', 2), ('professional', 3), ('professional', 4)
+]
+
+def parse_term(resolver):
+    df_term = read_sheet(TERM_FILE, 'Sheet1')
+    term_rows, log = [], []
+    term_student_ids = resolver.resolve_students(df_term['Student Name'])
+    for idx, row in df_term.iterrows():
         student_name = row['Student Name']
-        student_id = get_student_id(student_name)
+        student_id = term_student_ids[idx]
         if not student_id:
-            print(f"Student not found: {student_name}")
+            log.append(f"Student not found: {student_name}{resolver.describe_unmatched(student_name)}")
             continue
         cbp = 0 if pd.isna(row['CBP']) else int(row['CBP'])
         conflexion = 0 if pd.isna(row['Conflexion']) else int(row['Conflexion'])
@@ -92,237 +132,202 @@ def main():
             "bow_score": bow,
             "term": "Year 1"
         })
-    insert_rows('term_tracking', term_rows, on_conflict="student_id,term")
-    print(f"✅ Imported {len(term_rows)} term tracking records.")
+    return term_rows, log
 
-    print("="*50)
-    print("2. Importing Peer Feedback...")
-    df_peer = pd.read_excel('../data/Peer Feedback Form (Responses) (1).xlsx', sheet_name='Peer feedback metrics ')
+def safe_int(val):
+    if pd.isna(val): return None
+    try: return int(val)
+    except: return None
+
+def parse_peer(resolver):
     peer_rows = []
-    for _, row in df_peer.iterrows():
-        giver_name = row['Your Name (So we can follow up if needed)']
-        recipient_name = row['Recipient Name (Who are you giving feedback to?)']
-        proj_name = row['Project Name']
-        
-        giver_id = get_student_id(giver_name)
-        recipient_id = get_student_id(recipient_name)
-        proj_id = get_project_id(proj_name)
+    for df_peer in sheet_batches(PEER_FILE, 'Peer feedback metrics '):
+        giver_ids = resolver.resolve_students(df_peer['Your Name (So we can follow up if needed)'])
+        recipient_ids = resolver.resolve_students(df_peer['Recipient Name (Who are you giving feedback to?)'])
+        peer_proj_ids = resolver.resolve_projects(df_peer['Project Name'])
+        for idx, row in df_peer.iterrows():
+            giver_id = giver_ids[idx]
+            recipient_id = recipient_ids[idx]
+            proj_id = peer_proj_ids[idx]
         
-        if not (giver_id and recipient_id and proj_id):
-            continue
-            
-        def safe_int(val):
-            if pd.isna(val): return None
-            try: return int(val)
-            except: return None
+            if not (giver_id and recipient_id and proj_id):
+                continue
             
-        peer_rows.append({
-            "recipient_id": recipient_id,
-            "giver_id": giver_id,
-            "project_id": proj_id,
-            "quality_of_work": safe_int(row['Quality of Work ']),
-            "initiative_ownership": safe_int(row['Initiative & Ownership ']),
-            "communication": safe_int(row['Communication ']),
-            "collaboration": safe_int(row['Collaboration ']),
-            "growth_mindset": safe_int(row['Growth Mindset ']),
-        })
-    insert_rows('peer_feedback', peer_rows, on_conflict="recipient_id,giver_id,project_id")
-    print(f"✅ Imported {len(peer_rows)} peer feedback records.")
+            peer_rows.append({
+                "recipient_id": recipient_id,
+                "giver_id": giver_id,
+                "project_id": proj_id,
+                "quality_of_work": safe_int(row['Quality of Work ']),
+                "initiative_ownership": safe_int(row['Initiative & Ownership ']),
+                "communication": safe_int(row['Communication ']),
+                "collaboration": safe_int(row['Collaboration ']),
+                "growth_mindset": safe_int(row['Growth Mindset ']),
+            })
+    return peer_rows, []
 
-    print("="*50)
-    print("3. Importing Business X-Ray Self-Assessment...")
-    # BXR Mapping: index in Qs (0 to 19) -> (domain, param_number)
-    # 20 questions starts from 4th column.
-    bxr_map = [
-        ('commercial', 1), ('commercial', 2), ('commercial', 4),
-        ('entrepreneurial', 1), ('entrepreneurial', 2), ('entrepreneurial', 4),
-        ('marketing', 1), ('marketing', 3), ('marketing', 4),
-        ('innovation', 1), ('innovation', 2), ('innovation', 4),
-        ('operational', 1), ('operational', 2), ('operational', 3), ('operational', 4),
-        ('commercial', 3), ('professional', 2), ('professional', 3), ('professional', 4)
-    ]
-    df_bxr = pd.read_excel('../data/Business X-Ray _ Responses.xlsx', sheet_name='Form Responses 1')
-    bxr_proj_id = get_project_id('Business X-Ray')
+def parse_bxr(resolver, param_map, bxr_proj_id):
     bxr_assessments = []
-    
-    # columns are Timestamp, Student Name, then 20 questions
-    q_cols = df_bxr.columns[2:22]
-    for _, row in df_bxr.iterrows():
-        student_id = get_student_id(row['Student Name'])
-        if not student_id: continue
+    scale = scale_for("self", "Business X-Ray", source_file="Business X-Ray _ Responses.xlsx")
+    for df_bxr in sheet_batches(BXR_FILE, 'Form Responses 1'):
+        # columns are Timestamp, Student Name, then 20 questions
+        q_cols = df_bxr.columns[2:22]
+        bxr_student_ids = resolver.resolve_students(df_bxr['Student Name'])
+        for idx, row in df_bxr.iterrows():
+            student_id = bxr_student_ids[idx]
+            if not student_id: continue
         
-        for i, col in enumerate(q_cols):
-            val = row[col]
-            if pd.isna(val): continue
-            score = float(val)
-            norm = (score - 1) / (5 - 1) * 9 + 1
+            for i, col in enumerate(q_cols):
+                val = row[col]
+                if pd.isna(val): continue
+                score = float(val)
             
-            domain_short, pnum = bxr_map[i]
-            param_id = param_map.get((domain_short, pnum))
+                domain_short, pnum = BXR_MAP[i]
+                param_id = param_map.get((domain_short, pnum))
             
-            bxr_assessments.append({
-                "student_id": student_id,
-                "project_id": bxr_proj_id,
-                "parameter_id": param_id,
-                "assessment_type": "self",
-                "raw_score": score,
-                "raw_scale_min": 1,
-                "raw_scale_max": 5,
-                "normalized_score": norm,
-                "source_file": "Business X-Ray _ Responses.xlsx"
-            })
-    insert_rows('assessments', bxr_assessments, on_conflict="student_id,project_id,parameter_id,assessment_type")
-    print(f"✅ Imported {len(bxr_assessments)} Business X-Ray self-assessments.")
+                bxr_assessments.append({
+                    "student_id": student_id,
+                    "project_id": bxr_proj_id,
+                    "parameter_id": param_id,
+                    "assessment_type": "self",
+                    "raw_score": score,
+                    "raw_scale_min": scale.min,
+                    "raw_scale_max": scale.max,
+                    "source_file": "Business X-Ray _ Responses.xlsx"
+                })
 
-    print("="*50)
-    print("4. Importing Accounting Self-Assessment...")
-    acc_map = [
-        ('commercial', 1), ('commercial', 3), ('commercial', 1), ('commercial', 3),
-        ('operational', 3), ('operational', 4), ('professional', 2), ('professional', 3), ('professional', 4)
-    ]
-    df_acc = pd.read_excel('../data/Accounting Project \u2013 Readiness Self-Assessment (Responses).xlsx', sheet_name='Form responses 1')
-    acc_proj_id = get_project_id('Accounts')
-    acc_assessments = []
-    
-    q_cols = [c for c in df_acc.columns if c.startswith('I') or c.startswith('Please rate')]
-    q_cols = q_cols[:9] # first 9 are scored
-    
-    acc_scores_agg = {} # (student_id, param_id) -> list of scores
-    
-    # Name column is 'Preferred Name (First and Last)' roughly.
-    name_col = [c for c in df_acc.columns if 'Name' in c][0]
-    for _, row in df_acc.iterrows():
-        student_id = get_student_id(row[name_col])
-        if not student_id: continue
-        
-        for i, col in enumerate(q_cols):
-            val = row[col]
-            if pd.isna(val): continue
-            try: score = float(val)
-            except: continue
-            
-            domain_short, pnum = acc_map[i]
-            param_id = param_map.get((domain_short, pnum))
-            if not param_id: continue
-            
-            key = (student_id, param_id)
-            if key not in acc_scores_agg:
-                acc_scores_agg[key] = []
-            acc_scores_agg[key].append(score)
-            
-    for (student_id, param_id), scores in acc_scores_agg.items():
-        avg_score = sum(scores) / len(scores)
-        acc_assessments.append({
-            "student_id": student_id,
-            "project_id": acc_proj_id,
-            "parameter_id": param_id,
-            "assessment_type": "self",
-            "raw_score": avg_score,
-            "raw_scale_min": 1,
-            "raw_scale_max": 10,
-            "normalized_score": avg_score, # Already 1-10
-            "source_file": "Accounting Project \u2013 Readiness Self-Assessment (Responses).xlsx"
-        })
-        
-    insert_rows('assessments', acc_assessments, on_conflict="student_id,project_id,parameter_id,assessment_type")
-    print(f"✅ Imported {len(acc_assessments)} Accounting self-assessments.")
+    # Normalize the whole column at once
+    norms = normalize([a["raw_score"] for a in bxr_assessments], scale.min, scale.max, decimals=None)
+    for a, norm in zip(bxr_assessments, norms.tolist()):
+        a["normalized_score"] = norm
+    return bxr_assessments, []
 
-    print("="*50)
-    print("5. Importing Mentor Assessment Matrix...")
-    matrix_file = '../data/Year 1 Assessment_Matrix (1) (1) (1).xlsx'
-    xls = pd.ExcelFile(matrix_file)
-    matrix_assessments = []
-    
-    target_tabs = {
-        'Kickstart': 'Kickstart',
-        'Legacy': 'Legacy',
-        'Copy of Legacy': 'Legacy',
-        'Murder Mystery': 'Marketing',
-        'Copy of Murder Mystery': 'Marketing',
-        'Business Xray': 'Business X-Ray',
-        'Accounts': 'Accounts',
-        'SDP': 'SDP'
-    }
+def parse_accounting(resolver, param_map, acc_proj_id):
+    acc_agg = ScoreAggregator(keys=["student_id", "parameter_id"], values=["raw_score"])
+    acc_param_ids = [param_map.get(k) for k in ACC_MAP]
+    acc_file = "Accounting Project \u2013 Readiness Self-Assessment (Responses).xlsx"
+    scale = scale_for("self", "Accounts", source_file=acc_file)
     
-    domain_mapping = {
-        'commercial readiness': 'commercial',
-        'entrepreneurial readiness': 'entrepreneurial',
-        'marketing readiness': 'marketing',
-        'innovation readiness': 'innovation',
-        'operational readiness': 'operational',
-        'professional readiness': 'professional'
-    }
+    for df_acc in sheet_batches(ACC_FILE, 'Form responses 1'):
+        q_cols = [c for c in df_acc.columns if c.startswith('I') or c.startswith('Please rate')]
+        q_cols = q_cols[:9] # first 9 are scored
     
-    for sheet in xls.sheet_names:
-        if sheet not in target_tabs: continue
-        proj_id = get_project_id(target_tabs[sheet])
-        if not proj_id: continue
-        
-        df = pd.read_excel(xls, sheet_name=sheet)
-        if len(df) < 5: continue
-        
-        # Parse matrix row by row
-        current_domain = None
-        for _, row in df.iterrows():
-            val0 = str(row.iloc[0]).strip().lower()
-            if val0 in domain_mapping:
-                current_domain = domain_mapping[val0]
-                continue
+        # Name column is 'Preferred Name (First and Last)' roughly.
+        name_col = [c for c in df_acc.columns if 'Name' in c][0]
+        acc_student_ids = resolver.resolve_students(df_acc[name_col])
+        known = acc_student_ids.notna().to_numpy()
+
+        # Long form: one row per numeric answer, question i -> ACC_MAP[i]
+        values = df_acc.loc[known, q_cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        r, c = np.nonzero(~np.isnan(values))
+        long = pd.DataFrame({
+            "student_id": acc_student_ids[known].to_numpy()[r],
+            "parameter_id": np.array(acc_param_ids, dtype=object)[c],
+            "raw_score": values[r, c],
+        })
+        acc_agg.add(long[long["parameter_id"].notna()])
             
-            # Identify sub-parameter numbering
-            param_num = None
-            if val0.startswith('1.') or val0.startswith('1 '): param_num = 1
-            elif val0.startswith('2.') or val0.startswith('2 '): param_num = 2
-            elif val0.startswith('3.') or val0.startswith('3 '): param_num = 3
-            elif val0.startswith('4.') or val0.startswith('4 '): param_num = 4
-            elif current_domain and len(val0) > 10 and not pd.isna(row.iloc[0]): 
-                # Could be a param, need to match name loosely or keep track of count
-                pass
-                
-            # Specifically mapping based on known row text prefixes:
-            val_trim = val0[:2]
-            if val_trim in ['1.', '2.', '3.', '4.']:
-                param_num = int(val_trim[0])
-                
-            if current_domain and param_num:
-                param_id = param_map.get((current_domain, param_num))
-                if not param_id: continue
-                
-                # Now go through columns matching students
-                for col_idx in range(1, len(row)):
-                    col_name = df.columns[col_idx]
-                    student_id = get_student_id(col_name)
-                    if not student_id: continue
-                    
-                    score_val = row.iloc[col_idx]
-                    if pd.isna(score_val) or score_val in ['na', 'n/a', '-', '']: continue
-                    try:
-                        score = float(score_val)
-                    except:
-                        continue
-                        
-                    matrix_assessments.append({
-                        "student_id": student_id,
-                        "project_id": proj_id,
-                        "parameter_id": param_id,
-                        "assessment_type": "mentor",
-                        "raw_score": score,
-                        "raw_scale_min": 1,
-                        "raw_scale_max": 10,
-                        "normalized_score": score,
-                        "source_file": matrix_file
-                    })
-                    
-    # Only keep the last inserted score in case of duplicates from 'Copy of X' sheets
+    acc_assessments = (
+        acc_agg.result()
+        .assign(project_id=acc_proj_id, assessment_type="self", raw_scale_min=scale.min,
+                raw_scale_max=scale.max, source_file=acc_file)
+        .assign(normalized_score=lambda d: normalize(d["raw_score"], scale.min, scale.max, decimals=None))
+        .to_dict("records")
+    )
+    return acc_assessments, []
+
+def parse_matrix_sheet(sheet, proj_id, resolver, param_map):
+    df = open_workbook(MATRIX_FILE).parse(sheet)
+    if len(df) < 5: return [], []
     
-    # Deduplicate in python before sending since batch API might not like multiple rows with same pk in one batch
+    # Same extraction and normalization as import_mentor.py
+    scale_max = scale_max_for(TARGET_TABS[sheet])
+    student_cols = resolver.student_columns(df)
+    scores = extract_scores(df, student_cols, param_map, scale_max=scale_max)
+    return (
+        scores[["student_id", "parameter_id", "raw_score", "normalized_score"]]
+        .assign(project_id=proj_id, assessment_type="mentor", raw_scale_min=1,
+                raw_scale_max=scale_max, source_file=MATRIX_FILE)
+        .to_dict("records")
+    ), []
+
+def dedup_assessments(rows):
+    """Last row wins per (student, project, parameter, type) - one upsert per key."""
     dedup = {}
-    for a in matrix_assessments:
+    for a in rows:
         k = (a['student_id'], a['project_id'], a['parameter_id'], a['assessment_type'])
         dedup[k] = a
-        
-    insert_rows('assessments', list(dedup.values()), on_conflict="student_id,project_id,parameter_id,assessment_type")
-    print(f"✅ Imported {len(dedup)} mentor assessments.")
+    return list(dedup.values())
+
+def main():
+    resolver, param_map = load_lookups()
+    bxr_proj_id = resolver.project_id('Business X-Ray')
+    acc_proj_id = resolver.project_id('Accounts')
+
+    matrix_sheets = []
+    for sheet in open_workbook(MATRIX_FILE).sheet_names:
+        if sheet not in TARGET_TABS: continue
+        proj_id = resolver.project_id(TARGET_TABS[sheet])
+        if not proj_id: continue
+        matrix_sheets.append((sheet, proj_id))
+
+    # Every source parses in parallel; results come back in task order
+    print(f"Parsing {4 + len(matrix_sheets)} sources with {worker_count()} workers...")
+    results = run_tasks([
+        (parse_term, resolver),
+        (parse_peer, resolver),
+        (parse_bxr, resolver, param_map, bxr_proj_id),
+        (parse_accounting, resolver, param_map, acc_proj_id),
+        *[(parse_matrix_sheet, sheet, proj_id, resolver, param_map) for sheet, proj_id in matrix_sheets],
+    ])
+    (term_rows, term_log), (peer_rows, _), (bxr_assessments, _), (acc_assessments, _) = results[:4]
+    matrix_assessments = [a for rows, _ in results[4:] for a in rows]
+
+    print("="*50)
+    print("1. Importing Term Tracking...")
+    for line in term_log:
+        print(line)
+    insert_rows('term_tracking', term_rows, on_conflict="student_id,term")
+    print(f"✅ Imported {len(term_rows)} term tracking records.")
+
+    print("="*50)
+    print("2. Importing Peer Feedback...")
+    insert_rows('peer_feedback', peer_rows, on_conflict="recipient_id,giver_id,project_id",
+                after_sql=refresh_peer_sql(*peer_keys(peer_rows)))
+    print(f"✅ Imported {len(peer_rows)} peer feedback records.")
+
+    print("="*50)
+    print("3. Parsed Business X-Ray Self-Assessment...")
+    print(f"✅ {len(bxr_assessments)} Business X-Ray self-assessments.")
+
+    print("="*50)
+    print("4. Parsed Accounting Self-Assessment...")
+    print(f"✅ {len(acc_assessments)} Accounting self-assessments.")
+
+    print("="*50)
+    print("5. Parsed Mentor Assessment Matrix...")
+    # Only keep the last inserted score in case of duplicates from 'Copy of X' sheets
+    print(f"✅ {len(dedup_assessments(matrix_assessments))} mentor assessments.")
+
+    # One write for all three assessment sources, in the order they used to
+    # be sent, deduplicated since the batch API rejects repeated keys
+    print("="*50)
+    assessments = dedup_assessments(bxr_assessments + acc_assessments + matrix_assessments)
+    insert_rows('assessments', assessments, on_conflict="student_id,project_id,parameter_id,assessment_type")
+    print(f"✅ Imported {len(assessments)} assessments.")
+    if assessments:
+        students, projects = row_keys(assessments)
+        run_sql(refresh_sql(students, projects))
+        run_sql(refresh_gap_sql(students))
+        print("✅ Refreshed their domain scores and self-awareness gaps.")
+    # Dashboard rollups of every student whose term tracking or assessments changed
+    touched = {r['student_id'] for r in term_rows} | {a['student_id'] for a in assessments}
+    if touched:
+        run_sql(refresh_rollup_sql(touched))
+        print(f"✅ Refreshed the dashboard rollup of {len(touched)} students.")
+
+    print("="*50)
+    print("6. Refreshing engagement scores...")
+    refresh_engagement_scores(bulk=BULK)
 
     print("="*50)
     print("ALL DONE.")
@@ -1,191 +1,138 @@
-import pandas as pd
-import json
-import subprocess
-import os
-
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return []
-
-def clean_name(name):
-    if pd.isna(name): return ""
-    return str(name).strip().lower()
-
-print("1. Fetching Metadata...")
-students = run_sql("SELECT id, canonical_name, aliases FROM students")
-projects = run_sql("SELECT id, name, internal_name FROM projects")
-domains_raw = run_sql("SELECT id, short_name FROM readiness_domains")
-domains = {d['id']: d['short_name'] for d in domains_raw}
-
-params_raw = run_sql("SELECT id, domain_id, param_number FROM readiness_parameters")
-
-# Build parameter lookup: (domain_short_name, param_number) -> id
-param_map = {}
-for p in params_raw:
-    domain_short = domains[p['domain_id']]
-    param_map[(domain_short, p['param_number'])] = p['id']
+import functools
+import sys
+
+from db_client import run_sql
+from diff_writer import bulk_apply, compute_delta, fetch_current
+from domain_scores import delta_keys, refresh_sql
+from matrix_extractor import DOMAIN_MAPPING, TARGET_TABS, extract_scores, scale_max_for
+from name_resolver import NameResolver
+from parallel_ingest import run_tasks
+from reference_cache import load_reference_data
+from scale_inference import ScoreProfile, infer_scale
+from score_normalization import Scale, normalize
+from self_awareness import refresh_gap_sql
+from sql_artifact import SQLArtifact, artifact_path
+from student_rollup import refresh_rollup_sql
+from workbook_cache import open_workbook
+
+target_tabs = TARGET_TABS
+domain_mapping = DOMAIN_MAPPING
+
+@functools.lru_cache(maxsize=None)
+def load_metadata():
+    """Students, projects and the (domain_short_name, param_number) -> id lookup.
+
+    Loaded on first use (not at import time) so that importing this module
+    from check_counts.py etc. does not touch the network.
+    """
+    print("1. Fetching Metadata...")
+    ref = load_reference_data()
+    domains = {d['id']: d['short_name'] for d in ref['readiness_domains']}
+
+    # Build parameter lookup: (domain_short_name, param_number) -> id
+    param_map = {}
+    for p in ref['readiness_parameters']:
+        domain_short = domains[p['domain_id']]
+        param_map[(domain_short, p['param_number'])] = p['id']
+    return ref['students'], ref['projects'], param_map
+
+def get_param_map():
+    return load_metadata()[2]
+
+@functools.lru_cache(maxsize=None)
+def get_resolver():
+    students, projects, _ = load_metadata()
+    return NameResolver(students, projects)
 
 def get_student_id(name_str):
-    name_clean = clean_name(name_str)
-    if not name_clean: return None
-    for s in students:
-        if clean_name(s['canonical_name']) == name_clean: return s['id']
-        for alias in s['aliases']:
-            if clean_name(alias) == name_clean: return s['id']
-    return None
+    return get_resolver().student_id(name_str)
 
 def get_project_id(name_str):
-    name_clean = clean_name(name_str)
-    if not name_clean: return None
-    for p in projects:
-        if clean_name(p['name']) == name_clean: return p['id']
-        if p['internal_name'] and clean_name(p['internal_name']) == name_clean: return p['id']
-    return None
-
-print("2. Parsing Mentor Assessment Matrix...")
-matrix_file = 'data/Year 1 Assessment_Matrix (1) (1) (1).xlsx'
-xls = pd.ExcelFile(matrix_file)
-matrix_assessments = []
-
-target_tabs = {
-    'Kickstart': 'Kickstart',
-    'Legacy': 'Legacy',
-    'Copy of Legacy': 'Legacy',
-    'Murder Mystery': 'Marketing',
-    'Copy of Murder Mystery': 'Marketing',
-    'Business Xray': 'Business X-Ray',
-    'Accounts': 'Accounts',
-    'SDP': 'SDP'
-}
-
-domain_mapping = {
-    'commercial readiness': 'commercial',
-    'entrepreneurial readiness': 'entrepreneurial',
-    'marketing readiness': 'marketing',
-    'innovation readiness': 'innovation',
-    'operational readiness': 'operational',
-    'operations readiness': 'operational',
-    'professional readiness': 'professional'
-}
-
-for sheet in xls.sheet_names:
-    if sheet not in target_tabs: continue
-    proj_id = get_project_id(target_tabs[sheet])
-    if not proj_id: continue
-    
-    df = pd.read_excel(xls, sheet_name=sheet)
-    if len(df) < 5: continue
-    
-    current_domain = None
-    header_val0 = str(df.columns[0]).strip().lower()
-    for dm_key, dm_val in domain_mapping.items():
-        if header_val0 == dm_key or header_val0.startswith(dm_key):
-            current_domain = dm_val
-            break
-            
+    return get_resolver().project_id(name_str)
+
+def parse_sheet(matrix_file, sheet, project_name, proj_id, resolver, param_map):
+    """(mentor records, log lines) of one matrix sheet; runs in an ingest worker."""
+    df = open_workbook(matrix_file).parse(sheet)
+    if len(df) < 5: return [], []
+
     # Pre-compute student mappings for this sheet
-    student_cols = {}
-    for col_idx in range(1, len(df.columns)):
-        s_id = get_student_id(df.columns[col_idx])
-        if s_id:
-            student_cols[col_idx] = s_id
-        else:
-            for r_idx in range(min(5, len(df))):
-                s_id = get_student_id(df.iloc[r_idx, col_idx])
-                if s_id:
-                    student_cols[col_idx] = s_id
-                    break
-                    
-    for _, row in df.iterrows():
-        val0 = str(row.iloc[0]).strip().lower()
-        
-        found_domain = False
-        for dm_key, dm_val in domain_mapping.items():
-            if val0 == dm_key or val0.startswith(dm_key):
-                current_domain = dm_val
-                found_domain = True
-                break
-                
-        if found_domain:
-            continue
-        
-        param_num = None
-        val_trim = val0[:2]
-        if val_trim in ['1.', '2.', '3.', '4.']:
-            param_num = int(val_trim[0])
-            
-        if current_domain and param_num:
-            param_id = param_map.get((current_domain, param_num))
-            if not param_id: continue
-            
-            for col_idx, student_id in student_cols.items():
-                
-                score_val = row.iloc[col_idx]
-                if pd.isna(score_val) or str(score_val).strip().lower() in ['na', 'n/a', '-', '']: continue
-                try:
-                    score = float(score_val)
-                    if score > 10:
-                        score = score / 10.0 # Some stray 1-100 inputs or typos
-                    
-                    actual_scale_max = 5 if 'kickstart' in target_tabs[sheet].lower() else 10
-                    # Normalize to 1-10 scale
-                    normalized = ((score - 1) / (actual_scale_max - 1)) * 9 + 1
-                    
-                except:
-                    continue
-                    
-                matrix_assessments.append({
-                    "student_id": student_id,
-                    "project_id": proj_id,
-                    "parameter_id": param_id,
-                    "assessment_type": "mentor",
-                    "raw_score": score,
-                    "raw_scale_min": 1,
-                    "raw_scale_max": actual_scale_max,
-                    "normalized_score": round(normalized, 2),
-                    "source_file": "Year 1 Assessment Matrix.xlsx"
-                })
-                
-# Deduplicate
-dedup = {}
-for a in matrix_assessments:
-    k = (a['student_id'], a['project_id'], a['parameter_id'], a['assessment_type'])
-    dedup[k] = a
-    
-assessments_to_insert = list(dedup.values())
-print(f"Generated {len(assessments_to_insert)} unique mentor records.")
-
-print("3. Generating SQL...")
-batch_size = 50
-sql_batches = ["DELETE FROM assessments WHERE assessment_type = 'mentor';"]
-
-for i in range(0, len(assessments_to_insert), batch_size):
-    batch = assessments_to_insert[i:i+batch_size]
-    values = []
-    for a in batch:
-        clean_file = a['source_file'].replace('"', '').replace("'", "")
-        # Note: self_assessment_question_id is NULL for mentor assessments
-        v = f"('{a['student_id']}', '{a['project_id']}', '{a['parameter_id']}', 'mentor', NULL, {a['raw_score']}, 1, 10, {a['normalized_score']}, '{clean_file}')"
-        values.append(v)
-        
-    stmt = "INSERT INTO assessments (student_id, project_id, parameter_id, assessment_type, self_assessment_question_id, raw_score, raw_scale_min, raw_scale_max, normalized_score, source_file) VALUES " + ", \n".join(values) + ";"
-    sql_batches.append(stmt)
-    
-final_sql = "\n\n".join(sql_batches)
-
-with open("scripts/005_insert_mentor_assessments.sql", "w") as f:
-    f.write(final_sql)
-
-print("Created scripts/005_insert_mentor_assessments.sql")
+    student_cols = resolver.student_columns(df)
+
+    actual_scale_max = scale_max_for(project_name)
+    scores = extract_scores(df, student_cols, param_map, domain_mapping, actual_scale_max)
+
+    # Check the registered scale against the sheet's scores before writing it
+    log = []
+    profile = ScoreProfile()
+    profile.add(scores["raw_score"])
+    guess = infer_scale(profile.overall(), Scale(1, actual_scale_max))
+    if guess.reason:
+        log.append(f"{'Scale' if guess.changed else 'Check scale'} of sheet {sheet}: {guess.reason}")
+    if guess.changed:
+        actual_scale_max = guess.scale.max
+        scores["normalized_score"] = normalize(scores["raw_score"], 1, actual_scale_max)
+
+    return (
+        scores[["student_id", "parameter_id", "raw_score", "normalized_score"]]
+        .assign(project_id=proj_id, assessment_type="mentor", raw_scale_min=1,
+                raw_scale_max=actual_scale_max, source_file="Year 1 Assessment Matrix.xlsx")
+        .to_dict("records")
+    ), log
+
+def main():
+    param_map = get_param_map()
+
+    print("2. Parsing Mentor Assessment Matrix...")
+    matrix_file = 'data/Year 1 Assessment_Matrix (1) (1) (1).xlsx'
+    xls = open_workbook(matrix_file)
+    tasks = []
+
+    for sheet in xls.sheet_names:
+        if sheet not in target_tabs: continue
+        proj_id = get_project_id(target_tabs[sheet])
+        if not proj_id: continue
+        tasks.append((parse_sheet, matrix_file, sheet, target_tabs[sheet], proj_id, get_resolver(), param_map))
+
+    # Sheets parse in parallel; results come back in sheet order for the dedup
+    matrix_assessments = []
+    for records, log in run_tasks(tasks):
+        for line in log:
+            print(line)
+        matrix_assessments.extend(records)
+
+    # Deduplicate
+    dedup = {}
+    for a in matrix_assessments:
+        k = (a['student_id'], a['project_id'], a['parameter_id'], a['assessment_type'])
+        dedup[k] = a
+
+    assessments_to_insert = list(dedup.values())
+    print(f"Generated {len(assessments_to_insert)} unique mentor records.")
+
+    # Diff against the stored mentor scores and write only what changed
+    current = fetch_current("assessments", {"assessment_type": "mentor"})
+    delta = compute_delta("assessments", current, assessments_to_insert)
+    print(f"Delta against the database: {delta.summary()}")
+
+    # Domain scores, dashboard rollups and self-awareness gaps of the
+    # students/projects the delta touches
+    students, projects = delta_keys(delta, current)
+    summary_stmts = [refresh_sql(students, projects), refresh_rollup_sql(students), refresh_gap_sql(students)]
+
+    if "--bulk" in sys.argv:
+        # Straight into the database in one COPY + merge transaction
+        print("3. Bulk-loading via COPY...")
+        bulk_apply("assessments", delta)
+        run_sql("\n".join(summary_stmts))
+        return
+
+    print("3. Generating SQL...")
+    out_path = artifact_path("scripts/005_insert_mentor_assessments.sql")
+    with SQLArtifact(out_path, copy="--copy" in sys.argv) as out:
+        out.write_delta("assessments", delta)
+        out.statements(summary_stmts)
+
+    print(f"Created {out_path} ({out.summary()})")
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,56 @@
+import numpy as np
 import pandas as pd
-import json
-import subprocess
 import os
+import sys
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        data = json.loads(result.stdout)
-        if hasattr(data, "get") and data.get("error"):
-             print(f"API Error for {query}: {data['error']}")
-        return data
-    except Exception as e:
-        print(f"Failed to parse for {query}")
-        return []
-
-print("1. Fetching Metadata...")
-students_raw = run_sql("SELECT id, canonical_name, aliases FROM students")
-projects_raw = run_sql("SELECT id, name, internal_name FROM projects")
-questions_raw = run_sql("SELECT id, parameter_id, question_text, project_context FROM self_assessment_questions")
-
-print(f"DEBUG: questions_raw is type {type(questions_raw)}")
-if isinstance(questions_raw, dict): print(f"DEBUG DICT: {questions_raw}")
-if isinstance(questions_raw, list): 
-    sdp_qs = [q for q in questions_raw if q['project_context'] == 'SDP']
-    print(f"DEBUG SDP Q COUNT: {len(sdp_qs)}")
-    if len(sdp_qs) > 0:
-        print(f"DEBUG FIRST SDP Q: {sdp_qs[0]}")
-    accounts_qs = [q for q in questions_raw if q['project_context'] == 'Accounts']
-    print(f"DEBUG Accounts Q COUNT: {len(accounts_qs)}")
+from db_client import run_sql
+from diff_writer import bulk_apply, compute_delta, fetch_current
+from domain_scores import delta_keys, refresh_sql
+from engagement_scores import refresh_engagement_scores
+from import_watermarks import WatermarkTracker, load_watermarks, watermark_sql
+from name_resolver import NameResolver
+from parallel_ingest import run_tasks
+from question_matcher import QuestionMatcher, normalize_text
+from reference_cache import load_reference_data
+from response_reader import ResponseReader
+from score_aggregation import ScoreAggregator
+from scale_inference import ScoreProfile, column_outliers, infer_scale
+from score_normalization import Scale, normalize, scale_for
+from self_awareness import refresh_gap_sql
+from sql_artifact import SQLArtifact, artifact_path
+from student_rollup import refresh_rollup_sql
 
-def clean_name(name):
-    if pd.isna(name): return ""
-    return str(name).strip().lower()
-
-def get_student_id(name_str):
-    name_clean = clean_name(name_str)
-    if not name_clean: return None
-    for s in students_raw:
-        if clean_name(s['canonical_name']) == name_clean: return s['id']
-        for alias in s['aliases']:
-            if clean_name(alias) == name_clean: return s['id']
-    return None
-
-def get_project_id(name_str):
-    name_clean = clean_name(name_str)
-    if not name_clean: return None
-    for p in projects_raw:
-        if clean_name(p['name']) == name_clean: return p['id']
-        if p['internal_name'] and clean_name(p['internal_name']) == name_clean: return p['id']
-    return None
-
-import re
-
-def normalize_text(text):
-    if pd.isna(text): return ""
-    text = str(text).lower()
-    text = re.sub(r'[^a-z0-9]', '', text)
-    return text
-
-import difflib
-
-def normalize_text(text):
-    if pd.isna(text): return ""
-    text = str(text).lower()
-    text = re.sub(r'[^a-z0-9]', '', text)
-    return text
-
-def get_question_meta(question_text, project_context):
-    q_norm = normalize_text(question_text)
-    
-    best_match = None
-    best_ratio = 0
-    best_q_id = None
-    best_p_id = None
-    
+# --stream: read response files in bounded-memory batches instead of whole
+STREAM = "--stream" in sys.argv
+
+# --incremental: only import responses newer than each file's last watermark,
+# upserting them instead of replacing every self-assessment
+INCREMENTAL = "--incremental" in sys.argv
+
+def get_question_meta(question_text, project_context, question_matcher, log):
+    match = question_matcher.best(question_text, project_context)
+    if match:
+        return match.question_id, match.parameter_id
+
+    candidates = question_matcher.top_k(question_text, project_context, k=1)
+    best_ratio = candidates[0].confidence if candidates else 0
+    log.append(f"FAILED MATCH (Best ratio {best_ratio:.2f}): [{project_context}] '{normalize_text(question_text)}'")
+    if candidates:
+        log.append(f"  Closest DB question: '{candidates[0].text}'")
+    return None, None
+
+def resolve_question(col, project_name, question_matcher, questions_raw, log):
+    """(question_id, parameter_id) for a form header, or (None, None)."""
+    q_id, param_id = get_question_meta(col, project_name, question_matcher, log)
+    if q_id:
+        return q_id, param_id
+
+    # In Business X-Ray, questions changed slightly, try a softer match
     for q in questions_raw:
-        if q['project_context'] == project_context:
-            db_norm = normalize_text(q['question_text'])
-            ratio = difflib.SequenceMatcher(None, q_norm, db_norm).ratio()
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_match = db_norm
-                best_q_id = q['id']
-                best_p_id = q['parameter_id']
-                
-    if best_ratio > 0.8:
-        return best_q_id, best_p_id
-        
-    print(f"FAILED MATCH (Best ratio {best_ratio:.2f}): [{project_context}] '{q_norm}'")
-    if best_match:
-        print(f"  Closest DB question: '{best_match}'")
+        if q['project_context'] == project_name and q['question_text'].lower()[:20] == str(col).strip().lower()[:20]:
+            return q['id'], q['parameter_id']
+
+    log.append(f"Warning: Could not map question in {project_name}: {col}")
     return None, None
 
 file_mapping = {
@@ -111,124 +63,219 @@ file_mapping = {
 }
 
 data_dir = "data/Self Assessments"
-assessments_dict = {}
-
-print("2. Parsing Excel Files...")
-for filename, project_name in file_mapping.items():
-    path = os.path.join(data_dir, filename)
-    if not os.path.exists(path):
-        print(f"File missing: {path}")
-        continue
-        
-    project_id = get_project_id(project_name)
-    if not project_id:
-        print(f"Could not find project ID for {project_name}")
-        continue
-        
-    df = pd.read_excel(path)
+
+def new_aggregator():
+    # One averaged score per (student, project, parameter) across all its questions
+    return ScoreAggregator(
+        keys=["student_id", "project_id", "parameter_id"],
+        values=["raw_score"],
+        first=["self_assessment_question_id", "source_file"],
+    )
+
+def merge_stored(result, current):
+    """Add the answer sums and counts stored on the `current` rows to the new
+    ones in `result` and re-average, so an incremental run extends each
+    average instead of replacing it with the mean of the new answers alone."""
+    keys = ["student_id", "project_id", "parameter_id"]
+    stored = pd.DataFrame(current, columns=keys + ["raw_score_sum", "raw_score_count"])
+    stored[keys] = stored[keys].astype(str)
+    merged = result.astype({k: str for k in keys}).merge(
+        stored, on=keys, how="left", suffixes=("", "_stored"), indicator=True)
+
+    old_sum = pd.to_numeric(merged["raw_score_sum_stored"], errors="coerce")
+    old_n = pd.to_numeric(merged["raw_score_count_stored"], errors="coerce")
+    legacy = int(((merged["_merge"] == "both") & old_n.isna()).sum())
+    if legacy:
+        print(f"WARNING: {legacy} stored averages predate answer counts and are replaced by the new "
+              f"responses alone; re-run without --incremental to rebuild them")
+
+    merged["raw_score_sum"] = merged["raw_score_sum"] + old_sum.fillna(0)
+    merged["raw_score_count"] = merged["raw_score_count"] + old_n.fillna(0).astype(int)
+    merged["raw_score"] = merged["raw_score_sum"] / merged["raw_score_count"]
+    return merged[result.columns]
+
+def parse_file(path, filename, project_name, project_id, resolver, question_matcher, questions_raw, stream, since=None):
+    """Parse one response export; runs in a worker.
+
+    Only responses past the `since` watermark are parsed. The file's scale
+    is inferred from its scores (see scale_inference.py). Returns
+    (aggregator, log lines, new watermark including the scale).
+    """
+    aggregator, log, tracker, profile = new_aggregator(), [], WatermarkTracker(since), ScoreProfile()
+
+    if stream:
+        reader = ResponseReader(path)
+        columns, batches = reader.columns, reader.batches()
+    else:
+        df = pd.read_excel(path)
+        columns, batches = df.columns, [df]
     
     # Identify student name column
     name_col = None
-    for col in df.columns:
+    for col in columns:
         if "name" in col.lower() or "email" not in col.lower() and col.lower() != "timestamp":
             # Just guess the first column that looks like a name
             name_col = col
             break
             
-    if "Student Name" in df.columns: name_col = "Student Name"
-    elif "Your Name" in df.columns: name_col = "Your Name"
-    elif "Name" in df.columns: name_col = "Name"
+    if "Student Name" in columns: name_col = "Student Name"
+    elif "Your Name" in columns: name_col = "Your Name"
+    elif "Name" in columns: name_col = "Name"
     
     if not name_col:
-        print(f"Could not find Name column for {filename}")
-        continue
+        log.append(f"Could not find Name column for {filename}")
+        return aggregator, log, None
         
-    for _, row in df.iterrows():
-        student_id = get_student_id(row[name_col])
-        if not student_id:
-            print(f"Student not found: {row[name_col]} in {project_name}")
+    # Each header is matched once per file, on its first numeric cell
+    col_meta = {}
+    skip_cols = ["Timestamp", name_col, "Email", "What is one specific skill or insight you gained from this accounting project?"]
+    # New responses of a file already imported stay on the scale it was stored on
+    expected = Scale(*since.scale) if since and since.scale else scale_for("self", project_name, source_file=filename)
+
+    for df in batches:
+        df = df[tracker.new_rows(df)]
+        if df.empty:
             continue
-            
-        for col in df.columns:
-            if col in ["Timestamp", name_col, "Email", "What is one specific skill or insight you gained from this accounting project?"]:
-                continue
-                
-            raw_score = row[col]
-            if pd.isna(raw_score) or str(raw_score).strip() == "":
-                continue
-                
-            try:
-                score = float(raw_score)
-            except:
-                continue
-                
-            q_id, param_id = get_question_meta(col, project_name)
-            
-            if not q_id:
-                # In Business X-Ray, questions changed slightly, try a softer match
-                fallback_qid = None
-                fallback_pid = None
-                for q in questions_raw:
-                    if q['project_context'] == project_name and q['question_text'].lower()[:20] == str(col).strip().lower()[:20]:
-                        fallback_qid = q['id']
-                        fallback_pid = q['parameter_id']
-                        break
-                
-                if fallback_qid:
-                    q_id = fallback_qid
-                    param_id = fallback_pid
-                else:
-                    print(f"Warning: Could not map question in {project_name}: {col}")
-                    continue
-            
-            scale_max = 10 if project_name in ["SDP", "Accounts"] else 5
-            norm_score = ((score - 1) / (scale_max - 1)) * 9 + 1
-            
-            key = (student_id, project_id, param_id)
-            if key not in assessments_dict:
-                assessments_dict[key] = {
-                    "student_id": student_id,
-                    "project_id": project_id,
-                    "parameter_id": param_id,
-                    "assessment_type": "self",
-                    "self_assessment_question_id": q_id,
-                    "raw_score_sum": score,
-                    "raw_score_count": 1,
-                    "raw_scale_max": scale_max,
-                    "normalized_score_sum": norm_score,
-                    "source_file": filename
-                }
-            else:
-                assessments_dict[key]["raw_score_sum"] += score
-                assessments_dict[key]["raw_score_count"] += 1
-                assessments_dict[key]["normalized_score_sum"] += norm_score
-
-assessments_to_insert = []
-for k, v in assessments_dict.items():
-    v["raw_score"] = round(v["raw_score_sum"] / v["raw_score_count"], 2)
-    v["normalized_score"] = round(v["normalized_score_sum"] / v["raw_score_count"], 2)
-    assessments_to_insert.append(v)
-
-print(f"Generated {len(assessments_to_insert)} unique self-assessment records.")
-
-print("3. Generating SQL...")
-batch_size = 50
-sql_batches = ["DELETE FROM assessments WHERE assessment_type = 'self';"]
-
-for i in range(0, len(assessments_to_insert), batch_size):
-    batch = assessments_to_insert[i:i+batch_size]
-    values = []
-    for a in batch:
-        clean_file = a['source_file'].replace('"', '').replace("'", "")
-        v = f"('{a['student_id']}', '{a['project_id']}', '{a['parameter_id']}', 'self', '{a['self_assessment_question_id']}', {a['raw_score']}, 1, {a['raw_scale_max']}, {a['normalized_score']}, '{clean_file}')"
-        values.append(v)
-        
-    stmt = "INSERT INTO assessments (student_id, project_id, parameter_id, assessment_type, self_assessment_question_id, raw_score, raw_scale_min, raw_scale_max, normalized_score, source_file) VALUES " + ", \n".join(values) + ";"
-    sql_batches.append(stmt)
-    
-final_sql = "\n\n".join(sql_batches)
 
-with open("scripts/004_insert_self_assessments.sql", "w") as f:
-    f.write(final_sql)
+        # Resolve the whole name column of each batch at once
+        row_student_ids = resolver.resolve_students(df[name_col])
+        for name in df.loc[row_student_ids.isna().to_numpy(), name_col]:
+            log.append(f"Student not found: {name} in {project_name}{resolver.describe_unmatched(name)}")
+
+        # Long form: one row per numeric answer, in sheet order (row by row)
+        known = row_student_ids.notna().to_numpy()
+        answers = df.loc[known, [c for c in df.columns if c not in skip_cols]]
+        answers = answers.select_dtypes(exclude=["datetime", "datetimetz", "timedelta"])
+        values = answers.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        r, c = np.nonzero(~np.isnan(values))
+        long = pd.DataFrame({
+            "student_id": row_student_ids[known].to_numpy()[r],
+            "question": answers.columns.to_numpy()[c],
+            "raw_score": values[r, c],
+        })
+
+        for col in pd.unique(long["question"]):
+            if col not in col_meta:
+                col_meta[col] = resolve_question(col, project_name, question_matcher, questions_raw, log)
+        long["self_assessment_question_id"] = long["question"].map({k: m[0] for k, m in col_meta.items()})
+        long["parameter_id"] = long["question"].map({k: m[1] for k, m in col_meta.items()})
+        long = long[long["self_assessment_question_id"].notna()]
+
+        # Normalized later, once the whole file's scale is known
+        profile.add(long["raw_score"], long["question"])
+        aggregator.add(long.assign(project_id=project_id, source_file=filename))
+
+    guess = infer_scale(profile.overall(), expected)
+    if guess.reason:
+        log.append(f"{'Scale' if guess.changed else 'Check scale'} of {filename}: {guess.reason}")
+        for col, stats in column_outliers(profile, guess.scale).iterrows():
+            log.append(f"  {str(col)[:60]!r}: {stats['min']:g}-{stats['max']:g} over {int(stats['count'])} answers")
+
+    if tracker.truncated:
+        log.append(f"Warning: {filename} has fewer rows than at its last import; rerun without --incremental to rebuild it")
+    log.append(f"{filename}: {tracker.new} new rows")
+    return aggregator, log, tracker.mark()._replace(scale=guess.scale)
+
+def main():
+    print("1. Fetching Metadata...")
+    ref = load_reference_data()
+    students_raw = ref["students"]
+    projects_raw = ref["projects"]
+    questions_raw = ref["self_assessment_questions"]
+
+    sdp_qs = [q for q in questions_raw if q['project_context'] == 'SDP']
+    print(f"DEBUG SDP Q COUNT: {len(sdp_qs)}")
+    if len(sdp_qs) > 0:
+        print(f"DEBUG FIRST SDP Q: {sdp_qs[0]}")
+    accounts_qs = [q for q in questions_raw if q['project_context'] == 'Accounts']
+    print(f"DEBUG Accounts Q COUNT: {len(accounts_qs)}")
+
+    resolver = NameResolver(students_raw, projects_raw)
+    question_matcher = QuestionMatcher(questions_raw)
+
+    marks = load_watermarks("self") if INCREMENTAL else {}
+
+    print("2. Parsing Excel Files...")
+    tasks = []
+    for filename, project_name in file_mapping.items():
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            print(f"File missing: {path}")
+            continue
+
+        project_id = resolver.project_id(project_name)
+        if not project_id:
+            print(f"Could not find project ID for {project_name}")
+            continue
+
+        tasks.append((parse_file, path, filename, project_name, project_id,
+                      resolver, question_matcher, questions_raw, STREAM, marks.get(filename)))
+
+    # Files parse in parallel; merging in file order keeps the serial result
+    aggregator, parsed, scales = new_aggregator(), [], {}
+    for task, (partial, log, mark) in zip(tasks, run_tasks(tasks)):
+        for line in log:
+            print(line)
+        aggregator.merge(partial)
+        if mark is not None:
+            parsed.append((task[2], task[4], mark))
+            scales[task[2]] = mark.scale
+
+    # Averages keep the answer sum and count behind them; an incremental run
+    # only touches the students with new responses, merges those answers into
+    # their stored averages and never deletes
+    result = aggregator.result(totals=True)
+    if INCREMENTAL:
+        students = sorted(set(result["student_id"]))
+        current = fetch_current("assessments", {"assessment_type": "self", "student_id": students})
+        result = merge_stored(result, current)
+    else:
+        current = fetch_current("assessments", {"assessment_type": "self"})
+
+    # Averages are normalized on their file's inferred scale (the mapping is
+    # linear, so this equals averaging normalized answers)
+    lo = result["source_file"].map(lambda f: scales[f].min)
+    hi = result["source_file"].map(lambda f: scales[f].max)
+    assessments_to_insert = (
+        result
+        .assign(raw_scale_min=lo, raw_scale_max=hi,
+                normalized_score=normalize(result["raw_score"], lo, hi))
+        .round({"raw_score": 2, "normalized_score": 2})
+        .assign(assessment_type="self")
+        .to_dict("records")
+    )
+
+    print(f"Generated {len(assessments_to_insert)} unique self-assessment records.")
+
+    # One import_watermarks row per file, recording how far it has been imported
+    watermark_stmts = [watermark_sql("self", filename, mark, project_id)
+                       for filename, project_id, mark in parsed]
+
+    delta = compute_delta("assessments", current, assessments_to_insert, delete_missing=not INCREMENTAL)
+    print(f"Delta against the database: {delta.summary()}")
+
+    # Domain scores, dashboard rollups and self-awareness gaps of the
+    # students/projects the delta touches
+    students, projects = delta_keys(delta, current)
+    summary_stmts = [refresh_sql(students, projects), refresh_rollup_sql(students), refresh_gap_sql(students)]
+
+    if "--bulk" in sys.argv:
+        # Straight into the database in one COPY + merge transaction
+        print("3. Bulk-loading via COPY...")
+        bulk_apply("assessments", delta)
+        # Recorded after the load commits: a crash in between only means the
+        # next incremental run upserts the same responses again
+        run_sql("\n".join(summary_stmts + watermark_stmts))
+        refresh_engagement_scores(bulk=True)
+        return
+
+    print("3. Generating SQL...")
+    out_path = artifact_path("scripts/004_insert_self_assessments.sql")
+    with SQLArtifact(out_path, copy="--copy" in sys.argv) as out:
+        out.write_delta("assessments", delta)
+        out.statements(summary_stmts + watermark_stmts)
+
+    print(f"Created {out_path} ({out.summary()})")
 
-print("Created scripts/004_insert_self_assessments.sql")
+if __name__ == "__main__":
+    main()
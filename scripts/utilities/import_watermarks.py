@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Per-source import watermarks, stored in `import_watermarks` (migration 005).
+
+Google Forms exports only ever grow, yet the importers re-read and re-upsert
+every response ever submitted. Each import run now records, per source file,
+the newest response `Timestamp` it saw and how many data rows the file had
+(`last_response_at` / `rows_processed`), upserting one row per file. An
+incremental run loads the watermark of each file and drops older responses
+before any name resolution, question matching or aggregation happens:
+
+    from import_watermarks import WatermarkTracker, load_watermarks, watermark_sql
+
+    marks = load_watermarks("self")                    # file_name -> Watermark
+    tracker = WatermarkTracker(marks.get(filename))
+    for df in batches:
+        df = df[tracker.new_rows(df)]                  # only responses past the mark
+        ...
+    sql = watermark_sql("self", filename, tracker.mark(), project_id)
+
+A row is new when its Timestamp is later than `last_response_at`; rows
+without a usable Timestamp (or files without the column) fall back to their
+position, i.e. everything past `rows_processed`. The xlsx itself is still
+read top to bottom - the format cannot be seeked - but that is the cheap
+part; the work per old row is a single timestamp comparison.
+
+    python scripts/utilities/import_watermarks.py self   # show current watermarks
+"""
+
+import sys
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from db_client import run_sql
+from diff_writer import sql_literal
+
+TIMESTAMP_COL = "Timestamp"
+
+# `scale` is the (min, max) the file's scores were stored on, kept with the
+# watermark so later runs normalize new responses the same way
+Watermark = namedtuple("Watermark", ["last_response_at", "rows_processed", "scale"], defaults=(None,))
+
+
+def load_watermarks(data_type):
+    """Watermark per file_name for one data_type."""
+    rows = run_sql(f"""
+        SELECT file_name, last_response_at, rows_processed,
+               raw_scale_min AS scale_min, raw_scale_max AS scale_max
+        FROM import_watermarks
+        WHERE data_type = {sql_literal(data_type)}
+    """)
+    return {
+        r["file_name"]: Watermark(
+            pd.Timestamp(r["last_response_at"]) if r["last_response_at"] else None,
+            int(r["rows_processed"]),
+            (int(float(r["scale_min"] or 1)), int(float(r["scale_max"]))) if r.get("scale_max") else None,
+        )
+        for r in rows
+    }
+
+
+class WatermarkTracker:
+    """Filters the batches of one file against its previous watermark."""
+
+    def __init__(self, since=None):
+        self.since = since
+        self.rows = 0
+        self.new = 0
+        self.last_response_at = None
+
+    def new_rows(self, df):
+        """Boolean mask of the rows in `df` past the watermark (all rows if none)."""
+        position = np.arange(self.rows, self.rows + len(df))
+        self.rows += len(df)
+
+        stamps = None
+        if TIMESTAMP_COL in df.columns:
+            stamps = pd.to_datetime(df[TIMESTAMP_COL], errors="coerce")
+            latest = stamps.max()
+            if pd.notna(latest) and (self.last_response_at is None or latest > self.last_response_at):
+                self.last_response_at = latest
+
+        if self.since is None:
+            mask = np.ones(len(df), dtype=bool)
+        else:
+            past_position = position >= self.since.rows_processed
+            if stamps is None or self.since.last_response_at is None:
+                mask = past_position
+            else:
+                newer = (stamps > self.since.last_response_at).to_numpy()
+                mask = newer | (stamps.isna().to_numpy() & past_position)
+        self.new += int(mask.sum())
+        return mask
+
+    @property
+    def truncated(self):
+        """The file now has fewer rows than the last import read."""
+        return self.since is not None and self.rows < self.since.rows_processed
+
+    def mark(self):
+        """Watermark to record once this file's rows are written."""
+        last = self.last_response_at
+        if last is None and self.since is not None:
+            last = self.since.last_response_at
+        return Watermark(last, self.rows)
+
+
+def watermark_sql(data_type, file_name, mark, project_id=None):
+    """Upsert of the `import_watermarks` row recording `mark` for one file."""
+    last = mark.last_response_at.isoformat(sep=" ") if mark.last_response_at is not None else None
+    lo, hi = (int(mark.scale[0]), int(mark.scale[1])) if mark.scale else (None, None)
+    return f"""INSERT INTO import_watermarks (data_type, file_name, project_id, last_response_at, rows_processed, raw_scale_min, raw_scale_max)
+VALUES ({sql_literal(data_type)}, {sql_literal(file_name)}, {sql_literal(project_id)}::uuid,
+        {sql_literal(last)}::timestamp, {int(mark.rows_processed)}, {sql_literal(lo)}, {sql_literal(hi)})
+ON CONFLICT (data_type, file_name) DO UPDATE SET
+    project_id = EXCLUDED.project_id, last_response_at = EXCLUDED.last_response_at,
+    rows_processed = EXCLUDED.rows_processed, raw_scale_min = EXCLUDED.raw_scale_min,
+    raw_scale_max = EXCLUDED.raw_scale_max, updated_at = now();"""
+
+
+if __name__ == "__main__":
+    data_type = sys.argv[1] if len(sys.argv) > 1 else "self"
+    for file_name, mark in sorted(load_watermarks(data_type).items()):
+        print(f"{file_name}: {mark.rows_processed} rows, last response {mark.last_response_at}")
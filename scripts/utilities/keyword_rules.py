@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Compiled keyword rules for mapping survey text to readiness parameters.
+
+`semantic_mapping.semantic_match()` was an if-ladder of `"..." in q` checks per
+project, and `generate_mapping.py` / `generate_sql_seed.py` found parameter
+names in matrix cells with nested loops. Both are now data plus one engine:
+
+- a rule is `(terms, target, weight)`: it fires when every term in `terms`
+  (a phrase or tuple of phrases) occurs in the text;
+- all terms of a rule set are compiled into one Aho-Corasick automaton, so a
+  text is scanned once no matter how many rules there are;
+- the winning rule is the highest-weighted one that fired, ties going to the
+  rule listed first - so a table written in the old ladder order, with
+  specific phrases weighted above catch-all keywords, gives the ladder's
+  answer.
+
+    from keyword_rules import RuleSet
+
+    rules = RuleSet([(("financial statements", "interpret"), "Financial Literacy & Analysis", 10),
+                     ("ratio", "Financial Literacy & Analysis", 1)])
+    rules.match(header)            # RuleMatch or None
+    rules.match_many(headers)      # one batch call per survey
+
+Matching is case-insensitive.
+"""
+
+from collections import deque, namedtuple
+
+RuleMatch = namedtuple("RuleMatch", "target weight rule_index")
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns):
+        self.patterns = [p.lower() for p in patterns]
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [frozenset()]
+
+        for idx, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("empty keyword pattern")
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(frozenset())
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node] = self._out[node] | {idx}
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] | self._out[self._fail[child]]
+
+    def find(self, text):
+        """Indices of every pattern that occurs in `text`."""
+        found = set()
+        node = 0
+        for ch in str(text).lower():
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            if self._out[node]:
+                found |= self._out[node]
+        return found
+
+
+class RuleSet:
+    def __init__(self, rules):
+        self.rules = []
+        term_ids = {}
+        for terms, target, weight in rules:
+            if isinstance(terms, str):
+                terms = (terms,)
+            ids = frozenset(term_ids.setdefault(t.lower(), len(term_ids)) for t in terms)
+            self.rules.append((ids, target, weight))
+        self._automaton = KeywordAutomaton(sorted(term_ids, key=term_ids.get))
+
+    def match(self, text):
+        """The winning `RuleMatch` for `text`, or None if no rule fires."""
+        found = self._automaton.find(text)
+        best = None
+        for idx, (ids, target, weight) in enumerate(self.rules):
+            if ids <= found and (best is None or weight > best.weight):
+                best = RuleMatch(target, weight, idx)
+        return best
+
+    def match_many(self, texts):
+        return [self.match(t) for t in texts]
+
+
+def compile_rule_table(table):
+    """`{project: [rules]}` -> `{project: RuleSet}`."""
+    return {project: RuleSet(rules) for project, rules in table.items()}
+
+
+class ContainmentMatcher:
+    """Find which of a list of names occurs inside a text, in one scan.
+
+    Built from `(name, value)` pairs (or `dict.items()`). `first(text)`
+    returns the value of the earliest-listed name contained in `text` - the
+    answer of the old `for name in names: if name in text` loops.
+    """
+
+    def __init__(self, pairs):
+        self._items = list(pairs)
+        self._automaton = KeywordAutomaton([name for name, _ in self._items])
+
+    def first(self, text, default=None):
+        found = self._automaton.find(text)
+        return self._items[min(found)][1] if found else default
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Vectorized extraction of scores from a mentor assessment matrix sheet.
+
+A matrix sheet has the parameter text in column 0 - domain header rows
+("Commercial Readiness") followed by numbered parameter rows ("1. ...") -
+and one column per student. `import_mentor.py` used to walk it with
+`iterrows()`, re-running the domain-prefix loop per row and `float()` per
+cell. Here each step is a column operation:
+
+- domain header rows are tagged with one `np.select` over the prefixes and
+  forward-filled (seeded from the sheet's header cell);
+- parameter numbers come from a column-level regex (`^[1-4]\\.`);
+- the student columns of every parameter row are melted into long form and
+  coerced with `pd.to_numeric`, dropping blanks, "na", "n/a", "-" etc.;
+- the "score > 10 -> /10" fix and scale normalization (`score_normalization`)
+  are array operations.
+
+    rows = classify_rows(df)
+    scores = extract_scores(df, student_cols, param_map, scale_max=scale_max_for(project))
+
+`extract_scores` returns one row per (parameter row, student) score in sheet
+order - row by row, student columns left to right - which is the order the
+importers deduplicate in. `import_mentor.py`, `import_data.py` and
+`check_counts.py` all go through it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from score_normalization import normalize, scale_for
+
+# Matrix sheet -> project name (the "Copy of" tabs are later revisions)
+TARGET_TABS = {
+    'Kickstart': 'Kickstart',
+    'Legacy': 'Legacy',
+    'Copy of Legacy': 'Legacy',
+    'Murder Mystery': 'Marketing',
+    'Copy of Murder Mystery': 'Marketing',
+    'Business Xray': 'Business X-Ray',
+    'Accounts': 'Accounts',
+    'SDP': 'SDP'
+}
+
+# Domain heading prefix -> readiness_domains.short_name
+DOMAIN_MAPPING = {
+    'commercial readiness': 'commercial',
+    'entrepreneurial readiness': 'entrepreneurial',
+    'marketing readiness': 'marketing',
+    'innovation readiness': 'innovation',
+    'operational readiness': 'operational',
+    'operations readiness': 'operational',
+    'professional readiness': 'professional'
+}
+
+PARAM_NUMBER = r"^([1-4])\."
+
+SCORE_COLUMNS = ["row", "col", "student_id", "parameter_id", "domain", "param_number",
+                 "raw_score", "normalized_score"]
+
+
+def _clean(values):
+    return pd.Series(values, dtype=object).astype(str).str.strip().str.lower()
+
+
+def _match_domain(labels, domain_mapping):
+    """Domain short name for labels that start with a domain heading, else None."""
+    conditions = [labels.str.startswith(key).to_numpy() for key in domain_mapping]
+    if not conditions:
+        return pd.Series(None, index=labels.index, dtype=object)
+    matched = np.select(conditions, list(domain_mapping.values()), default=None)
+    return pd.Series(matched, index=labels.index, dtype=object)
+
+
+def classify_rows(df, domain_mapping=DOMAIN_MAPPING):
+    """Label every row of a matrix sheet.
+
+    Returns a DataFrame indexed by row position with `label` (column 0,
+    cleaned), `is_domain` (a domain header row), `domain` (the domain in
+    effect, forward-filled from the headers and the sheet's header cell) and
+    `param_number` (1-4, or NaN when the row is not a numbered parameter).
+    """
+    labels = _clean(df.iloc[:, 0].to_numpy()) if len(df.columns) else pd.Series([], dtype=object)
+    headers = _match_domain(labels, domain_mapping)
+    initial = _match_domain(_clean([df.columns[0]]), domain_mapping)[0] if len(df.columns) else None
+
+    domain = headers.ffill()
+    if initial is not None:
+        domain = domain.fillna(initial)
+    param_number = pd.to_numeric(labels.str.extract(PARAM_NUMBER, expand=False), errors="coerce")
+
+    return pd.DataFrame({
+        "label": labels,
+        "is_domain": headers.notna(),
+        "domain": domain,
+        "param_number": param_number,
+    })
+
+
+def scale_max_for(project_name):
+    """Top of the mentor scale for a project, from the scale registry."""
+    return scale_for("mentor", project_name).max
+
+
+def normalize_scores(scores, scale_max):
+    """Map 1..scale_max scores onto the 1-10 scale, rounded to 2 places."""
+    return pd.Series(normalize(scores, 1, scale_max), index=scores.index)
+
+
+def extract_scores(df, student_cols, param_map, domain_mapping=DOMAIN_MAPPING, scale_max=10):
+    """Long-form scores of one matrix sheet.
+
+    `student_cols` maps column position -> student id, `param_map` maps
+    (domain short name, param number) -> parameter id. Parameter rows with no
+    active domain or no matching parameter are skipped.
+    """
+    rows = classify_rows(df, domain_mapping)
+    candidates = rows[~rows["is_domain"] & rows["param_number"].notna() & rows["domain"].notna()]
+    keys = zip(candidates["domain"], candidates["param_number"].astype(int))
+    param_ids = pd.Series([param_map.get(k) for k in keys], index=candidates.index, dtype=object)
+    candidates = candidates.assign(parameter_id=param_ids)[param_ids.notna()]
+
+    col_pos = np.fromiter(student_cols.keys(), dtype=int, count=len(student_cols))
+    row_pos = candidates.index.to_numpy()
+    if not len(col_pos) or not len(row_pos):
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+
+    cells = df.iloc[row_pos, col_pos].to_numpy(dtype=object).ravel()
+    long = pd.DataFrame({
+        "row": np.repeat(row_pos, len(col_pos)),
+        "col": np.tile(col_pos, len(row_pos)),
+        "score": pd.to_numeric(pd.Series(cells, dtype=object), errors="coerce"),
+    })
+    long = long[long["score"].notna()]
+
+    score = long["score"].astype(float)
+    score = score.where(score <= 10, score / 10.0)  # Some stray 1-100 inputs or typos
+    meta = candidates.loc[long["row"]]
+
+    return pd.DataFrame({
+        "row": long["row"].to_numpy(),
+        "col": long["col"].to_numpy(),
+        "student_id": long["col"].map(student_cols).to_numpy(),
+        "parameter_id": meta["parameter_id"].to_numpy(),
+        "domain": meta["domain"].to_numpy(),
+        "param_number": meta["param_number"].astype(int).to_numpy(),
+        "raw_score": score.to_numpy(),
+        "normalized_score": normalize_scores(score, scale_max).to_numpy(),
+    })
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Hash-indexed student and project name resolution for the importers.
+
+`import_data.py`, `import_mentor.py` and `import_self.py` each had a
+`get_student_id()` that walked every student and every alias - calling
+`clean_name()` on each one again - for every row and every matrix column
+header. `NameResolver` builds the normalised name -> id indexes once from the
+reference data instead:
+
+    from name_resolver import NameResolver
+
+    resolver = NameResolver(ref["students"], ref["projects"])
+    resolver.student_id("Aditya J")                     # O(1), memoised
+    df["student_id"] = resolver.resolve_students(df[name_col])
+    student_cols = resolver.student_columns(matrix_df)  # {col_idx: student_id}
+
+Students are indexed by `canonical_name` and every entry in `aliases`;
+projects by `name` and `internal_name`. Matching is exact on the cleaned
+(stripped, lower-cased) text. If two records claim the same name, the first
+one in reference order wins - the same answer the old linear scans gave.
+
+Names that miss the exact index can be looked up fuzzily with
+`suggest_students()`, which returns ranked `Suggestion`s for a human to turn
+into aliases. Candidates come from a blocking index (first token, Soundex of
+first and last token, and the best trigram overlaps) so each unknown name is
+scored against a handful of aliases rather than the whole roster.
+"""
+
+import difflib
+from collections import Counter, defaultdict, namedtuple
+
+import pandas as pd
+
+MAX_TRIGRAM_CANDIDATES = 20
+MIN_SUGGESTION_SCORE = 0.6
+
+Suggestion = namedtuple("Suggestion", "student_id name score")
+
+
+def clean_name(name):
+    if pd.isna(name): return ""
+    return str(name).strip().lower()
+
+
+def soundex(word):
+    """Four-character American Soundex code ('' for words without letters)."""
+    word = "".join(c for c in word.upper() if c.isalpha())
+    if not word:
+        return ""
+    codes = {c: d for d, letters in (("1", "BFPV"), ("2", "CGJKQSXZ"), ("3", "DT"),
+                                     ("4", "L"), ("5", "MN"), ("6", "R")) for c in letters}
+    out, prev = word[0], codes.get(word[0], "")
+    for c in word[1:]:
+        code = codes.get(c, "")
+        if code and code != prev:
+            out += code
+        if c not in "HW":
+            prev = code
+    return (out + "000")[:4]
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _blocking_keys(key):
+    tokens = key.split()
+    if not tokens:
+        return set()
+    keys = {("tok", tokens[0]), ("sdx", soundex(tokens[0]))}
+    if len(tokens) > 1:
+        keys.add(("sdx", soundex(tokens[-1])))
+    return keys
+
+
+def _similarity(a, b):
+    """difflib ratio, also trying both names with their tokens sorted."""
+    direct = difflib.SequenceMatcher(None, a, b).ratio()
+    swapped = difflib.SequenceMatcher(None, " ".join(sorted(a.split())), " ".join(sorted(b.split()))).ratio()
+    return max(direct, swapped)
+
+
+def _clean_series(values):
+    s = pd.Series(values, dtype=object)
+    return s.where(s.notna(), "").astype(str).str.strip().str.lower()
+
+
+class NameResolver:
+    def __init__(self, students, projects):
+        self._students = {}
+        for s in students:
+            for name in [s['canonical_name'], *(s.get('aliases') or [])]:
+                key = clean_name(name)
+                if key:
+                    self._students.setdefault(key, s['id'])
+
+        self._projects = {}
+        for p in projects:
+            for name in (p['name'], p.get('internal_name')):
+                key = clean_name(name)
+                if key:
+                    self._projects.setdefault(key, p['id'])
+
+        self._student_memo = {}
+        self._project_memo = {}
+        self._display_names = {s['id']: s['canonical_name'] for s in students}
+        self._blocks = None
+        self._trigram_postings = None
+
+    @staticmethod
+    def _lookup(index, memo, name):
+        try:
+            return memo[name]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable cell value
+            return index.get(clean_name(name))
+        memo[name] = result = index.get(clean_name(name))
+        return result
+
+    def student_id(self, name):
+        """Student id for a name or alias, or None."""
+        return self._lookup(self._students, self._student_memo, name)
+
+    def project_id(self, name):
+        """Project id for a project name or internal name, or None."""
+        return self._lookup(self._projects, self._project_memo, name)
+
+    def _build_fuzzy_index(self):
+        self._blocks = defaultdict(set)
+        self._trigram_postings = defaultdict(set)
+        for key in self._students:
+            for block in _blocking_keys(key):
+                self._blocks[block].add(key)
+            for gram in _trigrams(key):
+                self._trigram_postings[gram].add(key)
+
+    def suggest_students(self, name, limit=3, min_score=MIN_SUGGESTION_SCORE):
+        """Ranked fuzzy matches for a name with no exact alias.
+
+        Returns up to `limit` `Suggestion(student_id, name, score)` tuples,
+        one per student, best first; `name` is the alias that matched and
+        `score` a 0-1 similarity. Exact matches score 1.0.
+        """
+        key = clean_name(name)
+        if not key:
+            return []
+        if key in self._students:
+            s_id = self._students[key]
+            return [Suggestion(s_id, self._display_names.get(s_id, key), 1.0)]
+        if self._blocks is None:
+            self._build_fuzzy_index()
+
+        candidates = set()
+        for block in _blocking_keys(key):
+            candidates |= self._blocks.get(block, set())
+        shared = Counter()
+        for gram in _trigrams(key):
+            shared.update(self._trigram_postings.get(gram, ()))
+        candidates.update(k for k, _ in shared.most_common(MAX_TRIGRAM_CANDIDATES))
+
+        best = {}
+        for alias in candidates:
+            score = _similarity(key, alias)
+            s_id = self._students[alias]
+            if score >= min_score and score > best.get(s_id, (0, None))[0]:
+                best[s_id] = (score, alias)
+        ranked = sorted(best.items(), key=lambda item: -item[1][0])[:limit]
+        return [Suggestion(s_id, alias, round(score, 3)) for s_id, (score, alias) in ranked]
+
+    def describe_unmatched(self, name, limit=3):
+        """A 'did you mean' hint for log lines, or '' if nothing is close."""
+        suggestions = self.suggest_students(name, limit)
+        if not suggestions:
+            return ""
+        hints = ", ".join(f"{self._display_names.get(s.student_id, s.name)} ({s.score:.2f})" for s in suggestions)
+        return f" (did you mean: {hints})"
+
+    def resolve_students(self, values):
+        """Resolve a whole column (Series, Index or list) of names in one call.
+
+        Returns a Series of student ids aligned with `values`, with None where
+        no student matches.
+        """
+        ids = _clean_series(values).map(self._students)
+        return ids.astype(object).where(ids.notna(), None)
+
+    def resolve_projects(self, values):
+        """Column-wise counterpart of `project_id()`."""
+        ids = _clean_series(values).map(self._projects)
+        return ids.astype(object).where(ids.notna(), None)
+
+    def student_columns(self, df, fallback_rows=5):
+        """Map the student columns of a mentor matrix sheet to student ids.
+
+        Column 0 holds the parameter text; every other column is matched on
+        its header, falling back to the first of its top `fallback_rows` cells
+        that names a student. Returns `{col_idx: student_id}`.
+        """
+        if len(df.columns) < 2:
+            return {}
+        ids = self.resolve_students(df.columns[1:])
+        head = df.iloc[:fallback_rows, 1:]
+        if len(head):
+            cells = self.resolve_students(head.to_numpy().ravel()).to_numpy().reshape(head.shape)
+            first_hit = pd.DataFrame(cells).bfill().iloc[0]
+            ids = ids.where(ids.notna(), first_hit.astype(object))
+        return {col_idx: s_id for col_idx, s_id in enumerate(ids, 1) if pd.notna(s_id)}
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Process-pool driver for the CPU-bound half of the importers.
+
+Parsing an Excel file and reshaping its scores is pure CPU work, and the
+source files of one import run - the six self-assessment exports, the sheets
+of the mentor matrix, the term/peer/form exports in `import_data.py` - do not
+depend on each other. `run_tasks()` parses them in parallel worker processes
+and hands the results back in task order, so the merge and the single write
+that follow are exactly what a sequential run would produce:
+
+    from parallel_ingest import run_tasks, worker_count
+
+    results = run_tasks([(parse_file, name, project) for name, project in files])
+
+Task functions must be module-level functions in modules that are safe to
+import (no work at import time), since worker processes may start by
+importing them. Their arguments and results are pickled, so pass plain data
+or small lookup objects (`NameResolver`, `QuestionMatcher`), and return log
+lines rather than printing - the caller prints them in order.
+
+The pool size defaults to the CPU count; set `INGEST_WORKERS=1` (or pass
+`--workers 1` to an importer) to run everything in-process.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def worker_count(argv=None):
+    """Pool size from `--workers N`, then `INGEST_WORKERS`, then the CPU count."""
+    argv = sys.argv if argv is None else argv
+    if "--workers" in argv:
+        idx = argv.index("--workers")
+        if idx + 1 < len(argv):
+            return max(1, int(argv[idx + 1]))
+    if os.environ.get("INGEST_WORKERS"):
+        return max(1, int(os.environ["INGEST_WORKERS"]))
+    return os.cpu_count() or 1
+
+
+def run_tasks(tasks, workers=None):
+    """Run `(func, *args)` tasks, in parallel when worthwhile; results in task order.
+
+    An exception in any task is re-raised here once it is reached in order.
+    """
+    tasks = list(tasks)
+    workers = min(len(tasks), workers or worker_count())
+    if workers <= 1:
+        return [func(*args) for func, *args in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, *args) for func, *args in tasks]
+        return [f.result() for f in futures]
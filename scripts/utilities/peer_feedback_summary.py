@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Keep `peer_feedback_summary` (migration 009) in step with `peer_feedback`.
+
+`v_peer_feedback_summary` used to run five `AVG()`s and the overall mean over
+every peer rating each time a dashboard read it. It now derives them from
+per-(recipient, project) sums and counts. A peer-feedback import refreshes
+the keys it wrote in the same batch - inside the COPY transaction with
+`--bulk`, right after the upsert otherwise:
+
+    from peer_feedback_summary import peer_keys, refresh_peer_sql
+
+    bulk_load("peer_feedback", rows, after_sql=refresh_peer_sql(*peer_keys(rows)))
+
+    python scripts/utilities/peer_feedback_summary.py --rebuild
+    python scripts/utilities/peer_feedback_summary.py --check    # compare with a live AVG()
+"""
+
+import sys
+
+from db_client import run_sql
+from diff_writer import sql_literal
+
+DIMENSIONS = ("quality_of_work", "initiative_ownership", "communication", "collaboration", "growth_mindset")
+
+
+def _uuid_array(ids):
+    if ids is None:
+        return "NULL"
+    return "ARRAY[" + ", ".join(sql_literal(str(i)) for i in sorted(ids)) + "]::uuid[]"
+
+
+def refresh_peer_sql(student_ids=None, project_ids=None):
+    """`SELECT refresh_peer_feedback_summary(...)` for some recipients/projects (None = all)."""
+    if (student_ids is not None and not student_ids) or (project_ids is not None and not project_ids):
+        return "SELECT 0;"  # nothing touched
+    return f"SELECT refresh_peer_feedback_summary({_uuid_array(student_ids)}, {_uuid_array(project_ids)});"
+
+
+def peer_keys(rows):
+    """(recipient ids, project ids) of peer_feedback rows."""
+    rows = list(rows)
+    return {r["recipient_id"] for r in rows}, {r["project_id"] for r in rows}
+
+
+def refresh(student_ids=None, project_ids=None):
+    """Run the refresh; returns the number of summary rows rebuilt."""
+    rows = run_sql(refresh_peer_sql(student_ids, project_ids))
+    return next(iter(rows[0].values()), 0) if rows else 0
+
+
+_LIVE_AVGS = ",\n               ".join(f"ROUND(AVG(pf.{d}), 2) AS avg_{d}" for d in DIMENSIONS)
+_OVERALL = " + ".join(f"pf.{d}" for d in DIMENSIONS)
+
+CHECK_SQL = f"""
+    WITH live AS (
+        SELECT pf.recipient_id AS student_id, pf.project_id, COUNT(*) AS feedback_count,
+               {_LIVE_AVGS},
+               ROUND(AVG(({_OVERALL})::NUMERIC / 5), 2) AS avg_overall
+        FROM peer_feedback pf
+        GROUP BY pf.recipient_id, pf.project_id
+    )
+    SELECT COUNT(*) AS mismatched
+    FROM live l
+    FULL JOIN v_peer_feedback_summary v USING (student_id, project_id)
+    WHERE (l.feedback_count, {", ".join(f"l.avg_{d}" for d in DIMENSIONS)}, l.avg_overall)
+          IS DISTINCT FROM
+          (v.feedback_count, {", ".join(f"v.avg_{d}" for d in DIMENSIONS)}, v.avg_overall)
+"""
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        print(f"Rebuilt peer_feedback_summary: {refresh()} rows")
+    if "--check" in sys.argv or len(sys.argv) == 1:
+        mismatched = run_sql(CHECK_SQL)[0]["mismatched"]
+        print("peer_feedback_summary matches peer_feedback" if not mismatched
+              else f"{mismatched} (recipient, project) keys differ from peer_feedback; run with --rebuild")
@@ -1,7 +1,6 @@
 import psycopg2
 import urllib.parse
 from dotenv import load_dotenv
-import os
 
 load_dotenv("frontend/.env.local")
 
@@ -15,23 +14,30 @@ db = "postgres"
 password_enc = urllib.parse.quote_plus(password)
 conn_str = f"postgresql://{user}:{password_enc}@{host}:5432/{db}"
 
-print("Connecting to Supabase PostgreSQL natively...")
-try:
-    conn = psycopg2.connect(conn_str)
-    cursor = conn.cursor()
-    
-    with open("scripts/006_add_assessment_logs.sql", "r") as f:
-        sql = f.read()
-
-    print("Executing full SQL seed script...")
-    cursor.execute(sql)
-    conn.commit()
-    print("Success! Changes committed via psycopg2.")
-    
-except Exception as e:
-    print(f"Database error: {e}")
-finally:
-    if 'cursor' in locals():
-        cursor.close()
-    if 'conn' in locals():
-        conn.close()
+
+def connect():
+    """Direct Postgres connection (used by bulk_loader.py for COPY)."""
+    return psycopg2.connect(conn_str)
+
+
+if __name__ == "__main__":
+    print("Connecting to Supabase PostgreSQL natively...")
+    try:
+        conn = connect()
+        cursor = conn.cursor()
+
+        with open("scripts/006_add_assessment_logs.sql", "r") as f:
+            sql = f.read()
+
+        print("Executing full SQL seed script...")
+        cursor.execute(sql)
+        conn.commit()
+        print("Success! Changes committed via psycopg2.")
+
+    except Exception as e:
+        print(f"Database error: {e}")
+    finally:
+        if 'cursor' in locals():
+            cursor.close()
+        if 'conn' in locals():
+            conn.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Indexed fuzzy matching of self-assessment form headers to
+`self_assessment_questions`.
+
+`import_self.get_question_meta()` used to normalise the column header and run
+`difflib.SequenceMatcher` against every question of the project for every
+non-empty score cell, so the same header was re-matched on every response row.
+`QuestionMatcher` instead:
+
+- precomputes, per `project_context`, a character n-gram count matrix over
+  the normalised question texts;
+- scores a header against all of a project's questions at once (n-gram Dice
+  overlap in NumPy) to shortlist the top-k candidates;
+- confirms the shortlist with `SequenceMatcher.ratio()` - the same measure
+  and 0.8 threshold the importer always used - as the match confidence;
+- memoises the result per (header, project), so each header is matched once.
+
+    from question_matcher import QuestionMatcher
+
+    matcher = QuestionMatcher(ref["self_assessment_questions"])
+    best = matcher.best(header, "Marketing")        # Match or None
+    for m in matcher.top_k(header, "Marketing", k=3):
+        print(m.confidence, m.text)
+"""
+
+import difflib
+import re
+from collections import defaultdict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+NGRAM = 3
+SHORTLIST = 5
+MIN_CONFIDENCE = 0.8
+
+Match = namedtuple("Match", "question_id parameter_id confidence text")
+
+
+def normalize_text(text):
+    if pd.isna(text): return ""
+    text = str(text).lower()
+    text = re.sub(r'[^a-z0-9]', '', text)
+    return text
+
+
+def _ngrams(text, n=NGRAM):
+    if len(text) <= n:
+        return [text] if text else []
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+class _ProjectIndex:
+    """N-gram count matrix for the questions of one project."""
+
+    def __init__(self, questions, n):
+        self.n = n
+        self.questions = questions
+        self.texts = [normalize_text(q['question_text']) for q in questions]
+
+        self.vocab = {}
+        rows = []
+        for text in self.texts:
+            counts = defaultdict(int)
+            for g in _ngrams(text, n):
+                counts[self.vocab.setdefault(g, len(self.vocab))] += 1
+            rows.append(counts)
+
+        self.matrix = np.zeros((len(questions), len(self.vocab)), dtype=np.float32)
+        for i, counts in enumerate(rows):
+            for j, c in counts.items():
+                self.matrix[i, j] = c
+        self.sizes = self.matrix.sum(axis=1)
+
+    def shortlist(self, text, k):
+        """Indices of the k questions with the highest n-gram Dice overlap."""
+        grams = _ngrams(text, self.n)
+        query = np.zeros(len(self.vocab), dtype=np.float32)
+        for g in grams:
+            j = self.vocab.get(g)
+            if j is not None:
+                query[j] += 1
+        overlap = np.minimum(self.matrix, query).sum(axis=1)
+        dice = 2 * overlap / np.maximum(self.sizes + len(grams), 1)
+        return np.argsort(-dice, kind="stable")[:k]
+
+
+class QuestionMatcher:
+    def __init__(self, questions, ngram=NGRAM, shortlist=SHORTLIST):
+        by_project = defaultdict(list)
+        for q in questions:
+            by_project[q['project_context']].append(q)
+        self._index = {p: _ProjectIndex(qs, ngram) for p, qs in by_project.items()}
+        self._shortlist = shortlist
+        self._memo = {}
+
+    def top_k(self, header, project_context, k=3):
+        """Up to `k` candidate questions for `header`, best first.
+
+        Confidence is the `difflib` ratio between the normalised header and
+        question text (1.0 = identical).
+        """
+        key = (header, project_context)
+        if key not in self._memo:
+            self._memo[key] = self._rank(header, project_context)
+        return self._memo[key][:k]
+
+    def best(self, header, project_context, min_confidence=MIN_CONFIDENCE):
+        """The top candidate if its confidence exceeds `min_confidence`, else None."""
+        ranked = self.top_k(header, project_context, k=1)
+        if ranked and ranked[0].confidence > min_confidence:
+            return ranked[0]
+        return None
+
+    def _rank(self, header, project_context):
+        index = self._index.get(project_context)
+        text = normalize_text(header)
+        if index is None or not index.questions:
+            return []
+        candidates = []
+        for i in index.shortlist(text, max(self._shortlist, 1)):
+            q = index.questions[i]
+            ratio = difflib.SequenceMatcher(None, text, index.texts[i]).ratio()
+            candidates.append(Match(q['id'], q['parameter_id'], ratio, index.texts[i]))
+        candidates.sort(key=lambda m: -m.confidence)
+        return candidates
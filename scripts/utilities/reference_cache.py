@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+On-disk snapshot of the reference tables every importer and checker needs.
+
+`students`, `projects`, `readiness_domains`, `readiness_parameters` and
+`self_assessment_questions` change rarely, but each script used to download all
+five at startup. `load_reference_data()` keeps a local snapshot instead and
+revalidates it with one cheap probe query:
+
+- row count and max `created_at`/`updated_at` per table catch inserts and
+  deletes;
+- a row digest (`md5` over the table) catches in-place edits such as alias
+  fixes, which none of these tables timestamp (there is no `updated_at`
+  trigger). All five tables are a few hundred rows at most, so this is still
+  a single millisecond-scale query.
+
+Only when the probe result differs from the one stored with the snapshot are
+the tables refetched. The snapshot is a gzip-compressed pickle under
+`scripts/utilities/.cache/` (override with `ASSESSMENT_CACHE_DIR`).
+
+    from reference_cache import load_reference_data
+
+    ref = load_reference_data()
+    students = ref["students"]
+
+    python scripts/utilities/reference_cache.py            # show probe / cache status
+    python scripts/utilities/reference_cache.py --refresh  # force a refetch
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+
+from async_sql import run_queries
+from db_client import run_sql, SQLError
+
+CACHE_DIR     = os.environ.get("ASSESSMENT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, "reference_snapshot.pkl.gz")
+SNAPSHOT_VERSION = 1
+
+# table -> timestamp columns available for the freshness probe
+REFERENCE_TABLES = {
+    "students":                  ("created_at", "updated_at"),
+    "projects":                  ("created_at",),
+    "readiness_domains":         (),
+    "readiness_parameters":      (),
+    "self_assessment_questions": (),
+}
+
+
+def _probe_sql():
+    parts = []
+    for table, ts_cols in REFERENCE_TABLES.items():
+        if len(ts_cols) > 1:
+            max_ts = f"MAX(GREATEST({', '.join(ts_cols)}))::text"
+        elif ts_cols:
+            max_ts = f"MAX({ts_cols[0]})::text"
+        else:
+            max_ts = "NULL"
+        parts.append(
+            f"SELECT '{table}' AS tbl, COUNT(*) AS n, {max_ts} AS max_ts, "
+            f"md5(COALESCE(string_agg(t::text, '|' ORDER BY t.id), '')) AS digest "
+            f"FROM {table} t"
+        )
+    return "\nUNION ALL\n".join(parts)
+
+
+def probe():
+    """Return the current freshness key and the raw per-table probe rows."""
+    rows = sorted(run_sql(_probe_sql()), key=lambda r: r["tbl"])
+    key = hashlib.sha1(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()
+    return key, rows
+
+
+def _read_snapshot():
+    try:
+        with gzip.open(SNAPSHOT_PATH, "rb") as f:
+            snap = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(snap, dict) or snap.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snap
+
+
+def _write_snapshot(key, tables):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = SNAPSHOT_PATH + ".tmp"
+    with gzip.open(tmp, "wb") as f:
+        pickle.dump({"version": SNAPSHOT_VERSION, "key": key, "fetched_at": time.time(), "tables": tables},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, SNAPSHOT_PATH)
+
+
+def fetch_tables():
+    """Download every reference table (concurrently)."""
+    return run_queries({table: f"SELECT * FROM {table}" for table in REFERENCE_TABLES})
+
+
+def load_reference_data(force_refresh=False, verbose=True):
+    """Return `{table_name: [row dicts]}` for all reference tables.
+
+    Uses the local snapshot when the probe says nothing changed. If the probe
+    itself fails (offline, API down) a stale snapshot is used with a warning
+    rather than failing the whole script.
+    """
+    snap = None if force_refresh else _read_snapshot()
+    try:
+        key, _ = probe()
+    except SQLError as e:
+        if snap:
+            if verbose:
+                print(f"[reference_cache] probe failed ({e}); using snapshot from "
+                      f"{time.ctime(snap['fetched_at'])}")
+            return snap["tables"]
+        raise
+
+    if snap and snap["key"] == key:
+        if verbose:
+            print("[reference_cache] reference data unchanged; using local snapshot")
+        return snap["tables"]
+
+    if verbose:
+        print("[reference_cache] reference data changed; refetching snapshot")
+    tables = fetch_tables()
+    # Re-probe so a write that lands mid-fetch invalidates the next run
+    # instead of being cached under the old key.
+    key_after, _ = probe()
+    if key_after == key:
+        _write_snapshot(key, tables)
+    return tables
+
+
+def invalidate():
+    """Drop the local snapshot (e.g. right after seeding reference tables)."""
+    try:
+        os.remove(SNAPSHOT_PATH)
+    except FileNotFoundError:
+        pass
+
+
+if __name__ == "__main__":
+    if "--refresh" in sys.argv:
+        invalidate()
+    snap = _read_snapshot()
+    key, rows = probe()
+    for r in rows:
+        print(f"{r['tbl']:<28} rows={r['n']:<5} max_ts={r['max_ts']}  digest={r['digest'][:10]}")
+    if snap and snap["key"] == key:
+        print(f"Snapshot is fresh ({SNAPSHOT_PATH}, fetched {time.ctime(snap['fetched_at'])})")
+    else:
+        load_reference_data()
+        print(f"Snapshot rebuilt at {SNAPSHOT_PATH}")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Constant-memory reader for Google Forms response exports.
+
+`pd.read_excel` builds the whole sheet in memory (on top of openpyxl's full
+workbook model) before the importers `iterrows()` over it. `ResponseReader`
+opens the workbook read-only instead and yields DataFrame batches of a fixed
+number of rows, so a multi-year response file is processed in bounded memory:
+
+    from response_reader import ResponseReader
+
+    reader = ResponseReader(path, sheet_name="Form responses 1", batch_size=500)
+    reader.columns                  # header row, named the way read_excel names it
+    for batch in reader.batches():  # DataFrames with typed columns
+        ...
+
+Batches look like slices of `pd.read_excel(path)`: blank headers become
+`Unnamed: <i>`, duplicate headers get `.1`, `.2` suffixes, values keep the
+types openpyxl read (numbers, text, datetimes) and each batch's index
+continues the previous one. Completely empty rows are skipped. `header_map`
+renames columns (a dict or a callable) before the batch is built.
+"""
+
+import openpyxl
+import pandas as pd
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def _mangle_headers(raw):
+    """Column names as `read_excel` would produce them for this header row."""
+    names, seen = [], {}
+    for i, value in enumerate(raw):
+        name = f"Unnamed: {i}" if value is None or value == "" else value
+        if name in seen:
+            count = seen[name]
+            while f"{name}.{count}" in seen:
+                count += 1
+            seen[name] = count + 1
+            name = f"{name}.{count}"
+        seen.setdefault(name, 1)
+        names.append(name)
+    return names
+
+
+class ResponseReader:
+    def __init__(self, path, sheet_name=None, batch_size=DEFAULT_BATCH_SIZE, header_map=None):
+        self.path = path
+        self.sheet_name = sheet_name
+        self.batch_size = batch_size
+        self._header_map = header_map
+
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[sheet_name] if sheet_name is not None else wb.worksheets[0]
+            ws.reset_dimensions()  # Forms exports often carry a stale <dimension>
+            header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        finally:
+            wb.close()
+
+        # Drop trailing blank header cells (empty columns past the last question)
+        header = list(header)
+        while header and header[-1] in (None, ""):
+            header.pop()
+        self.source_columns = _mangle_headers(header)
+        self.columns = [self._rename(c) for c in self.source_columns]
+
+    def _rename(self, column):
+        if self._header_map is None:
+            return column
+        if callable(self._header_map):
+            return self._header_map(column)
+        return self._header_map.get(column, column)
+
+    def batches(self):
+        """Yield the data rows as DataFrames of at most `batch_size` rows."""
+        width = len(self.columns)
+        wb = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            ws = wb[self.sheet_name] if self.sheet_name is not None else wb.worksheets[0]
+            ws.reset_dimensions()
+            rows, start = [], 0
+            for values in ws.iter_rows(min_row=2, values_only=True):
+                values = tuple(values[:width]) + (None,) * (width - len(values))
+                if all(v is None or v == "" for v in values):
+                    continue
+                rows.append(values)
+                if len(rows) >= self.batch_size:
+                    yield self._frame(rows, start)
+                    start += len(rows)
+                    rows = []
+            if rows:
+                yield self._frame(rows, start)
+        finally:
+            wb.close()
+
+    def _frame(self, rows, start):
+        df = pd.DataFrame.from_records(rows, columns=self.columns)
+        df.index = pd.RangeIndex(start, start + len(df))
+        return df
+
+
+def iter_response_batches(path, sheet_name=None, batch_size=DEFAULT_BATCH_SIZE, header_map=None):
+    return ResponseReader(path, sheet_name, batch_size, header_map).batches()
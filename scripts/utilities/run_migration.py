@@ -1,51 +1,28 @@
 #!/usr/bin/env python3
 """
-Execute SQL migration against Supabase via curl subprocess.
-Uses curl to avoid Cloudflare's ASN block on urllib/requests.
+Execute SQL migration against Supabase via the shared pooled client.
 """
 
-import subprocess
 import json
-import sys
-import re
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT        = "your_supabase_personal_access_token_here"
+import db_client
+from db_client import SQLError
+
 SQL_FILE   = "./migrations/001_schema.sql"
-URL        = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
 
 
 def run_sql(label: str, sql: str) -> bool:
-    payload = json.dumps({"query": sql})
-    result = subprocess.run(
-        ["curl", "-s", "-X", "POST", URL,
-         "-H", f"Authorization: Bearer {PAT}",
-         "-H", "Content-Type: application/json",
-         "-d", payload,
-         "-w", "\nHTTP_STATUS:%{http_code}"],
-        capture_output=True, text=True
-    )
-    output = result.stdout
-    # Extract status
-    status_match = re.search(r'HTTP_STATUS:(\d+)', output)
-    status = int(status_match.group(1)) if status_match else 0
-    body   = output.replace(f"\nHTTP_STATUS:{status}", "").strip()
-
-    if status in (200, 201):
-        print(f"  ✅ {label}")
-        if body and body != "[]":
-            try:
-                parsed = json.loads(body)
-                if parsed:
-                    print(f"     → {json.dumps(parsed, indent=4)[:400]}")
-            except:
-                pass
-        return True
-    else:
-        print(f"  ❌ {label}: HTTP {status}")
-        print(f"     → {body[:400]}")
+    try:
+        rows = db_client.run_sql(sql)
+    except SQLError as e:
+        print(f"  ❌ {label}: {e}")
         return False
 
+    print(f"  ✅ {label} ({rows.elapsed_ms:.0f}ms)")
+    if rows:
+        print(f"     → {json.dumps(rows, indent=4)[:400]}")
+    return True
+
 
 # Read full SQL
 with open(SQL_FILE) as f:
@@ -235,18 +212,9 @@ JOIN students s  ON s.id = pf.recipient_id
 JOIN projects p  ON p.id = pf.project_id
 GROUP BY pf.recipient_id, s.canonical_name, pf.project_id, p.name, p.sequence;"""),
 
-    ("CREATE VIEW: v_student_dashboard",       """
-CREATE OR REPLACE VIEW v_student_dashboard AS
-SELECT
-    s.id                AS student_id,
-    s.student_number,
-    s.canonical_name,
-    t.cbp_count,
-    t.conflexion_count,
-    t.bow_score
-FROM students s
-LEFT JOIN term_tracking t ON t.student_id = s.id AND t.term = 'Year 1'
-WHERE s.is_active = TRUE;"""),
+    # v_student_dashboard is not bootstrapped here: migration 008 creates it
+    # over student_metric_rollup, once metric_tracking and metrics
+    # (legacy/012_metric_tracking_schema.sql) exist.
 ]
 
 SEED = [
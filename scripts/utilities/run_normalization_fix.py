@@ -1,39 +1,20 @@
-import json
-import subprocess
-
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return {"raw": result.stdout}
+from db_client import run_sql
+from score_normalization import recompute_sql, refresh_summaries_sql
 
 print("=== STEP 1: Determining peer feedback scale ===")
 scale = run_sql("SELECT MIN(quality_of_work), MAX(quality_of_work) FROM peer_feedback")
 print("Quality of Work range:", scale)
 
 print("\n=== STEP 2: Fix self-assessment normalized scores ===")
-result = run_sql("""
-    UPDATE assessments
-    SET normalized_score = ROUND((raw_score / raw_scale_max::numeric) * 10, 2)
-    WHERE assessment_type = 'self'
+# Same (raw - min) / (max - min) * 9 + 1 formula as the importers and the wizard
+result = run_sql(recompute_sql("""
+    assessment_type = 'self'
       AND raw_scale_max IS NOT NULL
       AND raw_scale_max > 0
-    RETURNING id
-""")
-if isinstance(result, list):
-    print(f"Updated {len(result)} self-assessment rows")
-else:
-    print("Result:", result)
+"""))
+print(f"Updated {len(result)} self-assessment rows")
+# Domain scores, dashboard rollups and self-awareness gaps of the rows changed
+run_sql("\n".join(refresh_summaries_sql(result)))
 
 print("\n=== STEP 3: Verify fix ===")
 verify = run_sql("""
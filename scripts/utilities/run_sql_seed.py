@@ -1,32 +1,18 @@
-import json
-import subprocess
+import sys
 
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
+from engagement_scores import refresh_engagement_scores, touches_engagement
+from sql_executor import execute_sql_file, read_sql_file
 
-with open("scripts/003_seed_questions.sql", "r") as f:
-    sql = f.read()
+# Defaults to the file generate_sql_seed.py writes
+path = sys.argv[1] if len(sys.argv) > 1 else "scripts/003_seed_questions.sql"
 
-statements = [s.strip() for s in sql.split(";") if s.strip()]
+print(f"Executing {path} in transactional chunks...")
+report = execute_sql_file(path)
 
-print(f"Executing {len(statements)} individual statements...")
-success_count = 0
-for i, stmt in enumerate(statements):
-    payload = json.dumps({"query": stmt})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        data = json.loads(result.stdout)
-        if "error" in data:
-            print(f"Error on {i}: {data['error']}")
-        else:
-            success_count += 1
-    except:
-        success_count += 1
-
-print(f"Finished seeding! {success_count}/{len(statements)} executed.")
+if report.ok:
+    print(f"Finished seeding! {report.statements_committed}/{report.statements} executed.")
+    if touches_engagement(read_sql_file(path)):
+        refresh_engagement_scores()
+else:
+    print(f"Seeding stopped: {report.statements_committed}/{report.statements} committed, the failed chunk was rolled back.")
+    sys.exit(1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Infer the rating scale of an import from the scores themselves.
+
+Three self-assessment exports were stored as 1-5 although students had
+answered 1-10; it took `debug_scores.py` and a hand-written `BAD_FILES`
+list in `fix_scale_metadata.py` to find and repair them after the fact.
+The importers now profile the scores they read and check the registered
+scale (`score_normalization.scale_for`) before anything is written:
+
+    from scale_inference import ScoreProfile, infer_scale
+
+    profile = ScoreProfile()
+    for long in frames:                       # one per file or streamed batch
+        profile.add(long["raw_score"], long["question"])
+    guess = infer_scale(profile.overall(), expected=scale)
+    guess.scale                               # Scale(min=1, max=10)
+    guess.reason                              # why it differs / was flagged
+    profile.summary()                         # per-column count, min, max, quantiles
+
+A profile keeps only value counts per column - ratings take a handful of
+distinct values - so it merges across streamed batches and worker processes,
+and quantiles are exact. The rule is deliberately conservative:
+
+- scores above the registered maximum switch to the smallest candidate
+  scale that covers them (a 1-5 form with 7s and 9s in it is a 1-10 form);
+- scores that never leave 1-5 on a 1-10 scale, or fall below the minimum,
+  are only flagged - low answers are not proof of a smaller scale;
+- columns whose own range disagrees with the file's scale are listed.
+
+    python scripts/utilities/scale_inference.py       # check stored assessments per source file
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from score_normalization import Scale
+
+CANDIDATE_SCALES = (Scale(1, 5), Scale(1, 10))
+
+MIN_EVIDENCE = 20  # scores needed before a narrow distribution is worth flagging
+
+SUMMARY_COLUMNS = ["count", "min", "max", "q05", "q50", "q95", "integer_share"]
+
+ScaleGuess = namedtuple("ScaleGuess", ["scale", "expected", "changed", "flagged", "reason"])
+
+
+class ScoreProfile:
+    """Value counts of scores, per column (or any other grouping)."""
+
+    def __init__(self):
+        self._parts = []
+
+    def add(self, values, groups=None):
+        """Count one batch of scores; `groups` labels each score (e.g. its column)."""
+        frame = pd.DataFrame({
+            "group": "" if groups is None else np.asarray(groups, dtype=object),
+            "value": pd.to_numeric(pd.Series(np.asarray(values)), errors="coerce"),
+        }).dropna(subset=["value"])
+        if len(frame):
+            self._parts.append(frame.groupby(["group", "value"], sort=False).size())
+
+    def merge(self, other):
+        self._parts.extend(other._parts)
+
+    def counts(self):
+        """Series of counts indexed by (group, value)."""
+        if not self._parts:
+            return pd.Series(dtype=float, index=pd.MultiIndex.from_tuples([], names=["group", "value"]))
+        return pd.concat(self._parts).groupby(level=["group", "value"]).sum()
+
+    def summary(self, by_group=True):
+        """count, min, max, 5/50/95% quantiles and share of whole numbers, per group."""
+        counts = self.counts()
+        if not by_group and len(counts):
+            counts = counts.groupby(level="value").sum()
+            counts.index = pd.MultiIndex.from_product([["*"], counts.index], names=["group", "value"])
+        if not len(counts):
+            return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+        c = counts.rename("n").reset_index().sort_values(["group", "value"])
+        g = c.groupby("group", sort=False)
+        total = g["n"].transform("sum")
+        share = g["n"].cumsum() / total
+        whole = c["n"].where(np.isclose(c["value"] % 1, 0), 0)
+
+        def quantile(q):
+            return c[share >= q].groupby("group")["value"].first()
+
+        return pd.DataFrame({
+            "count": g["n"].sum(),
+            "min": g["value"].min(),
+            "max": g["value"].max(),
+            "q05": quantile(0.05),
+            "q50": quantile(0.5),
+            "q95": quantile(0.95),
+            "integer_share": whole.groupby(c["group"]).sum() / g["n"].sum(),
+        })[SUMMARY_COLUMNS]
+
+    def overall(self):
+        """Summary of all scores together, as one row (a Series)."""
+        summary = self.summary(by_group=False)
+        if summary.empty:
+            return pd.Series({"count": 0}, dtype=float)
+        return summary.iloc[0]
+
+
+def infer_scale(stats, expected, candidates=CANDIDATE_SCALES):
+    """Pick the likely scale for scores summarised by `stats` (a summary row)."""
+    expected = Scale(*expected)
+    if not stats.get("count"):
+        return ScaleGuess(expected, expected, False, False, None)
+
+    lo, hi = stats["min"], stats["max"]
+    if hi > expected.max:
+        fits = [c for c in candidates if c.max >= hi and c.min <= max(lo, expected.min)]
+        if fits:
+            pick = min(fits, key=lambda c: c.max - c.min)
+            return ScaleGuess(pick, expected, True, False,
+                              f"scores up to {hi:g} exceed the registered {expected.min}-{expected.max} scale; using {pick.min}-{pick.max}")
+        return ScaleGuess(expected, expected, False, True,
+                          f"scores up to {hi:g} exceed every candidate scale")
+
+    if lo < expected.min:
+        return ScaleGuess(expected, expected, False, True,
+                          f"scores down to {lo:g} fall below the registered minimum {expected.min}")
+    if expected.max > 5 and stats["count"] >= MIN_EVIDENCE and stats["q95"] <= 5 and hi <= 5:
+        return ScaleGuess(expected, expected, False, True,
+                          f"all {int(stats['count'])} scores are within 1-5 on a {expected.min}-{expected.max} scale")
+    return ScaleGuess(expected, expected, False, False, None)
+
+
+def column_outliers(profile, scale):
+    """Groups of `profile` whose own scores fall outside `scale`."""
+    summary = profile.summary()
+    if summary.empty:
+        return summary
+    return summary[(summary["max"] > scale.max) | (summary["min"] < scale.min)]
+
+
+if __name__ == "__main__":
+    from db_client import run_sql
+
+    rows = run_sql("""
+        SELECT source_file, raw_scale_min, raw_scale_max, raw_score, COUNT(*) AS n
+        FROM assessments
+        WHERE raw_score IS NOT NULL
+        GROUP BY source_file, raw_scale_min, raw_scale_max, raw_score
+    """)
+    df = pd.DataFrame(rows)
+    for (source_file, lo, hi), part in df.groupby(["source_file", "raw_scale_min", "raw_scale_max"], dropna=False):
+        profile = ScoreProfile()
+        profile.add(np.repeat(part["raw_score"].astype(float).to_numpy(), part["n"].astype(int).to_numpy()))
+        stored = Scale(int(lo) if pd.notna(lo) else 1, int(hi) if pd.notna(hi) else 10)
+        guess = infer_scale(profile.overall(), stored)
+        status = "OK" if not (guess.changed or guess.flagged) else ("WRONG SCALE" if guess.changed else "CHECK")
+        print(f"[{status}] {source_file} (stored {stored.min}-{stored.max}){': ' + guess.reason if guess.reason else ''}")
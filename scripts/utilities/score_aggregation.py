@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Grouped averaging of long-form score frames.
+
+Self-assessment forms ask several questions per readiness parameter, and the
+importers store one averaged score per (student, project, parameter). They
+used to accumulate that cell by cell in dicts of running sums and lists.
+`ScoreAggregator` takes long-form frames - one row per resolved score - and
+reduces them with `groupby`:
+
+    agg = ScoreAggregator(keys=["student_id", "parameter_id"],
+                          values=["raw_score", "normalized_score"],
+                          first=["self_assessment_question_id"])
+    for long in frames:            # one per file or per streamed batch
+        agg.add(long)
+    result = agg.result()          # keys + first columns + mean of each value
+    result = agg.result(totals=True)   # ... plus raw_score_sum, raw_score_count
+
+Aggregators built in separate worker processes combine with `merge()`; merged
+in task order, the result is the same as feeding one aggregator serially.
+
+Each `add()` keeps only per-group sums and counts, so feeding it streamed
+batches stays in bounded memory, and the final means are exact. Groups come
+out in order of first appearance, and `first` columns keep the value from
+the first row of each group - the same as the old insert-if-missing dicts.
+"""
+
+import pandas as pd
+
+
+class ScoreAggregator:
+    def __init__(self, keys, values, first=()):
+        self.keys = list(keys)
+        self.values = list(values)
+        self.first = list(first)
+        self._partials = []
+
+    def add(self, frame):
+        if frame.empty:
+            return
+        spec = {f"{v}__sum": (v, "sum") for v in self.values}
+        spec["n__"] = (self.values[0], "count")
+        spec.update({f: (f, "first") for f in self.first})
+        self._partials.append(frame.groupby(self.keys, sort=False, dropna=False).agg(**spec))
+
+    def merge(self, other):
+        """Fold in the partials of another aggregator (e.g. from a worker)."""
+        self._partials.extend(other._partials)
+
+    def result(self, totals=False):
+        """Mean of each value per group; with `totals`, also the `{v}_sum`
+        and `{v}_count` behind it, so later batches can be merged in."""
+        columns = self.keys + self.first + self.values
+        if totals:
+            columns += [f"{v}_{t}" for v in self.values for t in ("sum", "count")]
+        if not self._partials:
+            return pd.DataFrame(columns=columns)
+
+        combined = pd.concat(self._partials)
+        spec = {f"{v}__sum": "sum" for v in self.values}
+        spec["n__"] = "sum"
+        spec.update({f: "first" for f in self.first})
+        grouped = combined.groupby(level=self.keys, sort=False, dropna=False).agg(spec)
+
+        out = grouped[self.first].copy()
+        for v in self.values:
+            out[v] = grouped[f"{v}__sum"] / grouped["n__"]
+            if totals:
+                out[f"{v}_sum"] = grouped[f"{v}__sum"]
+                out[f"{v}_count"] = grouped["n__"]
+        return out.reset_index()[columns]
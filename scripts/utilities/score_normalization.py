@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+One normalization formula, one registry of rating scales.
+
+Every score is stored twice: `raw_score` on the scale it was collected on
+(`raw_scale_min`..`raw_scale_max`) and `normalized_score` on 1-10. The
+formula used to be re-typed in each script - `((s-1)/(max-1))*9+1` in the
+importers, `raw/max*10` in `run_normalization_fix.py`, `normalized = raw` in
+`fix_scale_metadata.py` - and the scale maxima were hard-coded by project
+name in three places. This module is the single definition, matching the
+import wizard (`frontend/app/api/import/save/route.ts`):
+
+    normalized = (raw - min) / (max - min) * 9 + 1      (raw itself if max <= min)
+
+Scales come from the registry, most specific first: an assessment log's
+`mapping_config` (`raw_scale_min` / `raw_scale_max`), then the source file,
+then (assessment type, project), then the assessment type's default:
+
+    from score_normalization import normalize, scale_for
+
+    scale = scale_for("self", "SDP", source_file=filename)      # Scale(min=1, max=10)
+    df["normalized_score"] = normalize(df["raw_score"], scale.min, scale.max)
+
+`normalize()` is a NumPy kernel over whole columns (scale bounds may be
+scalars or per-row arrays). The SQL path computes the same expression in the
+database, e.g. to recompute every score of one log in a single statement:
+
+    updated = run_sql(recompute_log_sql(log_id))       # scale from the log's mapping_config
+    updated += run_sql(recompute_sql("source_file = '...'", Scale(1, 10)))
+    run_sql("\n".join(refresh_summaries_sql(updated)))  # summaries of the rows changed
+
+    python scripts/utilities/score_normalization.py --show
+    python scripts/utilities/score_normalization.py --log <assessment_log_id> [--scale 1-10]
+"""
+
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+Scale = namedtuple("Scale", ["min", "max"])
+
+DEFAULT_SCALE = Scale(1, 10)
+
+# assessment_type -> scale when nothing more specific is registered
+TYPE_SCALES = {
+    "mentor": Scale(1, 10),
+    "self": Scale(1, 5),
+}
+
+# (assessment_type, project name) -> scale; Kickstart was mentored out of 5,
+# the SDP and Accounts self-assessment forms asked for 1-10
+PROJECT_SCALES = {
+    ("mentor", "Kickstart"): Scale(1, 5),
+    ("self", "SDP"): Scale(1, 10),
+    ("self", "Accounts"): Scale(1, 10),
+}
+
+# Source file -> scale, to pin an export whose answers are not on their
+# project's usual scale. Rarely needed: the importers infer a file's scale
+# from its scores (scale_inference.py) before writing it.
+SOURCE_FILE_SCALES = {}
+
+
+class ScaleRegistry:
+    def __init__(self, project_scales=PROJECT_SCALES, file_scales=SOURCE_FILE_SCALES,
+                 type_scales=TYPE_SCALES, log_scales=None):
+        self.project_scales = {(t, p.lower()): s for (t, p), s in project_scales.items()}
+        self.file_scales = dict(file_scales)
+        self.type_scales = dict(type_scales)
+        self.log_scales = dict(log_scales or {})
+
+    def register_log(self, log_id, scale):
+        self.log_scales[str(log_id)] = Scale(*scale)
+
+    def register_file(self, source_file, scale):
+        self.file_scales[source_file] = Scale(*scale)
+
+    def scale_for(self, assessment_type, project=None, source_file=None, log_id=None):
+        """The most specific registered scale for a score."""
+        if log_id is not None and str(log_id) in self.log_scales:
+            return self.log_scales[str(log_id)]
+        if source_file in self.file_scales:
+            return self.file_scales[source_file]
+        if project is not None:
+            for (t, p), scale in self.project_scales.items():
+                # Matrix tabs and forms name projects loosely ("Kickstart Assessment")
+                if t == assessment_type and p in project.lower():
+                    return scale
+        return self.type_scales.get(assessment_type, DEFAULT_SCALE)
+
+    def load_log_scales(self):
+        """Register the scale recorded in every assessment log's mapping_config."""
+        from db_client import run_sql
+
+        rows = run_sql("""
+            SELECT id,
+                   COALESCE((mapping_config->>'raw_scale_min')::numeric, 1) AS scale_min,
+                   (mapping_config->>'raw_scale_max')::numeric AS scale_max
+            FROM assessment_logs
+            WHERE mapping_config ? 'raw_scale_max'
+        """)
+        for r in rows:
+            self.register_log(r["id"], (int(float(r["scale_min"])), int(float(r["scale_max"]))))
+        return self
+
+
+REGISTRY = ScaleRegistry()
+scale_for = REGISTRY.scale_for
+
+
+def normalize(raw, scale_min=1, scale_max=10, decimals=2):
+    """Map raw scores onto 1-10; `decimals=None` skips rounding.
+
+    Works on whole columns: `raw`, `scale_min` and `scale_max` broadcast, so
+    the bounds can be per-row arrays. NaN scores stay NaN.
+    """
+    raw = np.asarray(raw, dtype=float)
+    lo = np.asarray(scale_min, dtype=float)
+    hi = np.asarray(scale_max, dtype=float)
+    span = hi - lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(span > 0, (raw - lo) / span * 9 + 1, raw)
+    return np.round(out, decimals) if decimals is not None else out
+
+
+def normalize_sql(raw="raw_score", scale_min="raw_scale_min", scale_max="raw_scale_max", decimals=2):
+    """The same formula as a SQL expression over columns (or literals)."""
+    lo, hi = f"COALESCE({scale_min}, 1)", f"COALESCE({scale_max}, 10)"
+    return (f"ROUND(CASE WHEN {hi} > {lo} THEN ({raw} - {lo})::numeric / ({hi} - {lo}) * 9 + 1 "
+            f"ELSE {raw} END, {decimals})")
+
+
+def recompute_sql(where, scale=None):
+    """UPDATE recomputing normalized_score for the assessments matching `where`.
+
+    With `scale`, raw_scale_min/max are set to it first; otherwise each row's
+    stored scale is used.
+    """
+    if scale is None:
+        sets = f"normalized_score = {normalize_sql()}"
+    else:
+        lo, hi = Scale(*scale)
+        sets = (f"raw_scale_min = {lo}, raw_scale_max = {hi}, "
+                f"normalized_score = {normalize_sql(scale_min=lo, scale_max=hi)}")
+    return (f"UPDATE assessments SET {sets} WHERE raw_score IS NOT NULL AND ({where}) "
+            f"RETURNING id, student_id, project_id")
+
+
+def recompute_log_sql(log_id, scale=None):
+    """One UPDATE re-normalizing every assessment of a log.
+
+    The scale is `scale` if given, else the log's mapping_config, else the
+    scale stored on each row.
+    """
+    log = "'" + str(log_id).replace("'", "''") + "'"
+    if scale is not None:
+        return recompute_sql(f"assessment_log_id = {log}", scale)
+
+    lo = "COALESCE((l.mapping_config->>'raw_scale_min')::numeric, a.raw_scale_min, 1)"
+    hi = "COALESCE((l.mapping_config->>'raw_scale_max')::numeric, a.raw_scale_max, 10)"
+    return f"""UPDATE assessments a
+SET raw_scale_min = {lo},
+    raw_scale_max = {hi},
+    normalized_score = {normalize_sql('a.raw_score', lo, hi)}
+FROM assessment_logs l
+WHERE l.id = {log} AND a.assessment_log_id = l.id AND a.raw_score IS NOT NULL
+RETURNING a.id, a.student_id, a.project_id"""
+
+
+def refresh_summaries_sql(rows):
+    """Summary refreshes (domain scores, dashboard rollup, self-awareness
+    gaps) for the assessment rows a recompute UPDATE returned."""
+    from domain_scores import refresh_sql, row_keys
+    from self_awareness import refresh_gap_sql
+    from student_rollup import refresh_rollup_sql
+
+    students, projects = row_keys(rows)
+    return [refresh_sql(students, projects), refresh_rollup_sql(students), refresh_gap_sql(students)]
+
+
+def _parse_scale(text):
+    lo, hi = text.split("-")
+    return Scale(int(lo), int(hi))
+
+
+if __name__ == "__main__":
+    if "--show" in sys.argv or len(sys.argv) == 1:
+        for t, s in REGISTRY.type_scales.items():
+            print(f"{t:>8} default: {s.min}-{s.max}")
+        for (t, p), s in PROJECT_SCALES.items():
+            print(f"{t:>8} {p}: {s.min}-{s.max}")
+        for f, s in REGISTRY.file_scales.items():
+            print(f"    file {f}: {s.min}-{s.max}")
+    if "--log" in sys.argv:
+        from db_client import run_sql
+
+        log_id = sys.argv[sys.argv.index("--log") + 1]
+        scale = _parse_scale(sys.argv[sys.argv.index("--scale") + 1]) if "--scale" in sys.argv else None
+        updated = run_sql(recompute_log_sql(log_id, scale))
+        run_sql("\n".join(refresh_summaries_sql(updated)))
+        print(f"Re-normalized {len(updated)} assessments of log {log_id}")
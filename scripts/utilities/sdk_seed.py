@@ -1,10 +1,15 @@
 import os
 from supabase import create_client, Client
-import json
 from dotenv import load_dotenv
 
+from diff_writer import TABLES, compute_delta, fetched_columns
+from reference_cache import load_reference_data
+from workbook_cache import open_workbook
+
 load_dotenv("frontend/.env.local")
 
+REST_PAGE_SIZE = 1000  # PostgREST's default max-rows; never ask for more per page
+
 url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
 key = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
 
@@ -15,27 +20,10 @@ if not url or not key:
 supabase: Client = create_client(url, key)
 
 print("Fetching parameter map directly to insert via SDK...")
-import json
-import subprocess
-
-PROJECT_ID = "wqcdtdofwytfrcbhfycc"
-PAT = "sbp_b8874cc5000ef2fbc3dacf9da71672d451127fba"
-URL = f"https://api.supabase.com/v1/projects/{PROJECT_ID}/database/query"
-
-def run_sql(query):
-    payload = json.dumps({"query": query})
-    cmd = ["curl", "-s", "-X", "POST", URL,
-           "-H", f"Authorization: Bearer {PAT}",
-           "-H", "Content-Type: application/json",
-           "-d", payload]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    try:
-        return json.loads(result.stdout)
-    except:
-        return []
-
-params_raw = run_sql("SELECT id, name FROM readiness_parameters")
+ref = load_reference_data()
+params_raw = ref["readiness_parameters"]
 param_map = {p['name']: p['id'] for p in params_raw}
+project_map = {p['name']: p['id'] for p in ref["projects"]}
 
 with open("scripts/semantic_mapping.md", "r") as f:
     lines = f.readlines()
@@ -53,12 +41,12 @@ for line in lines[4:]:
 
 import pandas as pd
 path = "data/Year 1 Assessment_Matrix (1) (1) (1).xlsx"
-xl = pd.ExcelFile(path)
+xl = open_workbook(path)
 sheet_to_project = {"Kickstart": "Kickstart", "Legacy": "Legacy", "Murder Mystery": "Marketing"}
 
 for sheet in xl.sheet_names:
     if sheet not in sheet_to_project: continue
-    df = pd.read_excel(xl, sheet_name=sheet)
+    df = xl.parse(sheet)
     for idx, row in df.iterrows():
         param_cell, question_cell = str(row[df.columns[0]]), str(row[df.columns[1]])
         if not question_cell or not param_cell.strip() or pd.isna(row[df.columns[1]]): continue
@@ -68,18 +56,51 @@ for sheet in xl.sheet_names:
 
 print(f"Found {len(records_to_insert)} records to insert via SDK.")
 
-print("Wiping existing questions via Supabase SDK...")
-try:
-    # Need to get all IDs to wipe them cleanly if it's large, or just blanket delete if policies allow
-    # But since assessments wipe is needed first, let's just use the SDK bulk delete
-    supabase.table("assessments").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-    supabase.table("self_assessment_questions").delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
-except Exception as e:
-    print(f"Wipe error (might be empty already): {e}")
+# Number questions per project, as generate_sql_seed.py does
+order_counter = {}
+for r in records_to_insert:
+    r["project_id"] = project_map.get(r["project_context"])
+    order_counter[r["project_id"]] = order_counter.get(r["project_id"], 0) + 1
+    r["question_order"] = order_counter[r["project_id"]]
+
+print("Diffing against existing seeded questions via Supabase SDK...")
+spec = TABLES["self_assessment_questions"]
+# Keyset pages on id, so the server's row limit cannot truncate the list
+current, last_id = [], None
+while True:
+    query = (supabase.table("self_assessment_questions")
+             .select(",".join(fetched_columns(spec)))
+             .is_("assessment_log_id", "null")
+             .order("id").limit(REST_PAGE_SIZE))
+    if last_id is not None:
+        query = query.gt("id", last_id)
+    page = query.execute().data
+    current += page
+    if len(page) < REST_PAGE_SIZE:
+        break
+    last_id = page[-1]["id"]
+delta = compute_delta("self_assessment_questions", current, records_to_insert)
+print(f"Delta: {delta.summary()}")
 
-print("Inserting questions via SDK...")
 try:
-    response = supabase.table("self_assessment_questions").insert(records_to_insert).execute()
-    print(f"Success! Inserted {len(response.data)} questions.")
+    if delta.deletes:
+        # Only the assessments linked to a removed question go with it
+        removed = (supabase.table("assessments").delete()
+                   .in_("self_assessment_question_id", delta.deletes).execute().data)
+        supabase.table("self_assessment_questions").delete().in_("id", delta.deletes).execute()
+        if removed:
+            # Summaries of the students whose assessments went
+            students = sorted({a["student_id"] for a in removed})
+            projects = sorted({a["project_id"] for a in removed})
+            supabase.rpc("refresh_domain_scores", {"p_student_ids": students, "p_project_ids": projects}).execute()
+            supabase.rpc("refresh_student_rollup", {"p_student_ids": students}).execute()
+            supabase.rpc("refresh_self_awareness", {"p_student_ids": students}).execute()
+    for row in delta.updates:
+        changes = {c: row[c] for c in spec.columns if c in row and c not in spec.replace_on}
+        supabase.table("self_assessment_questions").update(changes).eq("id", row["id"]).execute()
+    if delta.inserts:
+        response = supabase.table("self_assessment_questions").insert(delta.inserts).execute()
+        print(f"Inserted {len(response.data)} questions.")
+    print(f"Success! Applied {len(delta)} changes.")
 except Exception as e:
-    print(f"Insert Failed: {e}")
+    print(f"Sync Failed: {e}")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Keep the self-awareness gap matrix (migration 010) in step with `assessments`.
+
+The Self-Awareness Gap Bar used to pull a student's mentor and self rows and
+pair them on every dashboard read. `self_awareness_gaps` now holds one row per
+(student, project, parameter) with both scores and their gap, built with a
+single pivot over `assessments`, and `self_awareness_calibration` the
+per-domain mentor/self averages, mean gap and mean absolute gap.
+`refresh_self_awareness(student_ids)` rebuilds both for the students an import
+touched:
+
+    from self_awareness import refresh_gap_sql
+
+    students, projects = delta_keys(delta, current)
+    statements.append(refresh_gap_sql(students))
+
+    python scripts/utilities/self_awareness.py --rebuild
+    python scripts/utilities/self_awareness.py --log <assessment_log_id>   # students of one log
+    python scripts/utilities/self_awareness.py --check                     # compare with a live pivot
+    python scripts/utilities/self_awareness.py --worst 10                  # least calibrated students
+"""
+
+import sys
+
+from db_client import run_sql
+from diff_writer import sql_literal
+
+
+def refresh_gap_sql(student_ids=None):
+    """`SELECT refresh_self_awareness(...)` for some students (None = all)."""
+    if student_ids is None:
+        return "SELECT refresh_self_awareness();"
+    if not student_ids:
+        return "SELECT 0;"  # nothing touched
+    ids = ", ".join(sql_literal(str(i)) for i in sorted(student_ids))
+    return f"SELECT refresh_self_awareness(ARRAY[{ids}]::uuid[]);"
+
+
+def refresh(student_ids=None):
+    """Run the refresh; returns the number of gap-matrix rows rebuilt."""
+    rows = run_sql(refresh_gap_sql(student_ids))
+    return next(iter(rows[0].values()), 0) if rows else 0
+
+
+def refresh_log_sql(log_id):
+    """Refresh the students whose assessments were recorded under one log."""
+    log = sql_literal(str(log_id))
+    return f"""SELECT refresh_self_awareness(
+    (SELECT array_agg(DISTINCT student_id) FROM assessments WHERE assessment_log_id = {log}))
+WHERE EXISTS (SELECT 1 FROM assessments WHERE assessment_log_id = {log});"""
+
+
+CHECK_SQL = """
+    WITH live AS (
+        SELECT student_id, project_id, parameter_id,
+               MAX(normalized_score) FILTER (WHERE assessment_type = 'mentor') AS mentor_score,
+               MAX(normalized_score) FILTER (WHERE assessment_type = 'self')   AS self_score
+        FROM assessments
+        WHERE normalized_score IS NOT NULL AND assessment_type IN ('mentor', 'self')
+        GROUP BY 1, 2, 3
+    )
+    SELECT COUNT(*) AS mismatched
+    FROM live l
+    FULL JOIN self_awareness_gaps g USING (student_id, project_id, parameter_id)
+    WHERE (l.mentor_score, l.self_score) IS DISTINCT FROM (g.mentor_score, g.self_score)
+"""
+
+WORST_SQL = """
+    SELECT s.canonical_name, d.name AS domain, c.mean_gap, c.mean_abs_gap, c.paired_count
+    FROM self_awareness_calibration c
+    JOIN students s ON s.id = c.student_id
+    JOIN readiness_domains d ON d.id = c.domain_id
+    WHERE c.paired_count > 0
+    ORDER BY c.mean_abs_gap DESC, s.canonical_name
+    LIMIT {limit}
+"""
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        print(f"Rebuilt self_awareness_gaps: {refresh()} rows")
+    elif "--log" in sys.argv:
+        log_id = sys.argv[sys.argv.index("--log") + 1]
+        run_sql(refresh_log_sql(log_id))
+        print(f"Refreshed the self-awareness gaps of log {log_id}")
+    if "--worst" in sys.argv:
+        i = sys.argv.index("--worst")
+        limit = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else 10
+        for r in run_sql(WORST_SQL.format(limit=limit)):
+            print(f"  {r['canonical_name']:<28} {r['domain']:<16} "
+                  f"gap {float(r['mean_gap']):+5.2f}  |gap| {float(r['mean_abs_gap']):4.2f}  ({r['paired_count']} pairs)")
+    if "--check" in sys.argv or len(sys.argv) == 1:
+        mismatched = run_sql(CHECK_SQL)[0]["mismatched"]
+        print("self_awareness_gaps matches assessments" if not mismatched
+              else f"{mismatched} (student, project, parameter) keys differ from assessments; run with --rebuild")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Keyword rules mapping self-assessment survey questions to readiness parameters.
+
+The rule table and the batch matcher, with no database or file access, so an
+importer for a new survey can map its headers directly:
+
+    from semantic_rules import map_headers
+
+    params = map_headers(headers, "SDP")     # parameter name or "UNMAPPED" per header
+
+Adding a survey means adding its rows to `SEMANTIC_RULES`.
+`semantic_mapping.py` uses the same table to write `scripts/semantic_mapping.md`.
+"""
+
+from keyword_rules import compile_rule_table
+
+# Keyword rules per project: (phrase or all-of phrases, parameter, weight).
+# Specific phrases from the known questions outrank the general keyword
+# fallbacks; among equal weights the earlier rule wins.
+SPECIFIC, KEYWORD = 10, 1
+
+SEMANTIC_RULES = {
+    "Accounts": [
+        (("financial statements", "interpret"), "Financial Literacy & Analysis", SPECIFIC),
+        ("record transactions", "Accounting & Compliance", SPECIFIC),
+        ("principles", "Accounting & Compliance", SPECIFIC),
+        ("connect and reflect across", "Business & System Mapping", SPECIFIC),
+        ("entries and recorded them", "Process & Project Management", SPECIFIC),
+        ("financial statements as one system", "Business Model & Lean Execution", SPECIFIC),  # Catchall
+        ("structured process", "Process & Project Management", SPECIFIC),
+        ("documented my work", "Documentation & Reporting", SPECIFIC),
+        ("communicated accounting outcomes", "Documentation & Reporting", SPECIFIC),
+        ("honesty, responsibility, and professionalism", "Professional Conduct & Ethics", SPECIFIC),
+        ("steadily improved my approach", "Continuous Growth & Reflection", SPECIFIC),
+        ("engaged professionally with mentors", "Networking & Presence", SPECIFIC),
+
+        # Fallback to general keyword matching
+        ("financial", "Financial Literacy & Analysis", KEYWORD),
+        ("ratio", "Financial Literacy & Analysis", KEYWORD),
+        ("budget", "Budgeting & Forecasting", KEYWORD),
+        ("forecast", "Budgeting & Forecasting", KEYWORD),
+        ("account", "Accounting & Compliance", KEYWORD),
+        ("record", "Accounting & Compliance", KEYWORD),
+        ("entry", "Accounting & Compliance", KEYWORD),
+        ("problem", "Problem-Solving & Risk Management", KEYWORD),
+        ("solve", "Problem-Solving & Risk Management", KEYWORD),
+        ("document", "Documentation & Reporting", KEYWORD),
+        ("report", "Documentation & Reporting", KEYWORD),
+        ("professional", "Professional Conduct & Ethics", KEYWORD),
+        ("ethic", "Professional Conduct & Ethics", KEYWORD),
+        ("reflect", "Continuous Growth & Reflection", KEYWORD),
+        ("improve", "Continuous Growth & Reflection", KEYWORD),
+    ],
+    "SDP": [
+        (("agreement", "responsibility"), "Professional Conduct & Ethics", SPECIFIC),
+        ("value of our work professionally", "Sales & Outreach", SPECIFIC),
+        ("pitched our work", "Sales & Outreach", SPECIFIC),
+        ("observe", "Customer-Centered Insights", SPECIFIC),
+        ("interview", "Customer-Centered Insights", SPECIFIC),
+        ("problem", "Customer-Centered Insights", SPECIFIC),
+        ("tested ideas quickly", "Prototyping & Agile Development", SPECIFIC),
+        ("prototype", "Prototyping & Agile Development", SPECIFIC),
+        ("convincing at least one owner", "Negotiation & Vendor Management", SPECIFIC),
+        ("generated multiple ideas", "Ideation & Creativity", SPECIFIC),
+        ("directions creatively", "Ideation & Creativity", SPECIFIC),
+        ("real customer insights", "Market Research & Opportunity Recognition", SPECIFIC),
+        ("service works end-to-end", "Business & System Mapping", SPECIFIC),
+        ("map", "Business & System Mapping", SPECIFIC),
+        ("planning our work", "Planning & Collaboration", SPECIFIC),
+        ("coordinating", "Planning & Collaboration", SPECIFIC),
+        ("didn't work as expected", "Problem-Solving & Risk Management", SPECIFIC),
+        ("adapt", "Problem-Solving & Risk Management", SPECIFIC),
+        ("behaved professionally", "Professional Conduct & Ethics", SPECIFIC),
+        ("structured process", "Process & Project Management", SPECIFIC),
+        ("track our work", "Process & Project Management", SPECIFIC),
+        ("documented our research", "Documentation & Reporting", SPECIFIC),
+        ("clarity on how", "Career Planning & Awareness", SPECIFIC),
+        ("come together", "Career Planning & Awareness", SPECIFIC),
+        ("reflected honestly", "Continuous Growth & Reflection", SPECIFIC),
+        ("respectful professional relationships", "Networking & Presence", SPECIFIC),
+    ],
+}
+
+compiled_rules = compile_rule_table(SEMANTIC_RULES)
+
+
+def semantic_match(question_text, project_name):
+    """Best parameter name for a survey question, or "UNMAPPED"."""
+    return map_headers([question_text], project_name)[0]
+
+
+def map_headers(headers, project_name):
+    """Map a whole survey's headers to parameter names in one batch."""
+    rules = compiled_rules.get(project_name)
+    if rules is None:
+        return ["UNMAPPED"] * len(headers)
+    return [m.target if m else "UNMAPPED" for m in rules.match_many(headers)]
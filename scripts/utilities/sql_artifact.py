@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Streaming writer for generated SQL artifacts (seed and import files).
+
+`generate_sql_seed.py`, `import_self.py` and `import_mentor.py` used to render
+every statement into a Python list, join the list into one string and only
+then write the file - holding the artifact in memory two or three times over.
+`SQLArtifact` writes each statement to disk as soon as it is rendered:
+
+    from sql_artifact import SQLArtifact
+
+    with SQLArtifact("scripts/004_insert_self_assessments.sql") as out:
+        out.write_delta("assessments", delta)
+        out.statements(summary_stmts)
+    print(out.summary())      # 41 statements, 2140 rows, 612.4 KB
+
+Values go through `diff_writer.sql_literal()`. Multi-row INSERTs are packed up
+to a byte budget (`max_statement_bytes`, 64 KB by default) instead of a fixed
+row count, so long question texts and short score rows both give statements
+`sql_executor` can chunk evenly. Deleting a row also deletes its dependents;
+when those are assessments, the same block refreshes the domain scores,
+student rollup and self-awareness gaps of the students they belonged to. A path ending in `.gz` (or `compress=True`)
+is gzipped on the fly; `sql_executor` and `run_sql_seed.py` read either. The
+file is written under a temporary name and moved into place when the block
+exits cleanly, so an aborted run leaves the previous artifact untouched.
+
+With `copy=True`, new rows are written as `COPY ... FROM stdin` blocks, merged
+through a staging table when the table has a unique key (as `bulk_loader`
+does). Such files are for `psql -f`; the Management API and `sql_executor`
+cannot run COPY.
+
+    python scripts/utilities/sql_artifact.py --benchmark 50000   # time and peak memory, streamed vs joined
+"""
+
+import gzip
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+
+from bulk_loader import STAGE_TABLE, _copy_value, merge_sql
+from diff_writer import TABLES, sql_literal
+
+DEFAULT_STATEMENT_BYTES = 64 * 1024
+
+# Dependent tables behind the summary tables -> the refreshes a delete of
+# their rows needs, over the deleted rows' students (s) and projects (p)
+SUMMARY_REFRESHES = {
+    "assessments": ("refresh_domain_scores(s, p)", "refresh_student_rollup(s)", "refresh_self_awareness(s)"),
+}
+
+
+def _utf8_len(text):
+    return len(text.encode("utf-8"))
+
+
+def pack(prefix, items, suffix="", max_bytes=DEFAULT_STATEMENT_BYTES, sep=", \n"):
+    """Yield `prefix + sep.join(batch) + suffix` over consecutive batches of
+    the rendered `items`, each within `max_bytes` (UTF-8). An item too big for
+    the budget on its own still gets a statement of its own."""
+    fixed, sep_len = _utf8_len(prefix) + _utf8_len(suffix), _utf8_len(sep)
+    batch, size = [], fixed
+    for item in items:
+        n = _utf8_len(item)
+        if batch and size + sep_len + n > max_bytes:
+            yield prefix + sep.join(batch) + suffix
+            batch, size = [], fixed
+        size += n + (sep_len if batch else 0)
+        batch.append(item)
+    if batch:
+        yield prefix + sep.join(batch) + suffix
+
+
+def insert_statements(table, rows, columns=None, conflict=None, max_bytes=DEFAULT_STATEMENT_BYTES):
+    """Multi-row `INSERT`s of `rows` (an iterable of dicts), consumed lazily.
+
+    `columns` defaults to the keys of the first row. With a `conflict` key the
+    statements upsert: the rows may have appeared since a diff was taken.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    columns = list(columns or first)
+
+    suffix = ""
+    if conflict:
+        sets = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict)
+        suffix = f" ON CONFLICT ({', '.join(conflict)}) " + (f"DO UPDATE SET {sets}" if sets else "DO NOTHING")
+
+    values = ("(" + ", ".join(sql_literal(r.get(c)) for c in columns) + ")"
+              for r in itertools.chain([first], rows))
+    yield from pack(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ", values, suffix + ";", max_bytes)
+
+
+def _delete_template(table, column):
+    """`DELETE` of the rows whose `column` is in `{ids}`. Rows of a table
+    behind the summaries are deleted in a block that then refreshes the
+    summaries of the students and projects they belonged to."""
+    delete = f"DELETE FROM {table} WHERE {column} IN ({{ids}});"
+    refreshes = SUMMARY_REFRESHES.get(table)
+    if not refreshes:
+        return delete
+    calls = "\n".join(f"        PERFORM {call};" for call in refreshes)
+    return f"""DO $$
+DECLARE
+    s UUID[];
+    p UUID[];
+BEGIN
+    SELECT array_agg(DISTINCT student_id), array_agg(DISTINCT project_id) INTO s, p
+    FROM {table} WHERE {column} IN ({{ids}});
+    {delete}
+    IF s IS NOT NULL THEN
+{calls}
+    END IF;
+END $$;"""
+
+
+def change_statements(table, delta, max_bytes=DEFAULT_STATEMENT_BYTES):
+    """Deletes (dependents first) and updates of a diff_writer Delta."""
+    spec = TABLES[table]
+
+    targets = [(dep_table, dep_column) for dep_table, dep_column in spec.dependents] + [(table, "id")]
+    templates = [_delete_template(t, c) for t, c in targets]
+    budget = min((max_bytes - _utf8_len(t.replace("{ids}", ""))) // t.count("{ids}") for t in templates)
+    for ids in pack("", (sql_literal(d) for d in delta.deletes), max_bytes=budget, sep=", "):
+        for template in templates:
+            yield template.replace("{ids}", ids)
+
+    for row in delta.updates:
+        sets = ", ".join(f"{c} = {sql_literal(row.get(c))}" for c in spec.columns
+                         if c in row and c not in spec.replace_on)
+        yield f"UPDATE {table} SET {sets} WHERE id = {sql_literal(row['id'])};"
+
+
+def delta_statements(table, delta, max_bytes=DEFAULT_STATEMENT_BYTES):
+    """Every statement applying `delta`: deletes, updates, then inserts."""
+    spec = TABLES[table]
+    yield from change_statements(table, delta, max_bytes)
+    yield from insert_statements(table, delta.inserts, conflict=spec.key if spec.unique else None,
+                                 max_bytes=max_bytes)
+
+
+class SQLArtifact:
+    """A SQL file written statement by statement; use as a context manager."""
+
+    def __init__(self, path, compress=None, max_statement_bytes=DEFAULT_STATEMENT_BYTES, copy=False):
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        self.max_statement_bytes = max_statement_bytes
+        self.copy = copy
+        self.statement_count = 0
+        self.row_count = 0
+        self.bytes_written = 0  # uncompressed
+        self._file = None
+
+    def __enter__(self):
+        self._tmp = self.path + ".tmp"
+        if self.compress:
+            self._file = gzip.open(self._tmp, "wt", encoding="utf-8")
+        else:
+            self._file = open(self._tmp, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.path)
+        else:
+            os.remove(self._tmp)
+        return False
+
+    def _write(self, text):
+        self._file.write(text)
+        self.bytes_written += _utf8_len(text)
+
+    def _counted(self, rows):
+        for row in rows:
+            self.row_count += 1
+            yield row
+
+    def statement(self, sql):
+        sql = sql.strip()
+        if not sql:
+            return
+        self._write(sql + ("" if sql.endswith(";") else ";") + "\n\n")
+        self.statement_count += 1
+
+    def statements(self, statements):
+        for sql in statements:
+            self.statement(sql)
+
+    def insert(self, table, rows, columns=None, conflict=None):
+        """Stream `rows` as byte-budgeted multi-row INSERTs."""
+        self.statements(insert_statements(table, self._counted(rows), columns, conflict,
+                                          self.max_statement_bytes))
+
+    def copy_rows(self, table, rows, columns=None, conflict=None):
+        """Stream `rows` as one COPY block, upserted through a staging table
+        when `conflict` is given (psql only)."""
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return
+        columns = list(columns or first)
+        col_list = ", ".join(columns)
+
+        target = STAGE_TABLE if conflict else table
+        if conflict:
+            self.statement(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+            self.statement(f"CREATE TEMP TABLE {STAGE_TABLE} AS SELECT {col_list} FROM {table} WITH NO DATA")
+            self.statement(f"ALTER TABLE {STAGE_TABLE} ADD COLUMN _seq BIGSERIAL")
+
+        self._write(f"COPY {target} ({col_list}) FROM stdin;\n")
+        for row in self._counted(itertools.chain([first], rows)):
+            self._write("\t".join(_copy_value(row.get(c)) for c in columns) + "\n")
+        self._write("\\.\n\n")
+        self.statement_count += 1
+
+        if conflict:
+            self.statement(merge_sql(table, columns, conflict))
+            self.statement(f"DROP TABLE {STAGE_TABLE}")
+
+    def write_delta(self, table, delta):
+        """Deletes, updates and inserts of a diff_writer Delta."""
+        spec = TABLES[table]
+        conflict = spec.key if spec.unique else None
+        self.statements(change_statements(table, delta, self.max_statement_bytes))
+        if self.copy:
+            self.copy_rows(table, delta.inserts, conflict=conflict)
+        else:
+            self.insert(table, delta.inserts, conflict=conflict)
+
+    def summary(self):
+        return (f"{self.statement_count} statements, {self.row_count} rows, "
+                f"{self.bytes_written / 1024:.1f} KB" + (" before gzip" if self.compress else ""))
+
+
+def artifact_path(path, argv=None):
+    """`path`, with `.gz` appended when the script was run with `--gzip`."""
+    argv = sys.argv if argv is None else argv
+    return path + ".gz" if "--gzip" in argv else path
+
+
+def _synthetic_rows(n):
+    for i in range(n):
+        yield {"student_id": f"00000000-0000-4000-8000-{i // 96:012d}",
+               "project_id": f"00000000-0000-4000-9000-{i % 6:012d}",
+               "parameter_id": f"00000000-0000-4000-a000-{i % 16:012d}",
+               "assessment_type": "self", "raw_score": i % 10 + 1, "raw_scale_min": 1,
+               "raw_scale_max": 10, "normalized_score": (i % 10 + 1) * 1.0,
+               "source_file": f"Response's sheet {i % 7}.xlsx"}
+
+
+def benchmark(rows=50000, path="/tmp/sql_artifact_benchmark.sql"):
+    """Time (untraced) and peak Python memory (tracemalloc) of streaming the
+    rows vs building the statement list, joining it and writing it."""
+    key = TABLES["assessments"].key
+
+    def joined(target):
+        statements = list(insert_statements("assessments", _synthetic_rows(rows), conflict=key))
+        with open(target, "w", encoding="utf-8") as f:
+            f.write("\n\n".join(statements))
+
+    def streamed(target):
+        with SQLArtifact(target) as out:
+            out.insert("assessments", _synthetic_rows(rows), conflict=key)
+
+    results = []
+    for label, write, target in (("joined", joined, path), ("streamed", streamed, path),
+                                 ("streamed + gzip", streamed, path + ".gz")):
+        start = time.perf_counter()
+        write(target)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        write(target)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = os.path.getsize(target)
+        os.remove(target)
+        results.append((label, elapsed, peak, size))
+        print(f"  {label:<16} {elapsed:6.2f}s  peak {peak / 2**20:7.1f} MB  file {size / 2**20:6.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        i = sys.argv.index("--benchmark")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else 50000
+        print(f"Writing {n} synthetic assessment rows:")
+        benchmark(n)
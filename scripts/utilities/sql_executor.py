@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Batched, transactional executor for generated SQL files (seeds, migrations).
+
+`run_sql_seed.py` used to split files on `;` (breaking `DO $$` blocks and any
+question text containing a semicolon) and send one HTTP round trip per
+statement; `migrate_metric_tracking.py` posted whole files as a single blob.
+This module parses statements properly, packs them into `BEGIN ... COMMIT`
+chunks sized by a byte budget, and runs the chunks over the pooled client in
+`db_client`. A failing chunk is rolled back as a whole and execution stops
+there, so a file that fits in one chunk (the default budget covers every seed
+in `scripts/seeds/`) is applied all-or-nothing.
+
+    python scripts/utilities/sql_executor.py scripts/003_seed_questions.sql
+    python scripts/utilities/sql_executor.py some_file.sql --chunk-kb 64 --dry-run
+"""
+
+import argparse
+import gzip
+import re
+import time
+
+import db_client
+from db_client import SQLError
+
+DEFAULT_CHUNK_BYTES = 512 * 1024
+
+_DOLLAR_TAG = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)?\$")
+
+# Statements Postgres refuses to run inside a transaction block
+_NON_TRANSACTIONAL = re.compile(
+    r"^\s*(VACUUM|CREATE\s+DATABASE|DROP\s+DATABASE|REINDEX\s+.*CONCURRENTLY"
+    r"|CREATE\s+(UNIQUE\s+)?INDEX\s+CONCURRENTLY|DROP\s+INDEX\s+CONCURRENTLY)\b",
+    re.IGNORECASE | re.DOTALL,
+)
+_TRANSACTION_CONTROL = re.compile(r"^\s*(BEGIN|COMMIT|ROLLBACK|START\s+TRANSACTION|END)\s*$", re.IGNORECASE)
+
+
+def _strip_leading_comments(stmt):
+    while True:
+        stmt = stmt.lstrip()
+        if stmt.startswith("--"):
+            nl = stmt.find("\n")
+            stmt = "" if nl == -1 else stmt[nl + 1:]
+        elif stmt.startswith("/*"):
+            end = stmt.find("*/")
+            stmt = "" if end == -1 else stmt[end + 2:]
+        else:
+            return stmt
+
+
+def split_statements(sql):
+    """Split a SQL script into statements on top-level semicolons.
+
+    Semicolons inside '...' / E'...' strings, "quoted identifiers",
+    $$ / $tag$ bodies, -- line comments and (nested) /* block comments */
+    do not end a statement. Comment-only fragments are dropped.
+    """
+    statements = []
+    start = 0
+    has_code = False
+    i, n = 0, len(sql)
+
+    while i < n:
+        c = sql[i]
+        if c == "-" and sql.startswith("--", i):
+            nl = sql.find("\n", i)
+            i = n if nl == -1 else nl + 1
+            continue
+        if c == "/" and sql.startswith("/*", i):
+            depth, i = 1, i + 2
+            while i < n and depth:
+                if sql.startswith("/*", i):
+                    depth, i = depth + 1, i + 2
+                elif sql.startswith("*/", i):
+                    depth, i = depth - 1, i + 2
+                else:
+                    i += 1
+            continue
+
+        if c == ";":
+            if has_code:
+                statements.append(sql[start:i].strip())
+            start, has_code = i + 1, False
+            i += 1
+            continue
+
+        if not c.isspace():
+            has_code = True
+
+        if c == "'":
+            prev = sql[i - 1] if i else ""
+            before = sql[i - 2] if i > 1 else ""
+            backslash_escapes = prev in "eE" and not (before.isalnum() or before == "_")
+            i += 1
+            while i < n:
+                if backslash_escapes and sql[i] == "\\":
+                    i += 2
+                elif sql[i] == "'":
+                    if sql.startswith("''", i):
+                        i += 2
+                    else:
+                        i += 1
+                        break
+                else:
+                    i += 1
+        elif c == '"':
+            i += 1
+            while i < n:
+                if sql.startswith('""', i):
+                    i += 2
+                elif sql[i] == '"':
+                    i += 1
+                    break
+                else:
+                    i += 1
+        elif c == "$":
+            prev = sql[i - 1] if i else ""
+            m = _DOLLAR_TAG.match(sql, i)
+            if m and not (prev.isalnum() or prev == "_"):
+                close = sql.find(m.group(0), m.end())
+                i = n if close == -1 else close + len(m.group(0))
+            else:
+                i += 1
+        else:
+            i += 1
+
+    if has_code and sql[start:].strip():
+        statements.append(sql[start:].strip())
+    return statements
+
+
+def chunk_statements(statements, max_bytes=DEFAULT_CHUNK_BYTES):
+    """Group statements into chunks of at most `max_bytes` (UTF-8) each.
+
+    Returns a list of `(statements, transactional)` pairs. A statement bigger
+    than the budget gets a chunk of its own; statements that cannot run inside
+    a transaction block (VACUUM, CREATE INDEX CONCURRENTLY, ...) are isolated
+    and sent without BEGIN/COMMIT. Explicit BEGIN/COMMIT in the input is
+    dropped, since every chunk is already wrapped.
+    """
+    chunks = []
+    current, current_bytes = [], 0
+
+    for stmt in statements:
+        code = _strip_leading_comments(stmt)
+        if _TRANSACTION_CONTROL.match(code):
+            continue
+        if _NON_TRANSACTIONAL.match(code):
+            if current:
+                chunks.append((current, True))
+                current, current_bytes = [], 0
+            chunks.append(([stmt], False))
+            continue
+
+        size = len(stmt.encode("utf-8")) + 2
+        if current and current_bytes + size > max_bytes:
+            chunks.append((current, True))
+            current, current_bytes = [], 0
+        current.append(stmt)
+        current_bytes += size
+
+    if current:
+        chunks.append((current, True))
+    return chunks
+
+
+def _render_chunk(statements, transactional):
+    body = ";\n".join(statements) + ";"
+    return f"BEGIN;\n{body}\nCOMMIT;" if transactional else body
+
+
+class ExecutionReport:
+    def __init__(self, statements, chunks):
+        self.statements = statements
+        self.chunks = chunks
+        self.chunks_committed = 0
+        self.statements_committed = 0
+        self.bytes_sent = 0
+        self.elapsed_s = 0.0
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def summary(self):
+        rate = self.statements_committed / self.elapsed_s if self.elapsed_s else 0
+        kb_rate = self.bytes_sent / 1024 / self.elapsed_s if self.elapsed_s else 0
+        line = (f"{self.statements_committed}/{self.statements} statements in "
+                f"{self.chunks_committed}/{self.chunks} round trips, {self.elapsed_s:.2f}s "
+                f"({rate:.0f} stmt/s, {kb_rate:.0f} KB/s)")
+        if self.error:
+            line += f" — stopped at chunk {self.chunks_committed + 1}: {self.error}"
+        return line
+
+
+def execute_sql(sql, max_chunk_bytes=DEFAULT_CHUNK_BYTES, run=None, verbose=True):
+    """Execute a SQL script chunk by chunk; stop at the first failed chunk.
+
+    `run` defaults to `db_client.run_sql` and only needs to accept one SQL
+    string and raise `SQLError` on failure. Returns an `ExecutionReport`.
+    """
+    run = run or db_client.run_sql
+    statements = split_statements(sql)
+    chunks = chunk_statements(statements, max_chunk_bytes)
+    report = ExecutionReport(sum(len(c) for c, _ in chunks), len(chunks))
+
+    start = time.perf_counter()
+    for idx, (chunk, transactional) in enumerate(chunks, 1):
+        payload = _render_chunk(chunk, transactional)
+        try:
+            run(payload)
+        except SQLError as e:
+            report.error = e
+            if verbose:
+                print(f"  ❌ chunk {idx}/{len(chunks)} ({len(chunk)} statements) rolled back: {e}")
+            break
+        report.chunks_committed += 1
+        report.statements_committed += len(chunk)
+        report.bytes_sent += len(payload.encode("utf-8"))
+        if verbose:
+            print(f"  ✅ chunk {idx}/{len(chunks)}: {len(chunk)} statements")
+    report.elapsed_s = time.perf_counter() - start
+
+    if verbose:
+        print(report.summary())
+    return report
+
+
+def read_sql_file(path):
+    """Text of a SQL file; `.gz` files (see `sql_artifact.py`) are decompressed."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def execute_sql_file(path, **kwargs):
+    return execute_sql(read_sql_file(path), **kwargs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a SQL file in batched transactional chunks.")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-kb", type=int, default=DEFAULT_CHUNK_BYTES // 1024,
+                        help="byte budget per round trip, in KB")
+    parser.add_argument("--dry-run", action="store_true", help="only show how the file would be chunked")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        stmts = split_statements(read_sql_file(args.path))
+        for idx, (chunk, tx) in enumerate(chunk_statements(stmts, args.chunk_kb * 1024), 1):
+            size = sum(len(s.encode("utf-8")) for s in chunk)
+            print(f"chunk {idx}: {len(chunk)} statements, {size / 1024:.1f} KB{'' if tx else ' (no transaction)'}")
+    else:
+        report = execute_sql_file(args.path, max_chunk_bytes=args.chunk_kb * 1024)
+        raise SystemExit(0 if report.ok else 1)
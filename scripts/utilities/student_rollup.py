@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Keep `student_metric_rollup` (migration 008) in step with its sources.
+
+`v_student_dashboard` used to compute CBP, Conflexion, BoW and projects
+assessed with four correlated subqueries per student. It now reads one
+rollup row per student, refreshed by `refresh_student_rollup(student_ids)`
+whenever metrics, term tracking or assessments are imported:
+
+    from student_rollup import refresh_rollup_sql
+
+    statements.append(refresh_rollup_sql({a["student_id"] for a in records}))
+
+    python scripts/utilities/student_rollup.py --rebuild        # every student
+    python scripts/utilities/student_rollup.py --benchmark 10000 [--keep]
+
+The benchmark builds synthetic students, metric entries, term tracking and
+assessments in a scratch schema (`bench_student_rollup`), with migration 008's
+`refresh_student_rollup()` created there. It times a full read of the old
+view, a full rollup build, a full read of the new view and a 10-student
+refresh, then drops the schema unless `--keep` is given.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+from db_client import run_sql
+from diff_writer import sql_literal
+
+BENCH_SCHEMA = "bench_student_rollup"
+
+
+def refresh_rollup_sql(student_ids=None):
+    """`SELECT refresh_student_rollup(...)` for some students (None = all)."""
+    if student_ids is None:
+        return "SELECT refresh_student_rollup();"
+    if not student_ids:
+        return "SELECT 0;"  # nothing touched
+    ids = ", ".join(sql_literal(str(i)) for i in sorted(student_ids))
+    return f"SELECT refresh_student_rollup(ARRAY[{ids}]::uuid[]);"
+
+
+def refresh(student_ids=None):
+    """Run the refresh; returns the number of rollup rows rebuilt."""
+    rows = run_sql(refresh_rollup_sql(student_ids))
+    return next(iter(rows[0].values()), 0) if rows else 0
+
+
+# The view as it was before migration 008, over schema {s}
+OLD_VIEW_SQL = """
+WITH mt_agg AS (
+    SELECT mt.student_id, m.name AS metric_name, SUM(mt.value) AS total_value
+    FROM {s}.metric_tracking mt
+    JOIN {s}.metrics m ON m.id = mt.metric_id
+    GROUP BY mt.student_id, m.name
+),
+tt_data AS (
+    SELECT student_id, cbp_count, conflexion_count, bow_score
+    FROM {s}.term_tracking
+    WHERE term = 'Year 1'
+)
+SELECT
+    s.id AS student_id,
+    s.student_number,
+    s.canonical_name,
+    (COALESCE((SELECT total_value FROM mt_agg WHERE mt_agg.student_id = s.id AND mt_agg.metric_name = 'CBP'), 0) +
+     COALESCE((SELECT cbp_count FROM tt_data WHERE tt_data.student_id = s.id), 0)) AS cbp_count,
+    (COALESCE((SELECT total_value FROM mt_agg WHERE mt_agg.student_id = s.id AND mt_agg.metric_name = 'Conflexion'), 0) +
+     COALESCE((SELECT conflexion_count FROM tt_data WHERE tt_data.student_id = s.id), 0)) AS conflexion_count,
+    (COALESCE((SELECT total_value FROM mt_agg WHERE mt_agg.student_id = s.id AND mt_agg.metric_name = 'BoW'), 0) +
+     COALESCE((SELECT bow_score FROM tt_data WHERE tt_data.student_id = s.id), 0)) AS bow_score,
+    (SELECT COUNT(DISTINCT a.project_id) FROM {s}.assessments a
+     WHERE a.student_id = s.id AND a.assessment_type = 'mentor' AND a.normalized_score IS NOT NULL) AS total_projects_assessed
+FROM {s}.students s
+WHERE s.is_active = TRUE
+"""
+
+MIGRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "migrations",
+                              "008_add_student_metric_rollup.sql")
+
+
+def rollup_function_sql(s):
+    """Migration 008's refresh_student_rollup(), created in schema `s` and
+    resolving its tables there, so the benchmark times the real function."""
+    with open(MIGRATION_FILE, encoding="utf-8") as f:
+        migration = f.read()
+    match = re.search(r"CREATE OR REPLACE FUNCTION refresh_student_rollup\(.*?END \$\$;", migration, re.S)
+    if match is None:
+        raise RuntimeError(f"refresh_student_rollup() not found in {MIGRATION_FILE}")
+    return (match.group(0)
+            .replace("FUNCTION refresh_student_rollup(", f"FUNCTION {s}.refresh_student_rollup(", 1)
+            .replace("SET search_path = public", f"SET search_path = {s}, public", 1))
+
+
+NEW_VIEW_SQL = """
+SELECT s.id AS student_id, s.student_number, s.canonical_name,
+       COALESCE(r.cbp_count, 0) AS cbp_count, COALESCE(r.conflexion_count, 0) AS conflexion_count,
+       COALESCE(r.bow_score, 0) AS bow_score, COALESCE(r.total_projects_assessed, 0) AS total_projects_assessed,
+       COALESCE(r.self_assessments_count, 0) AS self_assessments_count
+FROM {s}.students s
+LEFT JOIN {s}.student_metric_rollup r ON r.student_id = s.id
+WHERE s.is_active = TRUE
+"""
+
+
+def _setup_sql(s, students, logs, projects, params):
+    """Statements creating and filling the scratch schema."""
+    return [
+        f"DROP SCHEMA IF EXISTS {s} CASCADE",
+        f"CREATE SCHEMA {s}",
+        f"CREATE TABLE {s}.students (id UUID PRIMARY KEY, student_number INT, canonical_name TEXT, is_active BOOLEAN)",
+        f"INSERT INTO {s}.students SELECT gen_random_uuid(), g, 'Student ' || g, g % 20 <> 0 FROM generate_series(1, {students}) g",
+        f"CREATE TABLE {s}.metrics (id UUID PRIMARY KEY DEFAULT gen_random_uuid(), name TEXT UNIQUE)",
+        f"INSERT INTO {s}.metrics (name) VALUES ('CBP'), ('Conflexion'), ('BoW')",
+        f"CREATE TABLE {s}.metric_tracking (student_id UUID, metric_id UUID, assessment_log_id UUID, value NUMERIC, "
+        f"UNIQUE (student_id, metric_id, assessment_log_id))",
+        f"INSERT INTO {s}.metric_tracking SELECT st.id, m.id, gen_random_uuid(), floor(random() * 5) "
+        f"FROM {s}.students st CROSS JOIN {s}.metrics m CROSS JOIN generate_series(1, {logs})",
+        f"CREATE TABLE {s}.term_tracking (student_id UUID, cbp_count INT, conflexion_count INT, bow_score NUMERIC, "
+        f"term TEXT, UNIQUE (student_id, term))",
+        f"INSERT INTO {s}.term_tracking SELECT id, floor(random() * 10), floor(random() * 5), round((random() * 10)::numeric, 2), 'Year 1' "
+        f"FROM {s}.students WHERE student_number % 3 = 0",
+        f"CREATE TABLE {s}.assessments (student_id UUID, project_id INT, parameter_id INT, assessment_type TEXT, "
+        f"normalized_score NUMERIC, UNIQUE (student_id, project_id, parameter_id, assessment_type))",
+        f"INSERT INTO {s}.assessments SELECT st.id, p, q, t, round((1 + random() * 9)::numeric, 2) "
+        f"FROM {s}.students st CROSS JOIN generate_series(1, {projects}) p CROSS JOIN generate_series(1, {params}) q "
+        f"CROSS JOIN (VALUES ('mentor'), ('self')) v(t)",
+        f"CREATE TABLE {s}.student_metric_rollup (student_id UUID PRIMARY KEY, cbp_count NUMERIC, conflexion_count NUMERIC, "
+        f"bow_score NUMERIC, total_projects_assessed INT, self_assessments_count INT)",
+        rollup_function_sql(s),
+        f"ANALYZE {s}.students, {s}.metrics, {s}.metric_tracking, {s}.term_tracking, {s}.assessments",
+    ]
+
+
+def _explain_ms(sql):
+    """Execution time of one statement, from EXPLAIN ANALYZE."""
+    rows = run_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+    plan = next(iter(rows[0].values()))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Execution Time"]
+
+
+def benchmark(students=10000, logs=4, projects=6, params=24, keep=False):
+    s = BENCH_SCHEMA
+    start = time.perf_counter()
+    for stmt in _setup_sql(s, students, logs, projects, params):
+        run_sql(stmt)
+    print(f"Built {students} synthetic students in {s} ({time.perf_counter() - start:.1f}s): "
+          f"{students * 3 * logs} metric entries, {students * projects * params * 2} assessments")
+
+    try:
+        sample = run_sql(f"SELECT array_agg(id) AS ids FROM (SELECT id FROM {s}.students LIMIT 10) x")[0]["ids"]
+        sample_ids = "ARRAY[" + ", ".join(sql_literal(str(i)) for i in sample) + "]::uuid[]"
+        timings = [
+            ("old view, all students", _explain_ms(OLD_VIEW_SQL.format(s=s))),
+            ("rollup, full build", _explain_ms(f"SELECT {s}.refresh_student_rollup()")),
+            ("new view, all students", _explain_ms(NEW_VIEW_SQL.format(s=s))),
+            ("rollup, 10 students", _explain_ms(f"SELECT {s}.refresh_student_rollup({sample_ids})")),
+        ]
+
+        for label, ms in timings:
+            print(f"  {label:<24} {ms:9.1f} ms")
+        print(f"  read speed-up: {timings[0][1] / timings[2][1]:.1f}x")
+
+        mismatched = run_sql(f"""
+            SELECT COUNT(*) AS n FROM ({OLD_VIEW_SQL.format(s=s)}) o
+            JOIN ({NEW_VIEW_SQL.format(s=s)}) r USING (student_id)
+            WHERE (o.cbp_count, o.conflexion_count, o.bow_score, o.total_projects_assessed)
+               IS DISTINCT FROM (r.cbp_count, r.conflexion_count, r.bow_score, r.total_projects_assessed)
+        """)[0]["n"]
+        print(f"  rows differing between the views: {mismatched}")
+        return timings
+    finally:
+        if not keep:
+            run_sql(f"DROP SCHEMA IF EXISTS {s} CASCADE")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        i = sys.argv.index("--benchmark")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else 10000
+        benchmark(n, keep="--keep" in sys.argv)
+    elif "--rebuild" in sys.argv or len(sys.argv) == 1:
+        print(f"Rebuilt student_metric_rollup: {refresh()} rows")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Parsed-workbook cache for the Excel files the utilities read over and over.
+
+The mentor matrix (`Year 1 Assessment_Matrix (1) (1) (1).xlsx`) is parsed from
+scratch by half a dozen scripts, every run, through openpyxl - by far the
+slowest step of most of them. `open_workbook()` returns a drop-in stand-in for
+`pd.ExcelFile` whose sheets come from a local cache keyed by the SHA-1 of the
+file's bytes and the sheet name; openpyxl is only touched for a workbook whose
+content has changed (or a sheet not read before):
+
+    from workbook_cache import open_workbook, read_sheet
+
+    xls = open_workbook(matrix_file)
+    for sheet in xls.sheet_names:
+        df = xls.parse(sheet)                 # same as pd.read_excel(xls, sheet_name=sheet)
+
+    df = read_sheet(path, "Form responses 1")
+
+Each sheet is stored as its own pickled DataFrame - not Parquet - because the
+matrix sheets mix text and numbers in one column ("na", "-", 7, 8.5), which
+Arrow would coerce, and an exact round trip of what `read_excel` returned is
+the point. Entries live under `scripts/utilities/.cache/workbooks/` (override
+the root with `ASSESSMENT_CACHE_DIR`); when a file's content changes, its old
+entry is dropped.
+
+    python scripts/utilities/workbook_cache.py <file.xlsx>...   # warm the cache
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+
+import pandas as pd
+
+CACHE_DIR    = os.environ.get("ASSESSMENT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+WORKBOOK_DIR = os.path.join(CACHE_DIR, "workbooks")
+INDEX_PATH   = os.path.join(WORKBOOK_DIR, "index.json")
+CACHE_VERSION = 1
+
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_json(path, default):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _sheet_file(entry_dir, sheet_name, header):
+    key = hashlib.sha1(f"{sheet_name}\0{header}".encode()).hexdigest()[:16]
+    return os.path.join(entry_dir, f"{key}.pkl")
+
+
+class CachedWorkbook:
+    """Cached view of one workbook; opens openpyxl only on a cache miss."""
+
+    def __init__(self, path):
+        self.path = path
+        self.digest = file_digest(path)
+        self._dir = os.path.join(WORKBOOK_DIR, f"v{CACHE_VERSION}-{self.digest}")
+        self._excel = None
+        self._register()
+
+        manifest = _read_json(os.path.join(self._dir, "manifest.json"), None)
+        if manifest is None:
+            manifest = {"source": os.path.abspath(path), "sheet_names": self._open().sheet_names}
+            _write_json(os.path.join(self._dir, "manifest.json"), manifest)
+        self.sheet_names = manifest["sheet_names"]
+
+    def _register(self):
+        """Record path -> digest and drop the entry of this file's previous content."""
+        os.makedirs(self._dir, exist_ok=True)
+        index = _read_json(INDEX_PATH, {})
+        source = os.path.abspath(self.path)
+        previous = index.get(source)
+        if previous != self.digest:
+            if previous and previous not in [d for s, d in index.items() if s != source]:
+                shutil.rmtree(os.path.join(WORKBOOK_DIR, f"v{CACHE_VERSION}-{previous}"), ignore_errors=True)
+            index[source] = self.digest
+            _write_json(INDEX_PATH, index)
+
+    def _open(self):
+        if self._excel is None:
+            self._excel = pd.ExcelFile(self.path)
+        return self._excel
+
+    def parse(self, sheet_name=0, header=0, nrows=None):
+        """`pd.read_excel(path, sheet_name=..., header=..., nrows=...)`, cached."""
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        if sheet_name not in self.sheet_names:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        cache_file = _sheet_file(self._dir, sheet_name, header)
+        try:
+            with open(cache_file, "rb") as f:
+                df = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            df = self._open().parse(sheet_name, header=header)
+            tmp = f"{cache_file}.{os.getpid()}.tmp"  # importer workers may race on a sheet
+            with open(tmp, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        return df.head(nrows).copy() if nrows is not None else df
+
+    def close(self):
+        if self._excel is not None:
+            self._excel.close()
+            self._excel = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_workbook(path):
+    return CachedWorkbook(path)
+
+
+def read_sheet(path, sheet_name=0, header=0, nrows=None):
+    """Cached `pd.read_excel` for a single sheet."""
+    with open_workbook(path) as wb:
+        return wb.parse(sheet_name, header=header, nrows=nrows)
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        with open_workbook(path) as wb:
+            for sheet in wb.sheet_names:
+                wb.parse(sheet)
+            print(f"{path}: {len(wb.sheet_names)} sheets cached ({wb.digest[:12]})")
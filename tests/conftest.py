@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The utilities are flat sibling modules run from the repo root
+# (`python scripts/utilities/<name>.py`); make them importable the same way.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "scripts", "utilities"))
@@ -0,0 +1,120 @@
+from diff_writer import Delta, compute_delta, delta_sql
+
+
+def assessment(student, parameter, raw, id=None, **extra):
+    row = {"student_id": student, "project_id": "p1", "parameter_id": parameter,
+           "assessment_type": "mentor", "raw_score": raw, "raw_scale_min": 1,
+           "raw_scale_max": 10, "normalized_score": raw, "source_file": "m.xlsx", **extra}
+    if id is not None:
+        row["id"] = id
+    return row
+
+
+def question(text, parameter, id=None, order=1):
+    row = {"project_id": "p1", "question_text": text, "parameter_id": parameter,
+           "question_order": order, "project_context": "Kickstart", "rating_scale_max": 10}
+    if id is not None:
+        row["id"] = id
+    return row
+
+
+def test_insert_update_delete_and_unchanged():
+    current = [assessment("s1", "a", 7, id="r1"), assessment("s2", "a", 5, id="r2"),
+               assessment("s3", "a", 4, id="r3")]
+    desired = [assessment("s1", "a", 7), assessment("s2", "a", 6), assessment("s4", "a", 9)]
+
+    delta = compute_delta("assessments", current, desired)
+
+    assert [r["student_id"] for r in delta.inserts] == ["s4"]
+    assert [(r["id"], r["raw_score"]) for r in delta.updates] == [("r2", 6)]
+    assert delta.deletes == ["r3"]
+    assert delta.unchanged == 1
+    assert len(delta) == 3
+
+
+def test_numbers_compare_at_six_places():
+    current = [assessment("s1", "a", "7.50", id="r1")]
+    delta = compute_delta("assessments", current, [assessment("s1", "a", 7.5)])
+    assert len(delta) == 0 and delta.unchanged == 1
+
+
+def test_none_and_nan_are_the_same_null():
+    current = [assessment("s1", "a", 7, id="r1", raw_score_sum=None)]
+    delta = compute_delta("assessments", current, [assessment("s1", "a", 7, raw_score_sum=float("nan"))])
+    assert len(delta) == 0
+
+
+def test_keep_missing_rows_without_delete_missing():
+    current = [assessment("s1", "a", 7, id="r1"), assessment("s2", "a", 5, id="r2")]
+    delta = compute_delta("assessments", current, [assessment("s1", "a", 8)], delete_missing=False)
+    assert delta.deletes == []
+    assert [r["id"] for r in delta.updates] == ["r1"]
+
+
+def test_later_desired_rows_win():
+    delta = compute_delta("assessments", [], [assessment("s1", "a", 3), assessment("s1", "a", 8)])
+    assert [r["raw_score"] for r in delta.inserts] == [8]
+
+
+def test_duplicate_current_rows_are_deleted():
+    current = [assessment("s1", "a", 7, id="r1"), assessment("s1", "a", 7, id="r2")]
+    delta = compute_delta("assessments", current, [assessment("s1", "a", 7)])
+    assert delta.deletes == ["r2"]
+    assert delta.unchanged == 1
+
+
+def test_questions_are_keyed_by_normalized_text_not_position():
+    current = [question("How clear is the goal?", "x", id="q1", order=1),
+               question("Rate your teamwork", "y", id="q2", order=2)]
+    desired = [question("New question", "z", order=1),
+               question("how clear is the GOAL", "x", order=2),
+               question("Rate your teamwork", "y", order=3)]
+
+    delta = compute_delta("self_assessment_questions", current, desired)
+
+    assert [r["question_text"] for r in delta.inserts] == ["New question"]
+    assert sorted(r["id"] for r in delta.updates) == ["q1", "q2"]
+    assert delta.deletes == []
+
+
+def test_replace_on_column_change_deletes_and_reinserts():
+    current = [question("Rate your teamwork", "y", id="q2")]
+    delta = compute_delta("self_assessment_questions", current, [question("Rate your teamwork", "w")])
+    assert delta.deletes == ["q2"]
+    assert [r["parameter_id"] for r in delta.inserts] == ["w"]
+    assert delta.updates == []
+
+
+def test_replaced_rows_are_deleted_even_without_delete_missing():
+    current = [question("Rate your teamwork", "y", id="q2")]
+    delta = compute_delta("self_assessment_questions", current, [question("Rate your teamwork", "w")],
+                          delete_missing=False)
+    assert delta.deletes == ["q2"]
+
+
+def test_dependents_are_deleted_before_their_rows():
+    delta = Delta(inserts=[], updates=[], deletes=["q1", "q2"], unchanged=0)
+    statements = delta_sql("self_assessment_questions", delta)
+
+    assert len(statements) == 2
+    dependent, own = statements
+    assert "DELETE FROM assessments WHERE self_assessment_question_id IN ('q1', 'q2');" in dependent
+    # assessments feed the dashboard summaries, so their delete refreshes them
+    assert dependent.startswith("DO $$") and "refresh_domain_scores(s, p)" in dependent
+    assert own == "DELETE FROM self_assessment_questions WHERE id IN ('q1', 'q2');"
+
+
+def test_updates_leave_replace_on_columns_alone():
+    delta = Delta(inserts=[], updates=[question("It's fine", "x", id="q1")], deletes=[], unchanged=0)
+    [update] = delta_sql("self_assessment_questions", delta)
+    assert update.startswith("UPDATE self_assessment_questions SET ")
+    assert "question_text = 'It''s fine'" in update
+    assert "parameter_id" not in update
+    assert update.endswith("WHERE id = 'q1';")
+
+
+def test_assessment_inserts_upsert_on_the_natural_key():
+    delta = Delta(inserts=[assessment("s1", "a", 7)], updates=[], deletes=[], unchanged=0)
+    [insert] = delta_sql("assessments", delta)
+    assert insert.startswith("INSERT INTO assessments")
+    assert "ON CONFLICT (student_id, project_id, parameter_id, assessment_type)" in insert
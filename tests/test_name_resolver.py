@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from name_resolver import NameResolver, soundex
+
+STUDENTS = [
+    {"id": "s1", "canonical_name": "Aditya Jain", "aliases": ["Aditya J", "AJ"]},
+    {"id": "s2", "canonical_name": "Priya Sharma", "aliases": None},
+    {"id": "s3", "canonical_name": "Rohan Mehta", "aliases": ["aditya j"]},  # clashes with s1
+]
+PROJECTS = [
+    {"id": "p1", "name": "Kickstart", "internal_name": "KS"},
+    {"id": "p2", "name": "Business X-Ray", "internal_name": None},
+]
+
+
+def resolver():
+    return NameResolver(STUDENTS, PROJECTS)
+
+
+def test_names_and_aliases_match_after_cleaning():
+    r = resolver()
+    assert r.student_id("Aditya Jain") == "s1"
+    assert r.student_id("  aditya j ") == "s1"
+    assert r.student_id("PRIYA SHARMA") == "s2"
+    assert r.student_id("Nobody") is None
+    assert r.student_id(None) is None
+    assert r.student_id(float("nan")) is None
+
+
+def test_first_record_wins_a_shared_name():
+    assert resolver().student_id("Aditya J") == "s1"
+
+
+def test_unhashable_cells_are_looked_up_without_memoising():
+    assert resolver().student_id(["Aditya J"]) is None
+
+
+def test_projects_match_name_or_internal_name():
+    r = resolver()
+    assert r.project_id("kickstart") == "p1"
+    assert r.project_id("KS") == "p1"
+    assert r.project_id("Business X-Ray ") == "p2"
+    assert r.project_id("Unknown") is None
+
+
+def test_column_resolution_matches_scalar_lookups():
+    names = pd.Series(["Aditya J", None, "priya sharma", "Nobody", np.nan], index=[10, 11, 12, 13, 14])
+    ids = resolver().resolve_students(names)
+    assert list(ids.index) == [10, 11, 12, 13, 14]
+    assert list(ids) == ["s1", None, "s2", None, None]
+    assert list(resolver().resolve_projects(["KS", "Business X-Ray"])) == ["p1", "p2"]
+
+
+def test_student_columns_fall_back_to_the_top_cells():
+    sheet = pd.DataFrame(
+        [["Name", None, "Priya Sharma", None],
+         ["Goal setting", 7, 8, 6]],
+        columns=["Parameter", "Aditya Jain", "Unnamed: 2", "Unnamed: 3"],
+    )
+    assert resolver().student_columns(sheet) == {1: "s1", 2: "s2"}
+
+
+def test_student_columns_of_a_sheet_without_students():
+    assert resolver().student_columns(pd.DataFrame({"Parameter": ["x"]})) == {}
+
+
+def test_soundex():
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Tymczak") == "T522"
+    assert soundex("Lee") == "L000"
+    assert soundex("123") == ""
+
+
+def test_suggestions_for_a_misspelt_name():
+    [best, *_] = resolver().suggest_students("Aditya Jian")
+    assert best.student_id == "s1"
+    assert 0.6 <= best.score < 1
+
+
+def test_suggestions_tolerate_swapped_names():
+    [best, *_] = resolver().suggest_students("Sharma Priya")
+    assert (best.student_id, best.name) == ("s2", "priya sharma")
+
+
+def test_exact_names_suggest_themselves():
+    assert resolver().suggest_students("priya sharma") == [("s2", "Priya Sharma", 1.0)]
+
+
+def test_one_suggestion_per_student_best_first():
+    suggestions = resolver().suggest_students("Aditya", limit=5, min_score=0)
+    ids = [s.student_id for s in suggestions]
+    assert len(ids) == len(set(ids))
+    assert [s.score for s in suggestions] == sorted((s.score for s in suggestions), reverse=True)
+
+
+def test_no_suggestions_for_unrelated_or_empty_names():
+    r = resolver()
+    assert r.suggest_students("Zzyzx Qwerty") == []
+    assert r.suggest_students("") == []
+    assert r.describe_unmatched("Zzyzx Qwerty") == ""
+    assert r.describe_unmatched("Priya Sharmaa").startswith(" (did you mean: Priya Sharma (")
@@ -0,0 +1,63 @@
+import difflib
+
+from question_matcher import QuestionMatcher, normalize_text
+
+QUESTIONS = [
+    {"id": "q1", "parameter_id": "a", "project_context": "Kickstart",
+     "question_text": "How well did you set clear goals for the week?"},
+    {"id": "q2", "parameter_id": "b", "project_context": "Kickstart",
+     "question_text": "How well did you communicate with your team?"},
+    {"id": "q3", "parameter_id": "c", "project_context": "Kickstart",
+     "question_text": "Rate your time management."},
+    {"id": "q4", "parameter_id": "d", "project_context": "Marketing",
+     "question_text": "How well did you set clear goals for the week?"},
+]
+
+
+def test_normalize_text():
+    assert normalize_text("  Rate your Time-Management! ") == "rateyourtimemanagement"
+    assert normalize_text(None) == ""
+    assert normalize_text(float("nan")) == ""
+
+
+def test_best_match_ignores_case_and_punctuation():
+    m = QuestionMatcher(QUESTIONS).best("how well did you communicate with your team", "Kickstart")
+    assert (m.question_id, m.parameter_id, m.confidence) == ("q2", "b", 1.0)
+
+
+def test_matches_stay_within_the_project():
+    matcher = QuestionMatcher(QUESTIONS)
+    assert matcher.best("How well did you set clear goals for the week?", "Marketing").question_id == "q4"
+    assert matcher.best("How well did you set clear goals for the week?", "Kickstart").question_id == "q1"
+    assert matcher.best("Rate your time management", "Marketing") is None
+    assert matcher.top_k("anything", "Unknown project") == []
+
+
+def test_confidence_is_the_difflib_ratio():
+    header = "How well did you set goals for the week"
+    [top] = QuestionMatcher(QUESTIONS).top_k(header, "Kickstart", k=1)
+    expected = difflib.SequenceMatcher(None, normalize_text(header), normalize_text(QUESTIONS[0]["question_text"])).ratio()
+    assert top.question_id == "q1"
+    assert top.confidence == expected
+
+
+def test_best_needs_more_than_the_threshold():
+    matcher = QuestionMatcher(QUESTIONS)
+    header = "Rate your time"
+    [top] = matcher.top_k(header, "Kickstart", k=1)
+    assert top.question_id == "q3"
+    assert matcher.best(header, "Kickstart", min_confidence=top.confidence) is None
+    assert matcher.best(header, "Kickstart", min_confidence=top.confidence - 0.01) == top
+
+
+def test_top_k_is_ranked_and_matches_a_full_scan():
+    matcher = QuestionMatcher(QUESTIONS)
+    header = "How well did you communicate goals?"
+    ranked = matcher.top_k(header, "Kickstart", k=3)
+    assert [m.confidence for m in ranked] == sorted((m.confidence for m in ranked), reverse=True)
+
+    scan = max((q for q in QUESTIONS if q["project_context"] == "Kickstart"),
+               key=lambda q: difflib.SequenceMatcher(None, normalize_text(header),
+                                                     normalize_text(q["question_text"])).ratio())
+    assert ranked[0].question_id == scan["id"]
+
@@ -0,0 +1,106 @@
+from db_client import SQLError
+from sql_executor import chunk_statements, execute_sql, split_statements
+
+
+def test_splits_on_top_level_semicolons():
+    assert split_statements("SELECT 1; SELECT 2;\nSELECT 3") == ["SELECT 1", "SELECT 2", "SELECT 3"]
+
+
+def test_dollar_quoted_body_is_one_statement():
+    sql = """
+    DO $$
+    BEGIN
+        UPDATE t SET x = 1;
+        DELETE FROM t WHERE y = 'a;b';
+    END $$;
+    SELECT 1;
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 2
+    assert statements[0].startswith("DO $$") and statements[0].endswith("END $$")
+    assert statements[1] == "SELECT 1"
+
+
+def test_tagged_dollar_quote_ignores_inner_plain_dollars():
+    sql = "CREATE FUNCTION f() RETURNS int AS $fn$ SELECT $$;$$; $fn$ LANGUAGE sql; SELECT 2;"
+    assert split_statements(sql) == [
+        "CREATE FUNCTION f() RETURNS int AS $fn$ SELECT $$;$$; $fn$ LANGUAGE sql",
+        "SELECT 2",
+    ]
+
+
+def test_positional_parameters_are_not_dollar_quotes():
+    assert split_statements("SELECT $1; SELECT a$b$c;") == ["SELECT $1", "SELECT a$b$c"]
+
+
+def test_doubled_quotes_inside_strings():
+    sql = "INSERT INTO q (t) VALUES ('It''s; fine'); SELECT 'x'"
+    assert split_statements(sql) == ["INSERT INTO q (t) VALUES ('It''s; fine')", "SELECT 'x'"]
+
+
+def test_escape_string_backslash_quote():
+    sql = r"SELECT E'a\';b'; SELECT 2"
+    assert split_statements(sql) == [r"SELECT E'a\';b'", "SELECT 2"]
+
+
+def test_backslash_is_literal_in_standard_strings():
+    # standard_conforming_strings: only E'' strings treat \ as an escape
+    sql = r"SELECT 'C:\'; SELECT 2"
+    assert split_statements(sql) == [r"SELECT 'C:\'", "SELECT 2"]
+
+
+def test_identifier_ending_in_e_is_not_an_escape_string():
+    sql = r"SELECT name'x\'; SELECT 2"
+    assert split_statements(sql) == [r"SELECT name'x\'", "SELECT 2"]
+
+
+def test_quoted_identifiers():
+    assert split_statements('SELECT "a;""b"; SELECT 2') == ['SELECT "a;""b"', "SELECT 2"]
+
+
+def test_comments_do_not_split_and_comment_only_fragments_are_dropped():
+    sql = """
+    -- leading; comment
+    SELECT 1; /* block; /* nested; */ still comment */
+    -- trailing only;
+    """
+    statements = split_statements(sql)
+    assert len(statements) == 1
+    assert statements[0].endswith("SELECT 1")
+
+
+def test_explicit_transaction_control_is_stripped():
+    statements = split_statements("BEGIN; INSERT INTO t VALUES (1); -- done\nCOMMIT;")
+    chunks = chunk_statements(statements)
+    assert chunks == [(["INSERT INTO t VALUES (1)"], True)]
+
+
+def test_non_transactional_statements_get_their_own_chunk():
+    statements = split_statements("SELECT 1; CREATE INDEX CONCURRENTLY i ON t (x); SELECT 2;")
+    assert chunk_statements(statements) == [
+        (["SELECT 1"], True),
+        (["CREATE INDEX CONCURRENTLY i ON t (x)"], False),
+        (["SELECT 2"], True),
+    ]
+
+
+def test_chunks_respect_the_byte_budget():
+    statements = [f"SELECT {i}" for i in range(10)]
+    chunks = chunk_statements(statements, max_bytes=30)
+    assert [s for chunk, _ in chunks for s in chunk] == statements
+    assert all(sum(len(s) + 2 for s in chunk) <= 30 for chunk, _ in chunks)
+
+
+def test_execution_stops_at_the_first_failed_chunk():
+    sent = []
+
+    def run(payload):
+        sent.append(payload)
+        if len(sent) == 2:
+            raise SQLError(payload, "boom")
+
+    report = execute_sql("SELECT 1; SELECT 2; SELECT 3;", max_chunk_bytes=12, run=run, verbose=False)
+    assert len(sent) == 2
+    assert sent[0] == "BEGIN;\nSELECT 1;\nCOMMIT;"
+    assert not report.ok
+    assert (report.chunks_committed, report.statements_committed) == (1, 1)